@@ -1,14 +1,24 @@
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Union
+import os
+import json
+import math
+import asyncio
+import hashlib
 import uvicorn
 from datetime import datetime
+from dataclasses import replace
 
-from core.lca_engine import LCAEngine, LCAResult
+from core.lca_engine import LCAEngine, LCAResult, LCAMethod
+from core.lca_cache import canonical_digest
 from core.material_database import MaterialDatabase, MaterialPassport
-from core.generative_design import GenerativeDesignEngine, DesignConstraint
-from tasks import ping, celery_app
+from core.sql_database import SQLMaterialDatabase
+from core.generative_design import GenerativeDesignEngine, DesignConstraint, EvolutionConfig
+from api.middleware.admission import AdmissionController, RouteLimit
+from tasks import ping, celery_app, optimize_design_task, batch_lca_task, rescore_catalog_task
 
 app = FastAPI(
     title="Bend the emissions curve of the built environment API",
@@ -27,9 +37,65 @@ app.add_middleware(
 
 # Initialize engines
 lca_engine = LCAEngine()
-material_db = MaterialDatabase()
+# Shared, persistent catalog when DATABASE_URL is set; in-memory otherwise,
+# optionally opened from a snapshot written by MaterialDatabase.save_snapshot
+if os.getenv("DATABASE_URL"):
+    material_db = SQLMaterialDatabase(os.environ["DATABASE_URL"])
+elif os.getenv("MATERIAL_SNAPSHOT") and os.path.isdir(os.environ["MATERIAL_SNAPSHOT"]):
+    material_db = MaterialDatabase.load_snapshot(os.environ["MATERIAL_SNAPSHOT"])
+else:
+    material_db = MaterialDatabase()
 design_engine = GenerativeDesignEngine(material_db)
 
+# Blocking NumPy/Python work runs on a bounded pool so the event loop stays
+# responsive; overloaded routes answer 429/503 with Retry-After
+admission = AdmissionController(
+    max_workers=int(os.getenv("ADMISSION_MAX_WORKERS", "0")) or None,
+    max_pending=int(os.getenv("ADMISSION_MAX_PENDING", "0")) or None,
+    limits={
+        "/design/optimize": RouteLimit(max_concurrency=2, max_queue=8),
+        "/design/pareto": RouteLimit(max_concurrency=2, max_queue=8),
+        "/design/recommend-swaps": RouteLimit(max_concurrency=2, max_queue=8),
+        "/design/portfolio": RouteLimit(max_concurrency=1, max_queue=4),
+        "/materials/calculate-lca/batch": RouteLimit(max_concurrency=2, max_queue=8),
+        "/materials/search": RouteLimit(max_concurrency=8, max_queue=64),
+        "/materials/register/bulk": RouteLimit(max_concurrency=2, max_queue=8),
+        "/integrity/verify": RouteLimit(max_concurrency=1, max_queue=2),
+    }
+)
+
+# Rows per batched LCA / store call of /materials/register/bulk
+BULK_REGISTER_CHUNK_SIZE = int(os.getenv("BULK_REGISTER_CHUNK_SIZE", "500"))
+
+@app.on_event("startup")
+async def warm_up_models():
+    """Optionally preload the predictive LCA model off the request path"""
+    if os.getenv("LCA_WARM_ML_MODEL", "").lower() in ("1", "true", "yes"):
+        lca_engine.warm_up_ml_model(background=True)
+
+@app.on_event("shutdown")
+async def stop_admission_pool():
+    admission.shutdown()
+
+def _evolution_overrides(request: "DesignRequest") -> Dict:
+    """Optimizer settings the request overrides"""
+    overrides = {}
+    if request.population_size:
+        overrides["population_size"] = request.population_size
+    if request.generations is not None:
+        overrides["generations"] = request.generations
+    return overrides
+
+def _evolution_config(request: "DesignRequest", **overrides) -> EvolutionConfig:
+    """Engine optimizer settings with the request's overrides applied"""
+    return replace(design_engine.evolution_config, **{**_evolution_overrides(request), **overrides})
+
+def _finite(alternative) -> bool:
+    """Whether an alternative's totals and score are numbers JSON can carry"""
+    return all(map(math.isfinite, (
+        alternative.total_cost, alternative.total_carbon, alternative.sustainability_score
+    )))
+
 # Pydantic models
 class MaterialInput(BaseModel):
     name: str
@@ -44,10 +110,37 @@ class MaterialInput(BaseModel):
 
 class DesignRequest(BaseModel):
     building_area: float = Field(..., gt=0)
-    components: List[str] = []
+    # Component names, or measured quantities (m3) per component from a takeoff
+    components: Union[List[str], Dict[str, float]] = []
     max_budget: Optional[float] = None
     max_carbon: Optional[float] = None
     target_reduction: Optional[float] = Field(None, ge=0, le=100)
+    population_size: Optional[int] = Field(None, ge=2, le=100000)
+    generations: Optional[int] = Field(None, ge=0, le=1000)
+    mode: str = Field("evolutionary", regex="^(evolutionary|exact)$")
+
+class ParetoRequest(DesignRequest):
+    objectives: List[str] = ["cost", "carbon"]
+    max_rank: int = Field(0, ge=0)
+
+class PortfolioBuilding(BaseModel):
+    id: Optional[str] = None
+    building_area: float = Field(..., gt=0)
+    components: Union[List[str], Dict[str, float]] = []
+    max_budget: Optional[float] = None
+    max_carbon: Optional[float] = None
+
+class PortfolioRequest(BaseModel):
+    buildings: List[PortfolioBuilding]
+    max_budget: Optional[float] = None
+    max_carbon: Optional[float] = None
+    population_size: Optional[int] = Field(None, ge=2, le=100000)
+    generations: Optional[int] = Field(None, ge=0, le=1000)
+    top_k: int = Field(10, ge=1, le=100)
+    max_workers: Optional[int] = Field(None, ge=0, le=256)
+
+class RescoreRequest(BaseModel):
+    score_weights: Optional[Dict[str, float]] = None
 
 class SupplierRegistration(BaseModel):
     name: str
@@ -73,22 +166,59 @@ async def healthcheck():
     return {"status": "ok"}
 
 @app.post("/materials/calculate-lca")
-async def calculate_lca(material_data: MaterialInput):
-    """Calculate LCA for a material"""
+@admission.limit("/materials/calculate-lca")
+def calculate_lca(material_data: MaterialInput, method: Optional[LCAMethod] = None):
+    """Calculate LCA for a material, characterized by ``method`` (the engine's by default)"""
+    try:
+        assessment = lca_engine.assess_material(material_data.dict(), method)
+        
+        return {
+            "lca_results": assessment.lca_result.__dict__,
+            "carbon_label": assessment.carbon_label,
+            # Per request: materials with equal LCA inputs share an assessment, not an id
+            "material_id": f"MAT_{canonical_digest(material_data.dict())[:16]}"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/materials/calculate-lca/cache")
+async def lca_cache_stats():
+    """Hit/miss counters of the LCA assessment cache"""
+    return lca_engine.cache_stats()
+
+@app.post("/materials/calculate-lca/batch")
+@admission.limit("/materials/calculate-lca/batch")
+def calculate_lca_batch(materials: List[MaterialInput], method: Optional[LCAMethod] = None):
+    """Calculate LCA for many materials at once, returned column-wise"""
     try:
-        lca_result = lca_engine.calculate_carbon_footprint(material_data.dict())
-        carbon_label = lca_engine.generate_carbon_label(lca_result)
+        batch = lca_engine.calculate_carbon_footprint_batch(
+            [material.dict() for material in materials], method
+        )
         
         return {
-            "lca_results": lca_result.__dict__,
-            "carbon_label": carbon_label,
-            "material_id": f"MAT_{hash(str(material_data.dict()))}"
+            "count": len(batch),
+            "lca_results": batch.to_dict()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/materials/calculate-lca/batch/async")
+async def submit_lca_batch(materials: List[MaterialInput], method: Optional[LCAMethod] = None):
+    """Queue a batched LCA calculation; poll /tasks/status for progress"""
+    task = batch_lca_task.delay(
+        [material.dict() for material in materials], method=method.value if method else None
+    )
+    return {"task_id": task.id, "count": len(materials)}
+
+@app.post("/materials/rescore")
+async def submit_rescore(request: RescoreRequest):
+    """Queue a rescoring of the catalog, optionally with new score weights"""
+    task = rescore_catalog_task.delay(request.score_weights)
+    return {"task_id": task.id}
+
 @app.post("/materials/register")
-async def register_material(material_data: MaterialInput, supplier_id: str):
+@admission.limit("/materials/register")
+def register_material(material_data: MaterialInput, supplier_id: str):
     """Register a new material in the database"""
     try:
         material_dict = material_data.dict()
@@ -96,25 +226,188 @@ async def register_material(material_data: MaterialInput, supplier_id: str):
         
         passport = material_db.add_material(material_dict, lca_engine)
         
-        return {
-            "status": "success",
-            "material_id": passport.id,
-            "carbon_label": passport.carbon_label,
-            "blockchain_hash": passport.blockchain_hash
-        }
+        return _registration_result(passport)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _registration_result(passport: MaterialPassport) -> Dict:
+    return {
+        "status": "success",
+        "material_id": passport.id,
+        "carbon_label": passport.carbon_label,
+        "blockchain_hash": passport.blockchain_hash
+    }
+
+def _register_chunk(materials: List[Dict]) -> List[Dict]:
+    """Register a chunk with one batched LCA and store; isolate bad rows if either fails
+    
+    Passports a failed bulk store did keep are reported, not registered again.
+    """
+    try:
+        passports = material_db.build_passports(materials, lca_engine)
+    except Exception:
+        passports = [None] * len(materials)
+    else:
+        try:
+            material_db.add_passports(passports)
+            return [_registration_result(passport) for passport in passports]
+        except Exception:
+            pass
+    
+    results = []
+    for material, passport in zip(materials, passports):
+        try:
+            if passport is None:
+                passport = material_db.add_material(material, lca_engine)
+            elif passport.id not in material_db.materials:
+                material_db.add_passports([passport])
+            results.append(_registration_result(passport))
+        except Exception as e:
+            results.append({"status": "error", "detail": str(e)})
+    return results
+
+class DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body generator may still be reading the request
+    
+    Starlette's StreamingResponse listens for client disconnects on ``receive``,
+    which would swallow request body chunks; here the body reader sees the
+    disconnect instead.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+async def _ndjson_lines(request: Request):
+    """Yield raw lines of an NDJSON request body as it arrives"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+async def _register_chunk_admitted(materials: List[Dict]) -> List[Dict]:
+    """Run _register_chunk under admission control, backing off while overloaded"""
+    while True:
+        try:
+            return await admission.run("/materials/register/bulk", _register_chunk, materials)
+        except HTTPException as e:
+            if e.status_code not in (429, 503):
+                raise
+            # Wait rather than failing rows halfway through an upload
+            await asyncio.sleep(int(e.headers.get("Retry-After", 1)))
+
+@app.post("/materials/register/bulk")
+async def register_materials_bulk(request: Request, supplier_id: str):
+    """Register NDJSON MaterialInput rows, streaming one NDJSON result per row
+    
+    Rows are validated as they arrive and registered in fixed-size chunks, so
+    memory stays flat however large the upload is.
+    """
+    
+    async def register(pending: List):
+        """Register valid rows of a chunk; yield every row's result in line order"""
+        materials = [material for _, material, _ in pending if material is not None]
+        registered = iter(await _register_chunk_admitted(materials) if materials else [])
+        for line, material, error in pending:
+            yield {"line": line, **(error or next(registered))}
+    
+    async def stream():
+        pending = []  # (line number, material dict, validation error)
+        counts = {"success": 0, "error": 0}
+        line_no = 0
+        async for raw in _ndjson_lines(request):
+            line_no += 1
+            if not raw.strip():
+                continue
+            try:
+                material_dict = MaterialInput.parse_raw(raw).dict()
+                material_dict["supplier_id"] = supplier_id
+                pending.append((line_no, material_dict, None))
+            except ValueError as e:
+                pending.append((line_no, None, {"status": "error", "detail": str(e)}))
+            
+            if len(pending) < BULK_REGISTER_CHUNK_SIZE:
+                continue
+            async for result in register(pending):
+                counts[result["status"]] += 1
+                yield json.dumps(result) + "\n"
+            pending = []
+        
+        async for result in register(pending):
+            counts[result["status"]] += 1
+            yield json.dumps(result) + "\n"
+        yield json.dumps({"summary": {"registered": counts["success"], "failed": counts["error"]}}) + "\n"
+    
+    return DuplexStreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.delete("/materials/{material_id}")
+@admission.limit("/materials/{material_id}")
+def delete_material(material_id: str):
+    """Remove a material from the catalog"""
+    try:
+        passport = material_db.remove_material(material_id)
+        
+        return {"status": "deleted", "material_id": passport.id}
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Material {material_id} not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/materials/{material_id}/proof")
+@admission.limit("/materials/{material_id}/proof")
+def get_inclusion_proof(material_id: str):
+    """Merkle inclusion proof of a passport's hash in the catalog root"""
+    try:
+        proof = material_db.inclusion_proof(material_id)
+        
+        return {"material_id": material_id, **proof.to_dict()}
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Material {material_id} not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/integrity/root")
+@admission.limit("/integrity/root")
+def get_integrity_root():
+    """Merkle root over every passport hash in the catalog"""
+    try:
+        return {"root": material_db.merkle_root(), "total_materials": len(material_db.materials)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/integrity/verify")
+@admission.limit("/integrity/verify")
+def verify_integrity(max_workers: Optional[int] = Query(None, ge=1, le=64)):
+    """Rehash every passport in parallel and report the ones that no longer match"""
+    try:
+        return material_db.verify_integrity(max_workers=max_workers).to_dict()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/materials/search")
-async def search_materials(
+@admission.limit("/materials/search")
+def search_materials(
     category: Optional[str] = None,
     max_carbon: Optional[float] = None,
     min_recycled: Optional[float] = None,
     certifications: Optional[str] = None,
     max_cost: Optional[float] = None,
-    sort_by: str = "sustainability"
+    supplier_id: Optional[str] = None,
+    sort_by: str = "sustainability",
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None
 ):
-    """Search for sustainable materials"""
+    """Search for sustainable materials
+
+    Results are paginated by keyset: pass the returned ``next_cursor`` back
+    as ``cursor`` to fetch the following page.
+    """
     try:
         filters = {}
         if category:
@@ -127,12 +420,14 @@ async def search_materials(
             filters["certifications"] = certifications.split(",")
         if max_cost:
             filters["cost_range"] = (0, max_cost)
+        if supplier_id:
+            filters["supplier_id"] = supplier_id
         
-        materials = material_db.search_materials(filters)
+        page = material_db.search_page(filters, sort_by, order, limit, cursor)
         
         # Format response
         results = []
-        for mat in materials[:50]:  # Limit to 50 results
+        for mat in page.results:
             results.append({
                 "id": mat.id,
                 "name": mat.name,
@@ -144,25 +439,19 @@ async def search_materials(
                 "sustainability_score": material_db._calculate_sustainability_score(mat)
             })
         
-        # Sort results
-        if sort_by == "carbon":
-            results.sort(key=lambda x: x["embodied_carbon"])
-        elif sort_by == "cost":
-            results.sort(key=lambda x: x["cost"])
-        elif sort_by == "recycled":
-            results.sort(key=lambda x: x["recycled_content"], reverse=True)
-        else:  # sustainability
-            results.sort(key=lambda x: x["sustainability_score"], reverse=True)
-        
         return {
             "count": len(results),
-            "results": results
+            "results": results,
+            "next_cursor": page.next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/design/optimize")
-async def optimize_design(request: DesignRequest):
+@admission.limit("/design/optimize")
+def optimize_design(request: DesignRequest):
     """Optimize material selection for a building design"""
     try:
         building_data = {
@@ -175,31 +464,150 @@ async def optimize_design(request: DesignRequest):
             max_carbon=request.max_carbon or float('inf')
         )
         
-        alternatives = design_engine.optimize_material_selection(
-            building_data, constraints
-        )
+        if request.mode == "exact":
+            solution = design_engine.solve_exact(building_data, constraints)
+            alternatives = [solution.alternative] if solution.alternative else []
+        else:
+            alternatives = design_engine.optimize_material_selection(
+                building_data, constraints, _evolution_config(request)
+            )
         
         # Format alternatives
-        formatted_alternatives = []
-        for alt in alternatives[:10]:  # Return top 10 alternatives
-            formatted_alternatives.append({
-                "material_selections": alt.material_selections,
-                "total_cost": alt.total_cost,
-                "total_carbon": alt.total_carbon,
-                "carbon_intensity": alt.total_carbon / request.building_area,
-                "sustainability_score": alt.sustainability_score,
-                "tradeoffs": alt.tradeoffs
+        formatted_alternatives = [
+            alt.to_json(request.building_area)
+            for alt in alternatives[:10]  # Return top 10 alternatives
+        ]
+        
+        response = {
+            "alternatives": formatted_alternatives,
+            "building_area": request.building_area
+        }
+        if request.mode == "exact":
+            response.update({
+                "status": solution.status,
+                "infeasible_reason": solution.reason,
+                "nodes_explored": solution.nodes_explored
             })
+        return response
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/design/optimize/async")
+async def submit_optimize_design(request: DesignRequest):
+    """Queue a design optimization; poll /tasks/status for progress"""
+    task = optimize_design_task.delay(
+        {
+            "area": request.building_area,
+            "components": request.components if request.components else []
+        },
+        max_budget=request.max_budget,
+        max_carbon=request.max_carbon,
+        evolution_overrides=_evolution_overrides(request),
+        mode=request.mode
+    )
+    return {"task_id": task.id}
+
+@app.post("/design/pareto")
+@admission.limit("/design/pareto")
+def design_pareto_front(request: ParetoRequest):
+    """Cost / carbon (/ score) trade-off frontier of optimized designs"""
+    try:
+        building_data = {
+            "area": request.building_area,
+            "components": request.components if request.components else []
+        }
+        
+        constraints = DesignConstraint(
+            max_budget=request.max_budget or float('inf'),
+            max_carbon=request.max_carbon or float('inf')
+        )
+        
+        # Ranks every evaluated design, exhaustively for small instances
+        front = design_engine.optimize_pareto_front(
+            building_data,
+            constraints,
+            tuple(request.objectives),
+            request.max_rank,
+            _evolution_config(request)
+        )
         
         return {
-            "alternatives": formatted_alternatives,
+            "objectives": request.objectives,
+            "evaluated_alternatives": front.evaluated,
+            "exhaustive": front.exhaustive,
+            "points": [
+                {
+                    "rank": point.rank,
+                    "crowding_distance": (
+                        point.crowding_distance
+                        if point.crowding_distance != float("inf") else None
+                    ),
+                    "material_selections": point.alternative.material_selections,
+                    "total_cost": point.alternative.total_cost,
+                    "total_carbon": point.alternative.total_carbon,
+                    "carbon_intensity": point.alternative.total_carbon / request.building_area,
+                    "sustainability_score": point.alternative.sustainability_score
+                }
+                for point in front.points
+            ],
             "building_area": request.building_area
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/design/portfolio")
+async def optimize_portfolio(request: PortfolioRequest):
+    """Optimize many buildings in parallel, streaming NDJSON as each finishes"""
+    constraints = DesignConstraint(
+        max_budget=request.max_budget if request.max_budget is not None else float('inf'),
+        max_carbon=request.max_carbon if request.max_carbon is not None else float('inf')
+    )
+    buildings = [
+        {
+            "id": building.id if building.id is not None else str(index),
+            "area": building.building_area,
+            "components": building.components,
+            "max_budget": building.max_budget,
+            "max_carbon": building.max_carbon
+        }
+        for index, building in enumerate(request.buildings)
+    ]
+    areas = {building["id"]: building["area"] for building in buildings}
+    
+    def stream():
+        results = design_engine.optimize_portfolio(
+            buildings, constraints, _evolution_config(request), request.max_workers
+        )
+        for result in results:
+            area = areas[result.building_id]
+            # Strict JSON: alternatives with non-finite totals are never streamed
+            alternatives = [alt for alt in result.alternatives if _finite(alt)][:request.top_k]
+            yield json.dumps({
+                "building_id": result.building_id,
+                "elapsed_ms": result.elapsed_ms,
+                "evaluations": result.evaluations,
+                "alternatives": [
+                    {
+                        "material_selections": alt.material_selections,
+                        "total_cost": alt.total_cost,
+                        "total_carbon": alt.total_carbon,
+                        "carbon_intensity": alt.total_carbon / area,
+                        "sustainability_score": alt.sustainability_score
+                    }
+                    for alt in alternatives
+                ]
+            }, allow_nan=False) + "\n"
+    
+    # The slot is held until the last building is streamed, since the
+    # process pool does its work while the response is being read
+    results = await admission.stream("/design/portfolio", stream())
+    return StreamingResponse(results, media_type="application/x-ndjson")
+
 @app.post("/design/recommend-swaps")
-async def recommend_swaps(
+@admission.limit("/design/recommend-swaps")
+def recommend_swaps(
     current_materials: Dict[str, str],
     target_reduction: float = Query(..., ge=0, le=100)
 ):
@@ -214,17 +622,18 @@ async def recommend_swaps(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/suppliers/register")
-async def register_supplier(supplier_data: SupplierRegistration):
+@admission.limit("/suppliers/register")
+def register_supplier(supplier_data: SupplierRegistration):
     """Register a new supplier"""
     try:
-        supplier_id = f"SUP_{hash(str(supplier_data.dict()))}"
+        # A stable digest, so every worker derives the same id
+        digest = hashlib.sha256(str(supplier_data.dict()).encode()).hexdigest()
+        supplier_id = f"SUP_{digest[:16]}"
         
-        material_db.suppliers[supplier_id] = {
+        material_db.register_supplier(supplier_id, {
             **supplier_data.dict(),
-            "id": supplier_id,
-            "registration_date": datetime.now().isoformat(),
-            "materials_count": 0
-        }
+            "registration_date": datetime.now().isoformat()
+        })
         
         return {
             "status": "success",
@@ -234,45 +643,76 @@ async def register_supplier(supplier_data: SupplierRegistration):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/analytics/dashboard")
-async def get_analytics():
-    """Get dashboard analytics"""
+@app.get("/suppliers/leaderboard")
+@admission.limit("/suppliers/leaderboard")
+def get_supplier_leaderboard(
+    sort_by: str = Query(
+        "average_carbon",
+        pattern="^(material_count|average_carbon|average_cost|certification_count)$"
+    ),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=500),
+    min_materials: int = Query(1, ge=1)
+):
+    """Rank suppliers by material count, average carbon or cost, or certifications"""
     try:
-        total_materials = len(material_db.materials)
-        total_suppliers = len(material_db.suppliers)
+        leaderboard = material_db.get_supplier_leaderboard(sort_by, order, limit, min_materials)
         
-        # Calculate average carbon
-        carbons = [
-            m.lca_results.get("embodied_carbon", 0) 
-            for m in material_db.materials.values()
-        ]
-        avg_carbon = sum(carbons) / len(carbons) if carbons else 0
-        
-        # Calculate carbon savings potential
-        industry_avg = 2.5  # kg CO2e/kg for construction materials
-        potential_savings = sum(
-            max(0, industry_avg - carbon) 
-            for carbon in carbons
-        )
+        return {
+            "sort_by": sort_by,
+            "order": order or MaterialDatabase.SUPPLIER_SORT_KEYS[sort_by],
+            "count": len(leaderboard),
+            "suppliers": leaderboard
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/suppliers/{supplier_id}/analytics")
+@admission.limit("/suppliers/{supplier_id}/analytics")
+def get_supplier_analytics(supplier_id: str):
+    """Material count, average carbon and cost, categories and certifications of a supplier"""
+    analytics = material_db.get_supplier_analytics(supplier_id)
+    if not analytics and supplier_id not in material_db.suppliers:
+        raise HTTPException(status_code=404, detail=f"Supplier {supplier_id} not found")
+    
+    return {
+        "supplier_id": supplier_id,
+        "supplier": material_db.suppliers.get(supplier_id),
+        **(analytics or {
+            "material_count": 0,
+            "average_carbon": 0,
+            "average_cost": 0,
+            "categories": [],
+            "certification_count": 0
+        })
+    }
+
+@app.get("/analytics/dashboard")
+@admission.limit("/analytics/dashboard")
+def get_analytics():
+    """Get dashboard analytics from the catalog's running aggregates"""
+    try:
+        summary = material_db.get_dashboard_summary()
         
         return {
-            "total_materials": total_materials,
-            "total_suppliers": total_suppliers,
-            "average_carbon": avg_carbon,
-            "carbon_savings_potential": potential_savings,
+            "total_materials": summary["total_materials"],
+            "total_suppliers": len(material_db.suppliers),
+            "average_carbon": summary["average_carbon"],
+            "carbon_savings_potential": summary["carbon_savings_potential"],
             "material_categories": list(material_db.categories.keys()),
-            "top_performing_materials": [
-                {
-                    "name": mat.name,
-                    "carbon": mat.lca_results.get("embodied_carbon", 0),
-                    "score": material_db._calculate_sustainability_score(mat)
-                }
-                for mat in list(material_db.materials.values())[:5]
-            ]
+            "category_breakdown": summary["categories"],
+            "top_performing_materials": summary["top_performing_materials"]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics/admission")
+async def admission_metrics():
+    """Per-route queue time, service time and admission counters"""
+    return admission.metrics()
+
 @app.post("/tasks/ping")
 async def enqueue_ping():
     """Enqueue a Celery ping task"""
@@ -281,13 +721,21 @@ async def enqueue_ping():
 
 @app.get("/tasks/status/{task_id}")
 async def get_task_status(task_id: str):
-    """Fetch Celery task status by id"""
+    """Fetch Celery task status by id, with partial progress while running"""
     result = celery_app.AsyncResult(task_id)
-    return {
+    response = {
         "task_id": task_id,
         "status": result.status,
-        "result": result.result if result.ready() else None,
+        "result": None,
+        "progress": None,
     }
+    if result.status == "PROGRESS":
+        response["progress"] = result.info
+    elif result.failed():
+        response["error"] = str(result.result)
+    elif result.ready():
+        response["result"] = result.result
+    return response
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,246 @@
+import asyncio
+import functools
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+
+import numpy as np
+from fastapi import HTTPException
+
+# Marks the end of a streamed iterator
+_END = object()
+
+
+@dataclass
+class RouteLimit:
+    """Concurrency and queue bounds for one route"""
+
+    max_concurrency: int = 4
+    max_queue: int = 16
+
+
+class LatencyStats:
+    """Running count/mean/max plus percentiles over a bounded recent window"""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent = deque(maxlen=window)
+
+    def record(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.recent.append(ms)
+
+    def stats(self) -> Dict[str, float]:
+        recent = np.fromiter(self.recent, dtype=float) if self.recent else np.zeros(1)
+        return {
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": float(np.percentile(recent, 50)),
+            "p95_ms": float(np.percentile(recent, 95)),
+            "max_ms": self.max_ms,
+        }
+
+
+class _RouteState:
+    def __init__(self, limit: RouteLimit):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit.max_concurrency)
+        self.queued = 0
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.failed = 0
+        self.queue_time = LatencyStats()
+        self.service_time = LatencyStats()
+        # Smoothed service time used for Retry-After estimates
+        self.ewma_service_s = 0.0
+
+
+class AdmissionController:
+    """
+    Runs blocking handlers on a bounded thread pool behind per-route limits
+
+    Each route may have ``max_concurrency`` calls running and ``max_queue``
+    waiting; beyond that a call is rejected with 429. When the total number of
+    queued and running calls reaches ``max_pending`` every route is shedding
+    load and calls are rejected with 503. Both carry a Retry-After estimated
+    from the route's recent service time.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        default_limit: Optional[RouteLimit] = None,
+        limits: Optional[Dict[str, RouteLimit]] = None,
+    ):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.max_pending = max_pending or self.max_workers * 8
+        self.default_limit = default_limit or RouteLimit()
+        self.limits = dict(limits or {})
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="admission"
+        )
+        self._routes: Dict[str, _RouteState] = {}
+        self.shed = 0
+
+    def _state(self, route: str) -> _RouteState:
+        state = self._routes.get(route)
+        if state is None:
+            state = _RouteState(self.limits.get(route, self.default_limit))
+            self._routes[route] = state
+        return state
+
+    @property
+    def pending(self) -> int:
+        return sum(state.queued + state.running for state in self._routes.values())
+
+    def _retry_after(self, state: _RouteState) -> int:
+        waves = (state.queued + state.running) / state.limit.max_concurrency + 1
+        return max(1, math.ceil(state.ewma_service_s * waves))
+
+    def _reject(self, state: _RouteState, status_code: int, detail: str):
+        state.rejected += 1
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(self._retry_after(state))},
+        )
+
+    async def _acquire(self, state: _RouteState, route: str) -> float:
+        """Admit a call and wait for a concurrency slot; returns when it started"""
+        if self.pending >= self.max_pending:
+            self.shed += 1
+            self._reject(state, 503, "Server overloaded, retry later")
+        if state.queued >= state.limit.max_queue:
+            self._reject(state, 429, f"Too many concurrent requests for {route}")
+
+        state.admitted += 1
+        state.queued += 1
+        enqueued = time.perf_counter()
+        try:
+            await state.semaphore.acquire()
+        finally:
+            state.queued -= 1
+
+        started = time.perf_counter()
+        state.queue_time.record((started - enqueued) * 1000)
+        state.running += 1
+        return started
+
+    def _release(self, state: _RouteState, started: float):
+        elapsed = time.perf_counter() - started
+        state.service_time.record(elapsed * 1000)
+        state.ewma_service_s = (
+            elapsed if state.service_time.count == 1 else 0.8 * state.ewma_service_s + 0.2 * elapsed
+        )
+        state.running -= 1
+        state.semaphore.release()
+
+    async def run(self, route: str, fn: Callable, *args, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` on the executor, subject to admission
+
+        Args:
+            route: name the limits and metrics are keyed by
+            fn: blocking callable
+        """
+        state = self._state(route)
+        started = await self._acquire(state, route)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        except Exception:
+            state.failed += 1
+            raise
+        finally:
+            self._release(state, started)
+
+    async def stream(self, route: str, items: Iterator) -> AsyncIterator:
+        """
+        Admit a streamed response now and produce ``items`` on the executor
+
+        Rejections are raised here, before the response starts. The slot is
+        held until the iterator is exhausted or the client goes away, in which
+        case the iterator is closed once its in-flight item finishes.
+
+        Args:
+            route: name the limits and metrics are keyed by
+            items: blocking iterator, e.g. a generator doing the work lazily
+        """
+        state = self._state(route)
+        started = await self._acquire(state, route)
+
+        async def produce():
+            future = None
+            try:
+                while True:
+                    future = self.executor.submit(next, items, _END)
+                    item = await asyncio.wrap_future(future)
+                    if item is _END:
+                        return
+                    yield item
+            except Exception:
+                state.failed += 1
+                raise
+            finally:
+                close = getattr(items, "close", None)
+                if close is not None:
+                    if future is not None and not future.done():
+                        future.add_done_callback(lambda _: close())
+                    else:
+                        close()
+                self._release(state, started)
+
+        return produce()
+
+    def limit(self, route: str, limit: Optional[RouteLimit] = None) -> Callable:
+        """Decorator turning a blocking handler into an admission-controlled coroutine
+
+        The wrapper keeps the handler's signature, so FastAPI still sees its
+        parameters.
+        """
+        if limit is not None:
+            self.limits[route] = limit
+
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                return await self.run(route, fn, *args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def metrics(self) -> Dict:
+        """Per-route queue time, service time and admission counters"""
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "shed": self.shed,
+            "routes": {
+                route: {
+                    "max_concurrency": state.limit.max_concurrency,
+                    "max_queue": state.limit.max_queue,
+                    "queued": state.queued,
+                    "running": state.running,
+                    "admitted": state.admitted,
+                    "rejected": state.rejected,
+                    "failed": state.failed,
+                    "queue_time": state.queue_time.stats(),
+                    "service_time": state.service_time.stats(),
+                }
+                for route, state in self._routes.items()
+            },
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,129 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Indicators every characterization produces, in matrix column order
+INDICATORS = ("GWP", "AP", "EP", "water", "energy")
+
+# Factor keys read for each indicator, first match wins. Datasets name the
+# same indicator differently, e.g. cumulative energy demand as "CED"
+INDICATOR_KEYS = {
+    "GWP": ("GWP", "GWP100", "climate change"),
+    "AP": ("AP", "acidification"),
+    "EP": ("EP", "eutrophication"),
+    "water": ("water", "water use", "water consumption", "WU"),
+    "energy": ("energy", "cumulative energy demand", "CED", "primary energy", "PED"),
+}
+
+# Method-neutral factors are in CML units (kg CO2e, kg SO2e, kg PO4e, L, MJ);
+# these scales convert them to each method's units. TRACI reports
+# eutrophication in kg N eq: 1 kg P is 7.29 kg N eq there and 3.06 kg PO4 eq in CML
+METHOD_SCALES = {
+    "CML": (1.0, 1.0, 1.0, 1.0, 1.0),
+    "TRACI": (1.0, 1.0, 7.29 / 3.06, 1.0, 1.0),
+    "Impact World+": (1.0, 1.0, 1.0, 1.0, 1.0),
+    "Ecoinvent": (1.0, 1.0, 1.0, 1.0, 1.0),
+}
+
+
+def characterize(factors: Dict[str, float], method: str) -> np.ndarray:
+    """
+    Indicator vector of one ingredient under ``method``
+
+    A method-specific factor (key ``"<method>:<indicator>"``, e.g.
+    ``"TRACI:EP"``) is used as given; otherwise the method-neutral factor is
+    converted with ``METHOD_SCALES``. Missing indicators are 0.
+    """
+    scales = METHOD_SCALES.get(method, METHOD_SCALES["Ecoinvent"])
+    vector = np.zeros(len(INDICATORS))
+    for column, indicator in enumerate(INDICATORS):
+        specific = factors.get(f"{method}:{indicator}")
+        if specific is not None:
+            vector[column] = specific
+            continue
+        value = next((factors[key] for key in INDICATOR_KEYS[indicator] if key in factors), 0)
+        vector[column] = value * scales[column]
+    return vector
+
+
+class CharacterizationMatrix:
+    """
+    ingredients x ``INDICATORS`` characterization factors of one LCA method
+
+    Rows are added the first time an ingredient is seen, from one bulk
+    lookup per call, so large factor databases are never loaded whole. Rows
+    at and after ``len(index)`` are always zero and serve as padding.
+    """
+
+    def __init__(self, method: str, capacity: int = 64):
+        self.method = method
+        self.index: Dict[str, int] = {}
+        self.matrix = np.zeros((capacity, len(INDICATORS)))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def ensure(
+        self,
+        ingredients: Iterable[str],
+        lookup: Callable[[List[str]], Dict[str, Dict[str, float]]],
+    ):
+        """Add rows for known ingredients not characterized yet"""
+        new = [i for i in dict.fromkeys(ingredients) if i not in self.index]
+        if not new:
+            return
+        found = lookup(new)
+        with self._lock:
+            new = [i for i in new if i in found and i not in self.index]
+            needed = len(self.index) + len(new) + 1
+            if needed > len(self.matrix):
+                grown = np.zeros((max(needed, 2 * len(self.matrix)), len(INDICATORS)))
+                grown[: len(self.index)] = self.matrix[: len(self.index)]
+                # Swap in a complete array, so concurrent readers never see a partial one
+                self.matrix = grown
+            for ingredient in new:
+                row = len(self.index)
+                self.matrix[row] = characterize(found[ingredient], self.method)
+                self.index[ingredient] = row
+
+    def pack(self, compositions: List[Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compositions as padded (row, percentage) slot matrices
+
+        Unknown ingredients and padding point at a zero row. Rows are
+        reserved before returning, so the caller reads ``self.matrix`` after.
+        """
+        padding = len(self.index)
+        width = max((len(c) for c in compositions), default=0)
+        rows = np.full((len(compositions), width), padding, dtype=np.int64)
+        shares = np.zeros((len(compositions), width))
+        index = self.index
+        for i, composition in enumerate(compositions):
+            for slot, (ingredient, share) in enumerate(composition.items()):
+                row = index.get(ingredient)
+                if row is not None and row < padding:
+                    rows[i, slot] = row
+                    shares[i, slot] = share
+        return rows, shares
+
+    def totals(
+        self,
+        compositions: List[Dict[str, float]],
+        lookup: Callable[[List[str]], Dict[str, Dict[str, float]]],
+    ) -> np.ndarray:
+        """
+        compositions x ``INDICATORS`` impacts, sum(percentage / 100 * factors)
+
+        The sparse compositions matrix (ELLPACK slots) times the
+        characterization matrix; slots are accumulated in composition order,
+        so a single material gives exactly its value within any batch.
+        """
+        self.ensure((i for c in compositions for i in c), lookup)
+        rows, shares = self.pack(compositions)
+        matrix = self.matrix
+        totals = np.zeros((len(compositions), len(INDICATORS)))
+        for slot in range(rows.shape[1]):
+            totals += matrix[rows[:, slot]] * shares[:, slot, None] / 100
+        return totals
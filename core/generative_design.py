@@ -1,7 +1,10 @@
+import math
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 import json
+from .knapsack import solve_multiple_choice_knapsack
+from .pareto import ParetoArchive, crowding_distance, non_dominated_ranks
 
 
 @dataclass
@@ -21,6 +24,178 @@ class DesignConstraint:
             self.material_categories = []
 
 
+@dataclass
+class EvolutionConfig:
+    """Parameters of the evolutionary optimizer"""
+
+    population_size: int = 256
+    generations: int = 60
+    tournament_size: int = 3
+    crossover_rate: float = 0.9
+    mutation_rate: float = 0.1  # per component gene
+    elite_count: int = 8
+    max_alternatives: int = 100
+    seed: Optional[int] = None
+
+
+@dataclass
+class EvolutionResult:
+    """Best distinct feasible designs found by an evolutionary run, best first"""
+
+    designs: np.ndarray  # designs x components, index into each candidate list
+    total_cost: np.ndarray
+    total_carbon: np.ndarray
+    scores: np.ndarray
+    evaluations: int
+
+
+def design_scores(avg_material_score, total_cost, total_carbon):
+    """Overall design score; works on scalars and arrays alike"""
+    # Normalize cost and carbon (lower is better)
+    # Assuming typical values for normalization
+    cost_score = np.maximum(0, 100 - (total_cost / 1000))  # Normalize to $1000/m2
+    carbon_score = np.maximum(0, 100 - (total_carbon * 10))  # Normalize
+
+    # Weighted score
+    return avg_material_score * 0.5 + cost_score * 0.25 + carbon_score * 0.25
+
+
+def design_totals(
+    designs: np.ndarray, cost: np.ndarray, carbon: np.ndarray, material_scores: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Total cost, total carbon and design score of designs given as a candidate per component"""
+    components = np.arange(designs.shape[1])
+    total_cost = cost[components, designs].sum(axis=1)
+    total_carbon = carbon[components, designs].sum(axis=1)
+    # A design without components has a material score of 0, not the NaN of an empty mean
+    avg_material_score = material_scores[components, designs].sum(axis=1) / max(len(components), 1)
+    scores = design_scores(avg_material_score, total_cost, total_carbon)
+    return total_cost, total_carbon, scores
+
+
+def evolve_designs(
+    cost: np.ndarray,
+    carbon: np.ndarray,
+    material_scores: np.ndarray,
+    counts: np.ndarray,
+    max_budget: float,
+    max_carbon: float,
+    config: EvolutionConfig,
+    rng: Optional[np.random.Generator] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    observe: Optional[Callable[..., None]] = None,
+) -> EvolutionResult:
+    """
+    Genetic algorithm over one-material-per-component designs
+
+    Args:
+        cost: components x candidates matrix of quantity-weighted cost
+        carbon: components x candidates matrix of quantity-weighted carbon
+        material_scores: components x candidates matrix of material scores
+        counts: number of valid candidates per component (rows are padded)
+        max_budget: total cost limit
+        max_carbon: total carbon limit
+        config: population, generation and operator settings
+        rng: random generator; defaults to one seeded from ``config.seed``
+        progress: called with (generation, generations) after each generation
+        observe: called with (population, total_cost, total_carbon, scores,
+            feasible) for every evaluated population, e.g. to collect a front
+    """
+    rng = rng if rng is not None else np.random.default_rng(config.seed)
+    n_components = len(counts)
+    size = max(config.population_size, 2)
+
+    def evaluate(population):
+        total_cost, total_carbon, scores = design_totals(
+            population, cost, carbon, material_scores
+        )
+        feasible = (total_cost <= max_budget) & (total_carbon <= max_carbon)
+
+        # Infeasible designs rank below every feasible one, closer misses first
+        with np.errstate(divide="ignore", invalid="ignore"):
+            violation = np.maximum(0, total_cost / max_budget - 1) + np.maximum(
+                0, total_carbon / max_carbon - 1
+            )
+        fitness = np.where(feasible, scores, -1 - np.nan_to_num(violation, nan=0))
+        return total_cost, total_carbon, scores, feasible, fitness
+
+    # Archive of the best distinct feasible designs seen in any generation
+    archive_size = max(config.max_alternatives, 1)
+    archive = EvolutionResult(
+        designs=np.empty((0, n_components), dtype=np.int64),
+        total_cost=np.empty(0),
+        total_carbon=np.empty(0),
+        scores=np.empty(0),
+        evaluations=0,
+    )
+
+    def update_archive(population, total_cost, total_carbon, scores, feasible):
+        keep = feasible
+        if len(archive.scores) == archive_size:
+            keep = keep & (scores > archive.scores[-1])
+        keep = np.flatnonzero(keep)
+        if not len(keep):
+            return
+        if len(keep) > 2 * archive_size:
+            # Only the generation's best can displace archive entries
+            keep = keep[np.argpartition(-scores[keep], 2 * archive_size)[: 2 * archive_size]]
+        designs, first = np.unique(
+            np.concatenate([archive.designs, population[keep]]), axis=0, return_index=True
+        )
+        merged = [
+            np.concatenate([getattr(archive, name), values[keep]])[first]
+            for name, values in (
+                ("total_cost", total_cost),
+                ("total_carbon", total_carbon),
+                ("scores", scores),
+            )
+        ]
+        best = np.argsort(-merged[2], kind="stable")[:archive_size]
+        archive.designs = designs[best]
+        archive.total_cost, archive.total_carbon, archive.scores = (m[best] for m in merged)
+
+    population = np.floor(rng.random((size, n_components)) * counts).astype(np.int64)
+    total_cost, total_carbon, scores, feasible, fitness = evaluate(population)
+    update_archive(population, total_cost, total_carbon, scores, feasible)
+    if observe is not None:
+        observe(population, total_cost, total_carbon, scores, feasible)
+    elite_count = min(config.elite_count, size)
+
+    for generation in range(config.generations):
+        # Tournament selection of two parents per child
+        entrants = rng.integers(0, size, (2, size, max(config.tournament_size, 1)))
+        winners = np.take_along_axis(
+            entrants, fitness[entrants].argmax(axis=2)[..., None], axis=2
+        )[..., 0]
+        parent_a, parent_b = population[winners[0]], population[winners[1]]
+
+        # Uniform crossover
+        crossover = rng.random(size) < config.crossover_rate
+        from_b = (rng.random((size, n_components)) < 0.5) & crossover[:, None]
+        children = np.where(from_b, parent_b, parent_a)
+
+        # Mutation redraws a gene among that component's candidates
+        mutate = rng.random((size, n_components)) < config.mutation_rate
+        redraw = np.floor(rng.random((size, n_components)) * counts).astype(np.int64)
+        children[mutate] = redraw[mutate]
+
+        # Elitism carries the best designs over unchanged
+        if elite_count:
+            elites = np.argpartition(-fitness, elite_count - 1)[:elite_count]
+            children[:elite_count] = population[elites]
+
+        population = children
+        total_cost, total_carbon, scores, feasible, fitness = evaluate(population)
+        update_archive(population, total_cost, total_carbon, scores, feasible)
+        if observe is not None:
+            observe(population, total_cost, total_carbon, scores, feasible)
+        if progress is not None:
+            progress(generation + 1, config.generations)
+
+    archive.evaluations = size * (config.generations + 1)
+    return archive
+
+
 @dataclass
 class DesignAlternative:
     """Alternative design solution"""
@@ -31,13 +206,162 @@ class DesignAlternative:
     sustainability_score: float
     tradeoffs: Dict[str, float]
 
+    def to_json(self, building_area: float) -> Dict:
+        """Convert alternative to JSON format"""
+        return {
+            "material_selections": self.material_selections,
+            "total_cost": self.total_cost,
+            "total_carbon": self.total_carbon,
+            "carbon_intensity": self.total_carbon / building_area,
+            "sustainability_score": self.sustainability_score,
+            "tradeoffs": self.tradeoffs,
+        }
+
+
+@dataclass
+class CandidateContext:
+    """Per-component candidate statistics, computed once per optimization run
+
+    Candidate tables are padded to the longest candidate list; ``counts``
+    gives the valid width of each row. Tradeoffs of every candidate against
+    its component's average are precomputed, so an alternative's tradeoffs
+    are O(1) lookups and a whole population is one gather.
+    """
+
+    components: List[str]
+    candidates: Dict[str, List]
+    index: Dict[str, Dict[str, int]]  # component -> material id -> column
+    counts: np.ndarray
+    unit_cost: np.ndarray  # components x candidates
+    unit_carbon: np.ndarray
+    material_scores: np.ndarray
+    mean_cost: np.ndarray  # per component
+    mean_carbon: np.ndarray
+    std_cost: np.ndarray
+    std_carbon: np.ndarray
+    carbon_savings: np.ndarray  # % below the component's mean carbon
+    cost_premium: np.ndarray  # % above the component's mean cost
+    value_ratio: np.ndarray
+
+    @classmethod
+    def build(
+        cls, candidate_materials: Dict[str, List], material_db: "MaterialDatabase"
+    ) -> "CandidateContext":
+        candidates = {c: m for c, m in candidate_materials.items() if m}
+        components = list(candidates)
+        counts = np.array([len(candidates[c]) for c in components], dtype=np.int64)
+        width = int(counts.max()) if len(counts) else 0
+
+        unit_cost = np.zeros((len(components), width))
+        unit_carbon = np.zeros_like(unit_cost)
+        material_scores = np.zeros_like(unit_cost)
+        for i, component in enumerate(components):
+            materials = candidates[component]
+            unit_cost[i, : counts[i]] = [m.cost_per_unit for m in materials]
+            unit_carbon[i, : counts[i]] = [
+                m.lca_results.get("embodied_carbon", 0) for m in materials
+            ]
+            material_scores[i, : counts[i]] = [
+                material_db._calculate_sustainability_score(m) for m in materials
+            ]
+
+        valid = np.arange(width) < counts[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_cost = np.where(valid, unit_cost, 0).sum(axis=1) / counts
+            mean_carbon = np.where(valid, unit_carbon, 0).sum(axis=1) / counts
+            std_cost = np.sqrt(
+                np.where(valid, (unit_cost - mean_cost[:, None]) ** 2, 0).sum(axis=1) / counts
+            )
+            std_carbon = np.sqrt(
+                np.where(valid, (unit_carbon - mean_carbon[:, None]) ** 2, 0).sum(axis=1)
+                / counts
+            )
+            carbon_savings = (mean_carbon[:, None] - unit_carbon) / mean_carbon[:, None] * 100
+            cost_premium = (unit_cost - mean_cost[:, None]) / mean_cost[:, None] * 100
+            # Avoid division by zero
+            value_ratio = np.abs(carbon_savings / (cost_premium + 0.01))
+
+        return cls(
+            components=components,
+            candidates=candidates,
+            index={
+                c: {m.id: j for j, m in enumerate(candidates[c])} for c in components
+            },
+            counts=counts,
+            unit_cost=unit_cost,
+            unit_carbon=unit_carbon,
+            material_scores=material_scores,
+            mean_cost=mean_cost,
+            mean_carbon=mean_carbon,
+            std_cost=std_cost,
+            std_carbon=std_carbon,
+            carbon_savings=carbon_savings,
+            cost_premium=cost_premium,
+            value_ratio=value_ratio,
+        )
+
+    def tradeoffs(self, design: np.ndarray) -> Dict[str, Dict[str, float]]:
+        """Tradeoffs of one design given as a candidate index per component"""
+        rows = np.arange(len(self.components))
+        savings = self.carbon_savings[rows, design].tolist()
+        premium = self.cost_premium[rows, design].tolist()
+        ratio = self.value_ratio[rows, design].tolist()
+        return {
+            component: {
+                "carbon_savings": savings[i],
+                "cost_premium": premium[i],
+                "value_ratio": ratio[i],
+            }
+            for i, component in enumerate(self.components)
+        }
+
+
+@dataclass
+class DesignSolution:
+    """Outcome of the exact optimizer, including why a design is infeasible"""
+
+    status: str  # "optimal", "infeasible" or "node_limit"
+    alternative: Optional[DesignAlternative] = None
+    reason: Optional[str] = None
+    nodes_explored: int = 0
+
+
+@dataclass
+class ParetoPoint:
+    """Alternative on a cost/carbon/score trade-off front"""
+
+    alternative: DesignAlternative
+    rank: int  # 0 = non-dominated
+    crowding_distance: float
+
+
+@dataclass
+class ParetoFront:
+    """Trade-off front of a building design and how it was searched"""
+
+    points: List[ParetoPoint]
+    evaluated: int  # designs ranked to find the front
+    exhaustive: bool  # every feasible design was ranked, so the front is exact
+
 
 class GenerativeDesignEngine:
     """AI-powered generative design for sustainable material selection"""
 
-    def __init__(self, material_db: "MaterialDatabase"):
+    # Pareto objectives, expressed so that lower is better
+    PARETO_OBJECTIVES = {
+        "cost": lambda alt: alt.total_cost,
+        "carbon": lambda alt: alt.total_carbon,
+        "score": lambda alt: -alt.sustainability_score,
+    }
+
+    def __init__(
+        self,
+        material_db: "MaterialDatabase",
+        evolution_config: Optional[EvolutionConfig] = None,
+    ):
         self.material_db = material_db
         self.component_templates = self._load_component_templates()
+        self.evolution_config = evolution_config or EvolutionConfig()
 
     def _load_component_templates(self) -> Dict:
         """Load standard building component templates"""
@@ -69,7 +393,12 @@ class GenerativeDesignEngine:
         }
 
     def optimize_material_selection(
-        self, building_data: Dict, constraints: DesignConstraint
+        self,
+        building_data: Dict,
+        constraints: DesignConstraint,
+        evolution_config: Optional[EvolutionConfig] = None,
+        mode: str = "evolutionary",
+        progress: Optional[Callable[[int, int], None]] = None,
     ) -> List[DesignAlternative]:
         """
         Optimize material selection for a building design
@@ -77,91 +406,425 @@ class GenerativeDesignEngine:
         Args:
             building_data: Dictionary containing building specifications
                 - area: float (m2)
-                - components: Dict of component types and quantities
+                - components: component types, or a dict of measured
+                  quantities per component (m3, or takeoff entries with a
+                  "volume"); unmeasured components use template quantities
             constraints: Design constraints
+            evolution_config: Overrides the engine's optimizer settings
+            mode: "evolutionary" for a ranked set of alternatives, or "exact"
+                for the single minimum-carbon design (see ``solve_exact``)
+            progress: called with (generation, generations) as the GA advances
         """
+        if mode == "exact":
+            solution = self.solve_exact(building_data, constraints)
+            return [solution.alternative] if solution.alternative else []
+        if mode != "evolutionary":
+            raise ValueError(f"Unknown optimization mode '{mode}'")
 
         area = building_data.get("area", 1000)  # default 1000 m2
         components = building_data.get("components", self.component_templates.keys())
 
         # Get all candidate materials
+        candidate_materials = self._collect_candidates(
+            components, constraints, limit=10  # Top 10 options
+        )
+
+        # Generate alternatives using multi-objective optimization
+        alternatives = self._generate_alternatives(
+            candidate_materials,
+            area,
+            constraints,
+            evolution_config,
+            progress,
+            quantities=self._measured_quantities(building_data),
+        )
+
+        # Sort by sustainability score
+        alternatives.sort(key=lambda x: x.sustainability_score, reverse=True)
+
+        return alternatives
+
+    def optimize_portfolio(
+        self,
+        buildings: List[Dict],
+        constraints: DesignConstraint,
+        evolution_config: Optional[EvolutionConfig] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator["PortfolioResult"]:
+        """
+        Optimize a portfolio of buildings across a process pool
+
+        Candidate tables are built once and shared with the workers through
+        shared memory; results are yielded as each building finishes, so the
+        order follows completion rather than input. Buildings without a
+        component that has candidates get no alternatives.
+
+        Args:
+            buildings: building dicts with ``id``, ``area``, optional
+                ``components`` and optional per-building ``max_budget`` /
+                ``max_carbon`` overriding ``constraints``
+            constraints: material constraints shared by the portfolio
+            evolution_config: Overrides the engine's optimizer settings
+            max_workers: process count; 0 runs in-process, None uses all cores
+        """
+        from .portfolio import optimize_portfolio
+
+        candidate_materials = self._collect_candidates(
+            self.component_templates, constraints, limit=10  # Top 10 options
+        )
+        context = CandidateContext.build(candidate_materials, self.material_db)
+        rows = {component: i for i, component in enumerate(context.components)}
+
+        tasks = []
+        for index, building in enumerate(buildings):
+            area = building.get("area", 1000)  # default 1000 m2
+            components = building.get("components") or self.component_templates.keys()
+            building_rows = [rows[c] for c in components if c in rows]
+            measured = self._measured_quantities(building)
+            tasks.append(
+                (
+                    str(building.get("id", index)),
+                    building_rows,
+                    [
+                        self._component_quantity(context.components[r], area, measured)
+                        for r in building_rows
+                    ],
+                    self._building_limit(building, "max_budget", constraints.max_budget),
+                    self._building_limit(building, "max_carbon", constraints.max_carbon),
+                )
+            )
+
+        return optimize_portfolio(
+            context, tasks, evolution_config or self.evolution_config, max_workers
+        )
+
+    @staticmethod
+    def _building_limit(building: Dict, key: str, default: float) -> float:
+        """Per-building limit; only a missing or None value falls back, so 0 is a real limit"""
+        value = building.get(key)
+        return default if value is None else value
+
+    def _collect_candidates(
+        self, components, constraints: DesignConstraint, limit: Optional[int] = None
+    ) -> Dict[str, List]:
+        """Candidate materials per known component, best sustainability first"""
         candidate_materials = {}
         for component in components:
             if component in self.component_templates:
-                template = self.component_templates[component]
-                material_options = self.material_db.search_materials(
+                candidate_materials[component] = self.material_db.search_materials(
                     {
                         "category": component,
                         "max_carbon": constraints.max_carbon,
                         "min_recycled": constraints.min_recycled,
                         "certifications": constraints.certifications,
-                    }
+                    },
+                    sort_by="sustainability",
+                    limit=limit,
                 )
-                candidate_materials[component] = material_options[:10]  # Top 10 options
-
-        # Generate alternatives using multi-objective optimization
-        alternatives = self._generate_alternatives(
-            candidate_materials, area, constraints
-        )
+        return candidate_materials
+
+    @staticmethod
+    def _measured_quantities(building_data: Dict) -> Dict[str, float]:
+        """Measured volume per component when ``components`` maps components to quantities"""
+        components = building_data.get("components")
+        if not isinstance(components, dict):
+            return {}
+        quantities = {}
+        for component, quantity in components.items():
+            if isinstance(quantity, dict):
+                quantity = quantity.get("volume")
+            if quantity is not None:
+                quantities[component] = float(quantity)
+        return quantities
+
+    def _component_quantity(
+        self, component: str, area: float, measured: Optional[Dict[str, float]] = None
+    ) -> float:
+        """Measured quantity of a component if known, else the template estimate for the area"""
+        if measured and component in measured:
+            return measured[component]
+        template = self.component_templates.get(component, {})
+        return template.get("quantity_per_m2", 0.1) * area
+
+    def solve_exact(
+        self, building_data: Dict, constraints: DesignConstraint, max_nodes: int = 1_000_000
+    ) -> DesignSolution:
+        """
+        Provably minimum-carbon design within ``max_budget``
 
-        # Sort by sustainability score
-        alternatives.sort(key=lambda x: x.sustainability_score, reverse=True)
+        Cost and carbon add up across components and each component takes
+        exactly one material, so this is a multiple-choice knapsack solved
+        exactly by branch-and-bound over every matching candidate.
+        """
+        area = building_data.get("area", 1000)  # default 1000 m2
+        components = building_data.get("components", self.component_templates.keys())
+        candidate_materials = self._collect_candidates(components, constraints)
+
+        if not candidate_materials:
+            return DesignSolution("infeasible", reason="No known building components requested")
+        for component, materials in candidate_materials.items():
+            if not materials:
+                return DesignSolution(
+                    "infeasible",
+                    reason=f"No materials for '{component}' satisfy the material constraints",
+                )
 
-        return alternatives
+        context = CandidateContext.build(candidate_materials, self.material_db)
+        components = context.components
+        measured = self._measured_quantities(building_data)
+        quantities = [self._component_quantity(c, area, measured) for c in components]
+        costs = [
+            context.unit_cost[i, :count] * quantity
+            for i, (count, quantity) in enumerate(zip(context.counts, quantities))
+        ]
+        carbons = [
+            context.unit_carbon[i, :count] * quantity
+            for i, (count, quantity) in enumerate(zip(context.counts, quantities))
+        ]
+
+        result = solve_multiple_choice_knapsack(
+            costs, carbons, constraints.max_budget, max_nodes=max_nodes
+        )
+        if result.status == "infeasible":
+            cheapest = sum(cost.min() for cost in costs)
+            return DesignSolution(
+                "infeasible",
+                reason=(
+                    f"Cheapest design costs {cheapest:.2f}, "
+                    f"above max_budget {constraints.max_budget:.2f}"
+                ),
+                nodes_explored=result.nodes_explored,
+            )
+        if result.total_value > constraints.max_carbon:
+            return DesignSolution(
+                "infeasible",
+                reason=(
+                    f"Lowest achievable carbon {result.total_value:.2f} "
+                    f"exceeds max_carbon {constraints.max_carbon:.2f}"
+                ),
+                nodes_explored=result.nodes_explored,
+            )
+
+        selections = {
+            c: candidate_materials[c][choice].id for c, choice in zip(components, result.choices)
+        }
+        alternative = DesignAlternative(
+            material_selections=selections,
+            total_cost=result.total_cost,
+            total_carbon=result.total_value,
+            sustainability_score=self._calculate_design_score(
+                selections, result.total_cost, result.total_value
+            ),
+            tradeoffs=context.tradeoffs(np.array(result.choices)),
+        )
+        return DesignSolution(
+            result.status, alternative=alternative, nodes_explored=result.nodes_explored
+        )
 
     def _generate_alternatives(
         self,
         candidate_materials: Dict[str, List],
         area: float,
         constraints: DesignConstraint,
+        evolution_config: Optional[EvolutionConfig] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        quantities: Optional[Dict[str, float]] = None,
     ) -> List[DesignAlternative]:
-        """Generate design alternatives using genetic algorithm approach"""
-
-        alternatives = []
-
-        # Generate random combinations
-        for _ in range(100):  # Generate 100 random alternatives
-            selections = {}
-            total_cost = 0
-            total_carbon = 0
-
-            for component, materials in candidate_materials.items():
-                if materials:
-                    # Random selection
-                    selected = np.random.choice(materials)
-                    selections[component] = selected.id
-
-                    # Calculate quantities
-                    template = self.component_templates.get(component, {})
-                    quantity = template.get("quantity_per_m2", 0.1) * area
-
-                    # Add to totals
-                    total_cost += selected.cost_per_unit * quantity
-                    total_carbon += (
-                        selected.lca_results.get("embodied_carbon", 0) * quantity
-                    )
-
-            # Check constraints
-            if total_cost <= constraints.max_budget and total_carbon <= constraints.max_carbon:
-                # Calculate sustainability score
-                sustainability_score = self._calculate_design_score(
-                    selections, total_cost, total_carbon
-                )
+        """Generate design alternatives using a genetic algorithm"""
+
+        config = evolution_config or self.evolution_config
+        context = CandidateContext.build(candidate_materials, self.material_db)
+        if not context.components:
+            return []
+
+        weights = np.array(
+            [self._component_quantity(c, area, quantities) for c in context.components]
+        )[:, None]
+        result = evolve_designs(
+            context.unit_cost * weights,
+            context.unit_carbon * weights,
+            context.material_scores,
+            context.counts,
+            constraints.max_budget,
+            constraints.max_carbon,
+            config,
+            progress=progress,
+        )
 
-                # Calculate tradeoffs
-                tradeoffs = self._calculate_tradeoffs(selections, candidate_materials)
-
-                alternatives.append(
-                    DesignAlternative(
-                        material_selections=selections,
-                        total_cost=total_cost,
-                        total_carbon=total_carbon,
-                        sustainability_score=sustainability_score,
-                        tradeoffs=tradeoffs,
-                    )
-                )
+        return [
+            self._to_alternative(context, design, cost, carbon, score)
+            for design, cost, carbon, score in zip(
+                result.designs, result.total_cost, result.total_carbon, result.scores
+            )
+        ]
+
+    @staticmethod
+    def _to_alternative(
+        context: CandidateContext,
+        design: np.ndarray,
+        total_cost: float,
+        total_carbon: float,
+        score: float,
+    ) -> DesignAlternative:
+        """Alternative for a design given as a candidate index per component"""
+        return DesignAlternative(
+            material_selections={
+                component: context.candidates[component][index].id
+                for component, index in zip(context.components, design)
+            },
+            total_cost=float(total_cost),
+            total_carbon=float(total_carbon),
+            sustainability_score=float(score),
+            tradeoffs=context.tradeoffs(design),
+        )
 
-        return alternatives
+    def _check_objectives(self, objectives: Tuple[str, ...]):
+        unknown = [o for o in objectives if o not in self.PARETO_OBJECTIVES]
+        if unknown or not 2 <= len(objectives) <= 3 or len(set(objectives)) != len(objectives):
+            raise ValueError(
+                f"objectives must be 2 or 3 distinct values of {list(self.PARETO_OBJECTIVES)}"
+            )
+
+    @staticmethod
+    def _rank_front(
+        points: np.ndarray, max_rank: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Points up to ``max_rank`` ordered by rank then first objective, ranks, distances"""
+        ranks = non_dominated_ranks(points)
+        distance = crowding_distance(points, ranks)
+        selected = np.flatnonzero(ranks <= max_rank)
+        selected = selected[np.lexsort((points[selected, 0], ranks[selected]))]
+        return selected, ranks, distance
+
+    def pareto_front(
+        self,
+        alternatives: List[DesignAlternative],
+        objectives: Tuple[str, ...] = ("cost", "carbon"),
+        max_rank: int = 0,
+    ) -> List[ParetoPoint]:
+        """
+        Non-dominated sorting of alternatives over the given objectives
+
+        Two objectives are ranked in O(N log N); three use NSGA-II ranks with
+        crowding distance. Returns the points up to ``max_rank`` ordered by
+        rank, then by the first objective. To find a building's front use
+        ``optimize_pareto_front``, which ranks every evaluated design.
+        """
+        self._check_objectives(objectives)
+        if not alternatives:
+            return []
+
+        points = np.array(
+            [[self.PARETO_OBJECTIVES[o](alt) for o in objectives] for alt in alternatives]
+        )
+        selected, ranks, distance = self._rank_front(points, max_rank)
+        return [
+            ParetoPoint(
+                alternative=alternatives[i],
+                rank=int(ranks[i]),
+                crowding_distance=float(distance[i]),
+            )
+            for i in selected
+        ]
+
+    # Candidate combinations optimize_pareto_front enumerates before using the GA
+    MAX_ENUMERATED_DESIGNS = 100_000
+
+    def optimize_pareto_front(
+        self,
+        building_data: Dict,
+        constraints: DesignConstraint,
+        objectives: Tuple[str, ...] = ("cost", "carbon"),
+        max_rank: int = 0,
+        evolution_config: Optional[EvolutionConfig] = None,
+        max_enumerated: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> ParetoFront:
+        """
+        Cost / carbon (/ score) trade-off front of a building's feasible designs
+
+        Up to ``max_enumerated`` candidate combinations every design is
+        enumerated and the front is exact. Larger instances rank every
+        feasible design the genetic algorithm evaluates, rather than its
+        score-ranked archive, so cheap or low-carbon designs with modest
+        scores are not dropped.
+
+        Args:
+            building_data: Same as ``optimize_material_selection``
+            constraints: Design constraints; only feasible designs are ranked
+            objectives: 2 or 3 of ``PARETO_OBJECTIVES``
+            max_rank: Deepest front returned (0 = non-dominated only)
+            evolution_config: Overrides the engine's optimizer settings
+            max_enumerated: Defaults to ``MAX_ENUMERATED_DESIGNS``
+            progress: called with (generation, generations) as the GA advances
+        """
+        self._check_objectives(objectives)
+        area = building_data.get("area", 1000)  # default 1000 m2
+        components = building_data.get("components", self.component_templates.keys())
+        candidate_materials = self._collect_candidates(
+            components, constraints, limit=10  # Top 10 options
+        )
+        context = CandidateContext.build(candidate_materials, self.material_db)
+        if not context.components:
+            return ParetoFront(points=[], evaluated=0, exhaustive=True)
+
+        quantities = self._measured_quantities(building_data)
+        weights = np.array(
+            [self._component_quantity(c, area, quantities) for c in context.components]
+        )[:, None]
+        cost, carbon = context.unit_cost * weights, context.unit_carbon * weights
+        archive = ParetoArchive(len(context.components), len(objectives), max_rank)
+
+        def observe(designs, total_cost, total_carbon, scores, feasible):
+            values = {"cost": total_cost, "carbon": total_carbon, "score": -scores}
+            points = np.column_stack([values[o] for o in objectives])
+            archive.add(designs[feasible], points[feasible])
+
+        combinations = math.prod(context.counts.tolist())
+        limit = self.MAX_ENUMERATED_DESIGNS if max_enumerated is None else max_enumerated
+        exhaustive = combinations <= limit
+        if exhaustive:
+            for start in range(0, combinations, archive.block):
+                flat = np.arange(start, min(start + archive.block, combinations))
+                designs = np.stack(np.unravel_index(flat, context.counts), axis=1)
+                total_cost, total_carbon, scores = design_totals(
+                    designs, cost, carbon, context.material_scores
+                )
+                feasible = (total_cost <= constraints.max_budget) & (
+                    total_carbon <= constraints.max_carbon
+                )
+                observe(designs, total_cost, total_carbon, scores, feasible)
+            evaluated = combinations
+        else:
+            evaluated = evolve_designs(
+                cost,
+                carbon,
+                context.material_scores,
+                context.counts,
+                constraints.max_budget,
+                constraints.max_carbon,
+                evolution_config or self.evolution_config,
+                progress=progress,
+                observe=observe,
+            ).evaluations
+
+        if not len(archive.designs):
+            return ParetoFront(points=[], evaluated=evaluated, exhaustive=exhaustive)
+        total_cost, total_carbon, scores = design_totals(
+            archive.designs, cost, carbon, context.material_scores
+        )
+        selected, ranks, distance = self._rank_front(archive.points, max_rank)
+        points = [
+            ParetoPoint(
+                alternative=self._to_alternative(
+                    context, archive.designs[i], total_cost[i], total_carbon[i], scores[i]
+                ),
+                rank=int(ranks[i]),
+                crowding_distance=float(distance[i]),
+            )
+            for i in selected
+        ]
+        return ParetoFront(points=points, evaluated=evaluated, exhaustive=exhaustive)
 
     def _calculate_design_score(
         self, selections: Dict[str, str], total_cost: float, total_carbon: float
@@ -177,136 +840,167 @@ class GenerativeDesignEngine:
 
         avg_material_score = np.mean(material_scores) if material_scores else 0
 
-        # Normalize cost and carbon (lower is better)
-        # Assuming typical values for normalization
-        cost_score = max(0, 100 - (total_cost / 1000))  # Normalize to $1000/m2
-        carbon_score = max(0, 100 - (total_carbon * 10))  # Normalize
-
-        # Weighted score
-        return avg_material_score * 0.5 + cost_score * 0.25 + carbon_score * 0.25
+        return float(design_scores(avg_material_score, total_cost, total_carbon))
 
     def _calculate_tradeoffs(
-        self, selections: Dict[str, str], candidate_materials: Dict[str, List]
+        self,
+        selections: Dict[str, str],
+        candidate_materials: Dict[str, List],
+        context: Optional[CandidateContext] = None,
     ) -> Dict[str, float]:
         """Calculate tradeoffs between alternatives"""
+        context = context or CandidateContext.build(candidate_materials, self.material_db)
 
         tradeoffs = {}
-
-        for component, mat_id in selections.items():
-            if component in candidate_materials and candidate_materials[component]:
-                current_mat = None
-                for mat in candidate_materials[component]:
-                    if mat.id == mat_id:
-                        current_mat = mat
-                        break
-
-                if current_mat:
-                    # Compare with average of alternatives
-                    alt_carbons = [
-                        m.lca_results.get("embodied_carbon", 0)
-                        for m in candidate_materials[component]
-                    ]
-                    alt_costs = [
-                        m.cost_per_unit for m in candidate_materials[component]
-                    ]
-
-                    avg_carbon = np.mean(alt_carbons)
-                    avg_cost = np.mean(alt_costs)
-
-                    current_carbon = current_mat.lca_results.get("embodied_carbon", 0)
-                    current_cost = current_mat.cost_per_unit
-
-                    carbon_savings = ((avg_carbon - current_carbon) / avg_carbon) * 100
-                    cost_premium = ((current_cost - avg_cost) / avg_cost) * 100
-
-                    tradeoffs[component] = {
-                        "carbon_savings": carbon_savings,
-                        "cost_premium": cost_premium,
-                        "value_ratio": abs(
-                            carbon_savings / (cost_premium + 0.01)
-                        ),  # Avoid division by zero
-                    }
+        for i, component in enumerate(context.components):
+            column = context.index[component].get(selections.get(component))
+            if column is not None:
+                tradeoffs[component] = {
+                    "carbon_savings": float(context.carbon_savings[i, column]),
+                    "cost_premium": float(context.cost_premium[i, column]),
+                    "value_ratio": float(context.value_ratio[i, column]),
+                }
 
         return tradeoffs
 
     def generate_recommendations(
-        self, current_design: Dict, target_reduction: float
+        self,
+        current_design: Dict,
+        target_reduction: float,
+        max_nodes: int = 100_000,
+        quantities: Optional[Dict[str, float]] = None,
     ) -> Dict:
         """
-        Generate material swap recommendations to achieve carbon reduction target
+        Plan the cheapest material swaps that reach a carbon reduction target
+
+        Each component keeps its material or takes one of the cost-efficient
+        lower-carbon alternatives of its category, read from a per-category
+        carbon index. Picking one option per component at minimum total cost
+        with total carbon within the target is a multiple-choice knapsack with
+        carbon as the budget, solved by branch-and-bound; its bound buys
+        carbon reductions greedily by carbon saved per dollar. If the target
+        is out of reach every component gets its lowest-carbon alternative.
 
         Args:
             current_design: Current material selections
             target_reduction: Target carbon reduction percentage
+            max_nodes: Search limit; when hit the cheapest plan found is returned
+            quantities: Measured quantity per component (e.g. from a BIM
+                takeoff); carbon and cost are weighted by it, and components
+                without one count a single unit
         """
 
-        current_carbon = self._calculate_total_carbon(current_design)
-        target_carbon = current_carbon * (1 - target_reduction / 100)
-
-        recommendations = []
+        quantities = quantities or {}
+        current_carbon = self._calculate_total_carbon(current_design, quantities)
+        # Relative to the magnitude, so carbon-negative designs still move down
+        target_carbon = current_carbon - abs(current_carbon) * target_reduction / 100
 
+        # Options per component: the current material, then its alternatives
+        components, options, costs, carbons = [], [], [], []
         for component, current_mat_id in current_design.items():
-            if current_mat_id in self.material_db.materials:
-                current_mat = self.material_db.materials[current_mat_id]
-
-                # Find lower carbon alternatives
-                alternatives = self.material_db.search_materials(
-                    {
-                        "category": current_mat.category,
-                        "max_carbon": current_mat.lca_results.get("embodied_carbon", 0)
-                        * 0.9,  # At least 10% better
-                    }
-                )
+            if current_mat_id not in self.material_db.materials:
+                continue
+            current_mat = self.material_db.materials[current_mat_id]
+            carbon = current_mat.lca_results.get("embodied_carbon", 0)
+            ids, alt_costs, alt_carbon = self.material_db.lower_carbon_alternatives(
+                current_mat.category, carbon
+            )
+            quantity = quantities.get(component, 1.0)
+            components.append(component)
+            options.append([current_mat_id] + ids)
+            costs.append(np.concatenate([[current_mat.cost_per_unit], alt_costs]) * quantity)
+            carbons.append(np.concatenate([[carbon], alt_carbon]) * quantity)
+
+        tolerance = 1e-9 * max(1.0, abs(target_carbon))
+        plan = solve_multiple_choice_knapsack(
+            carbons, costs, target_carbon + tolerance, max_nodes=max_nodes
+        )
+        if plan.status == "infeasible":
+            # Lowest carbon per component; alternatives come by ascending carbon
+            choices = [1 if len(ids) > 1 else 0 for ids in options]
+        else:
+            choices = plan.choices
+        chosen = {
+            component: ids[choice]
+            for component, ids, choice in zip(components, options, choices)
+        }
+        planned_carbon = current_carbon - sum(
+            carbon[0] - carbon[choice] for carbon, choice in zip(carbons, choices)
+        )
 
-                for alt in alternatives[:3]:  # Top 3 alternatives
-                    if alt.id != current_mat_id:
-                        carbon_saving = (
-                            current_mat.lca_results.get("embodied_carbon", 0)
-                            - alt.lca_results.get("embodied_carbon", 0)
-                        )
-
-                        cost_difference = alt.cost_per_unit - current_mat.cost_per_unit
-
-                        recommendations.append(
-                            {
-                                "component": component,
-                                "current_material": current_mat.name,
-                                "alternative_material": alt.name,
-                                "carbon_saving_percent": (
-                                    carbon_saving
-                                    / current_mat.lca_results.get("embodied_carbon", 1)
-                                    * 100
-                                ),
-                                "cost_impact_percent": (
-                                    cost_difference / current_mat.cost_per_unit * 100
-                                ),
-                                "payback_period": self._calculate_payback_period(
-                                    carbon_saving, cost_difference
-                                ),
-                            }
-                        )
+        recommendations = []
+        total_cost_impact = 0.0
+        for component, alt_id in chosen.items():
+            current_mat_id = current_design[component]
+            if alt_id == current_mat_id:
+                continue
+
+            current_mat = self.material_db.materials[current_mat_id]
+            alt = self.material_db.materials[alt_id]
+            quantity = quantities.get(component, 1.0)
+            carbon_saving = quantity * (
+                current_mat.lca_results.get("embodied_carbon", 0)
+                - alt.lca_results.get("embodied_carbon", 0)
+            )
+            current_carbon_total = quantity * current_mat.lca_results.get("embodied_carbon", 0)
+            cost_difference = quantity * (alt.cost_per_unit - current_mat.cost_per_unit)
+            total_cost_impact += cost_difference
+
+            recommendations.append(
+                {
+                    "component": component,
+                    "current_material": current_mat.name,
+                    "alternative_material": alt.name,
+                    "alternative_material_id": alt.id,
+                    "carbon_saving": carbon_saving,
+                    "carbon_saving_percent": (
+                        carbon_saving / abs(current_carbon_total) * 100
+                        if current_carbon_total
+                        else None
+                    ),
+                    "cost_difference": cost_difference,
+                    "cost_impact_percent": (
+                        cost_difference / (quantity * current_mat.cost_per_unit) * 100
+                        if quantity and current_mat.cost_per_unit
+                        else None
+                    ),
+                    "payback_period": self._calculate_payback_period(
+                        carbon_saving, cost_difference
+                    ),
+                }
+            )
 
         # Sort by carbon savings
         recommendations.sort(
-            key=lambda x: x["carbon_saving_percent"], reverse=True
+            key=lambda x: (x["carbon_saving_percent"] is not None, x["carbon_saving_percent"] or 0),
+            reverse=True,
         )
 
         return {
             "current_carbon": current_carbon,
             "target_carbon": target_carbon,
+            "planned_carbon": planned_carbon,
             "recommendations": recommendations,
-            "achievable_reduction": self._calculate_achievable_reduction(
-                recommendations, current_carbon
+            "total_cost_impact": total_cost_impact,
+            "achievable_reduction": (
+                (current_carbon - planned_carbon) / abs(current_carbon) * 100
+                if current_carbon
+                else 0
             ),
+            "target_met": plan.status != "infeasible",
+            "plan_status": plan.status,
         }
 
-    def _calculate_total_carbon(self, design: Dict) -> float:
-        """Calculate total carbon for a design"""
+    def _calculate_total_carbon(
+        self, design: Dict, quantities: Optional[Dict[str, float]] = None
+    ) -> float:
+        """Calculate total carbon for a design, weighted by component quantities if given"""
+        quantities = quantities or {}
         total = 0
-        for mat_id in design.values():
+        for component, mat_id in design.items():
             if mat_id in self.material_db.materials:
                 mat = self.material_db.materials[mat_id]
-                total += mat.lca_results.get("embodied_carbon", 0)
+                total += mat.lca_results.get("embodied_carbon", 0) * quantities.get(component, 1.0)
         return total
 
     def _calculate_payback_period(
@@ -323,17 +1017,3 @@ class GenerativeDesignEngine:
         if annual_savings > 0:
             return cost_difference / annual_savings
         return None
-
-    def _calculate_achievable_reduction(
-        self, recommendations: List[Dict], current_carbon: float
-    ) -> float:
-        """Calculate total achievable carbon reduction"""
-        if not recommendations:
-            return 0
-
-        # Take top recommendations that provide most savings
-        total_saving = 0
-        for rec in recommendations[:5]:  # Top 5 swaps
-            total_saving += rec["carbon_saving_percent"]
-
-        return min(total_saving, 80)  # Cap at 80% reduction
@@ -0,0 +1,217 @@
+import functools
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+DIGEST_SIZE = 32
+EMPTY_LEAF = bytes(DIGEST_SIZE)
+# Interior nodes hash 0x01 || left || right; leaves hash canonical JSON, which
+# starts with "{", so a leaf can never be mistaken for a node
+NODE_PREFIX = b"\x01"
+
+
+def canonical_bytes(record: Dict) -> bytes:
+    """Compact JSON with sorted keys, so equal records always encode identically"""
+    return json.dumps(record, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+def leaf_digest(data: Any) -> bytes:
+    """SHA-256 of a leaf's canonical bytes (any buffer, e.g. a memory-mapped slice)"""
+    return hashlib.sha256(data).digest()
+
+
+def node_digest(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+@functools.lru_cache(maxsize=None)
+def empty_root(height: int) -> bytes:
+    """Root of a subtree of ``2 ** height`` empty leaves"""
+    if height == 0:
+        return EMPTY_LEAF
+    child = empty_root(height - 1)
+    return node_digest(child, child)
+
+
+def digest_many(
+    items: Sequence,
+    encode: Callable[[Any], Any],
+    max_workers: Optional[int] = None,
+    chunk_size: int = 4096,
+) -> np.ndarray:
+    """
+    Hash ``encode(item)`` for every item on a thread pool
+
+    hashlib releases the GIL while hashing buffers of 2 KiB and more, so large
+    passports hash in parallel; chunks keep the per-task overhead low.
+
+    Args:
+        items: Items to hash
+        encode: Returns the bytes (or buffer) to hash for an item
+        max_workers: Thread count, defaults to the number of CPUs
+        chunk_size: Items hashed per task
+
+    Returns:
+        (len(items), 32) uint8 array of digests
+    """
+
+    def hash_chunk(start: int) -> bytes:
+        return b"".join(
+            hashlib.sha256(encode(item)).digest() for item in items[start : start + chunk_size]
+        )
+
+    starts = range(0, len(items), chunk_size)
+    if max_workers == 1 or len(starts) <= 1:
+        chunks = [hash_chunk(start) for start in starts]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            chunks = list(pool.map(hash_chunk, starts))
+    return np.frombuffer(b"".join(chunks), dtype=np.uint8).reshape(-1, DIGEST_SIZE)
+
+
+@dataclass
+class InclusionProof:
+    """Sibling digests from a leaf up to the root"""
+
+    index: int
+    leaf: str
+    siblings: List[str]
+    root: str
+
+    def to_dict(self) -> Dict:
+        return {
+            "index": self.index,
+            "leaf": self.leaf,
+            "siblings": self.siblings,
+            "root": self.root,
+        }
+
+    def verify(self) -> bool:
+        """Recompute the root from the leaf and siblings"""
+        digest = bytes.fromhex(self.leaf)
+        index = self.index
+        for sibling in map(bytes.fromhex, self.siblings):
+            digest = node_digest(sibling, digest) if index & 1 else node_digest(digest, sibling)
+            index >>= 1
+        return index == 0 and digest.hex() == self.root
+
+
+@dataclass
+class IntegrityReport:
+    """Result of rehashing every passport against its stored digest"""
+
+    checked: int
+    mismatched: List[str]
+    root: Optional[str]
+    elapsed_ms: float
+
+    def to_dict(self) -> Dict:
+        return {
+            "checked": self.checked,
+            "valid": not self.mismatched,
+            "mismatched": self.mismatched,
+            "root": self.root,
+            "elapsed_ms": self.elapsed_ms,
+        }
+
+
+class MerkleTree:
+    """
+    Binary Merkle tree over fixed leaf positions, updated incrementally
+
+    Leaves are 32-byte digests, ``EMPTY_LEAF`` marking vacant positions. The
+    leaf level is padded to a power of two, so the root depends only on the
+    leaves. Each level is one (n, 32) array; setting or appending a leaf
+    rehashes its ancestors only, and the root is read in O(1).
+    """
+
+    def __init__(self, leaves: Optional[np.ndarray] = None):
+        """
+        Args:
+            leaves: (n, 32) uint8 array of initial leaf digests
+        """
+        if leaves is None:
+            leaves = np.zeros((0, DIGEST_SIZE), dtype=np.uint8)
+        self.size = len(leaves)
+        capacity = 1 << max(0, self.size - 1).bit_length()
+        base = np.zeros((capacity, DIGEST_SIZE), dtype=np.uint8)
+        base[: self.size] = leaves
+        self.levels = [base]
+        while len(self.levels[-1]) > 1:
+            self.levels.append(self._hash_level(self.levels[-1]))
+        # Roots of all-empty subtrees per level, used when growing
+        self._empty = [EMPTY_LEAF]
+
+    @staticmethod
+    def _hash_level(level: np.ndarray) -> np.ndarray:
+        buffer = level.tobytes()
+        pair = 2 * DIGEST_SIZE
+        parents = b"".join(
+            hashlib.sha256(NODE_PREFIX + buffer[i : i + pair]).digest()
+            for i in range(0, len(buffer), pair)
+        )
+        return np.frombuffer(parents, dtype=np.uint8).reshape(-1, DIGEST_SIZE).copy()
+
+    def _empty_root(self, height: int) -> bytes:
+        while len(self._empty) <= height:
+            self._empty.append(node_digest(self._empty[-1], self._empty[-1]))
+        return self._empty[height]
+
+    def _grow(self):
+        """Double the capacity; the new right half is an empty subtree"""
+        for height, level in enumerate(self.levels):
+            grown = np.empty((2 * len(level), DIGEST_SIZE), dtype=np.uint8)
+            grown[: len(level)] = level
+            grown[len(level) :] = np.frombuffer(self._empty_root(height), dtype=np.uint8)
+            self.levels[height] = grown
+        top = self.levels[-1]
+        self.levels.append(
+            np.frombuffer(node_digest(top[0].tobytes(), top[1].tobytes()), dtype=np.uint8)
+            .reshape(1, DIGEST_SIZE)
+            .copy()
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def root(self) -> str:
+        return self.levels[-1][0].tobytes().hex()
+
+    def leaf(self, index: int) -> bytes:
+        return self.levels[0][index].tobytes()
+
+    def set(self, index: int, digest: bytes):
+        """Set one leaf (``EMPTY_LEAF`` to clear it) and rehash its ancestors"""
+        while index >= len(self.levels[0]):
+            self._grow()
+        self.size = max(self.size, index + 1)
+        self.levels[0][index] = np.frombuffer(digest, dtype=np.uint8)
+        for height in range(1, len(self.levels)):
+            index >>= 1
+            children = self.levels[height - 1][2 * index : 2 * index + 2]
+            self.levels[height][index] = np.frombuffer(
+                hashlib.sha256(NODE_PREFIX + children.tobytes()).digest(), dtype=np.uint8
+            )
+
+    def append(self, digest: bytes) -> int:
+        """Add a leaf after the last one and return its index"""
+        index = self.size
+        self.set(index, digest)
+        return index
+
+    def proof(self, index: int) -> InclusionProof:
+        """Inclusion proof for the leaf at ``index``"""
+        if not 0 <= index < self.size:
+            raise IndexError(f"Leaf {index} out of range")
+        siblings = []
+        position = index
+        for level in self.levels[:-1]:
+            siblings.append(level[position ^ 1].tobytes().hex())
+            position >>= 1
+        return InclusionProof(index, self.leaf(index).hex(), siblings, self.root)
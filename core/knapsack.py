@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class KnapsackSolution:
+    """Result of a multiple-choice knapsack solve"""
+
+    status: str  # "optimal", "infeasible" or "node_limit"
+    choices: Optional[List[int]]  # chosen candidate index per class
+    total_cost: float
+    total_value: float
+    nodes_explored: int
+
+
+def _efficient_candidates(cost: np.ndarray, value: np.ndarray) -> np.ndarray:
+    """Indices of candidates not dominated in (cost, value), by ascending cost"""
+    order = np.lexsort((value, cost))
+    kept = []
+    best_value = np.inf
+    for i in order:
+        if value[i] < best_value:
+            kept.append(i)
+            best_value = value[i]
+    return np.array(kept, dtype=np.int64)
+
+
+def _lower_hull(cost: np.ndarray, value: np.ndarray) -> List[int]:
+    """Lower convex hull of efficient points (cost ascending, value descending)"""
+    hull: List[int] = []
+    for i in range(len(cost)):
+        while len(hull) >= 2:
+            a, b = hull[-2], hull[-1]
+            # Drop b when it lies on or above the segment a -> i
+            cross = (cost[b] - cost[a]) * (value[i] - value[a]) - (value[b] - value[a]) * (
+                cost[i] - cost[a]
+            )
+            if cross <= 0:
+                hull.pop()
+            else:
+                break
+        hull.append(i)
+    return hull
+
+
+class _SuffixBound:
+    """LP-relaxation bound for the classes from some depth onwards
+
+    The LP optimum of a multiple-choice knapsack starts every class at its
+    cheapest hull point and buys hull increments greedily by value saved per
+    unit cost; prefix sums over the merged increments make each bound a
+    single binary search.
+    """
+
+    def __init__(self, classes: List[Tuple[np.ndarray, np.ndarray]]):
+        self.base_cost = sum(cost[0] for cost, _ in classes)
+        self.base_value = sum(value[0] for _, value in classes)
+
+        increments = []
+        for cost, value in classes:
+            hull = _lower_hull(cost, value)
+            for a, b in zip(hull, hull[1:]):
+                increments.append((cost[b] - cost[a], value[a] - value[b]))
+        increments.sort(key=lambda inc: inc[1] / inc[0], reverse=True)
+
+        self.cum_cost = np.cumsum([0.0] + [c for c, _ in increments])
+        self.cum_saving = np.cumsum([0.0] + [s for _, s in increments])
+        # Rate of the next (partially bought) increment; zero once all are bought
+        self.rates = np.array([s / c for c, s in increments] + [0.0])
+
+    def bound(self, budgets: np.ndarray) -> np.ndarray:
+        """Lowest value reachable per budget if choices could be fractional"""
+        remaining = budgets - self.base_cost
+        j = np.searchsorted(self.cum_cost, np.maximum(remaining, 0), side="right") - 1
+        with np.errstate(invalid="ignore"):  # unlimited budget times a zero rate
+            partial = np.where(
+                self.rates[j] > 0, (remaining - self.cum_cost[j]) * self.rates[j], 0.0
+            )
+        saving = self.cum_saving[j] + partial
+        return np.where(remaining < 0, np.inf, self.base_value - saving)
+
+
+def solve_multiple_choice_knapsack(
+    costs: List[np.ndarray],
+    values: List[np.ndarray],
+    budget: float,
+    max_nodes: int = 1_000_000,
+) -> KnapsackSolution:
+    """
+    Minimize total value picking exactly one candidate per class within budget
+
+    Exact branch-and-bound: only candidates on each class's cost/value
+    efficient frontier are branched on, classes with the widest value range
+    are fixed first, and subtrees are pruned with the LP-relaxation bound.
+
+    Args:
+        costs: per-class candidate costs
+        values: per-class candidate values to minimize (e.g. carbon)
+        budget: maximum total cost
+        max_nodes: search limit; when hit the best design found is returned
+            with status "node_limit"
+    """
+    if any(len(cost) == 0 for cost in costs):
+        return KnapsackSolution("infeasible", None, np.inf, np.inf, 0)
+
+    # Reduce each class to its efficient frontier (cost up, value down)
+    frontiers = []
+    for cost, value in zip(costs, values):
+        cost, value = np.asarray(cost, dtype=float), np.asarray(value, dtype=float)
+        kept = _efficient_candidates(cost, value)
+        frontiers.append((kept, cost[kept], value[kept]))
+
+    if sum(cost[0] for _, cost, _ in frontiers) > budget:
+        return KnapsackSolution("infeasible", None, np.inf, np.inf, 0)
+
+    order = sorted(
+        range(len(frontiers)),
+        key=lambda c: frontiers[c][2][0] - frontiers[c][2][-1],
+        reverse=True,
+    )
+    levels = [frontiers[c] for c in order]
+    bounds = [
+        _SuffixBound([(cost, value) for _, cost, value in levels[depth:]])
+        for depth in range(len(levels))
+    ] + [None]
+    min_cost_after = np.cumsum([cost[0] for _, cost, _ in levels][::-1])[::-1].tolist() + [0.0]
+
+    # Incumbent: the cheapest design is always feasible at this point
+    best_value = sum(value[0] for _, _, value in levels)
+    best_choice = [0] * len(levels)
+    nodes = 0
+    limited = False
+    picks = [0] * len(levels)
+
+    def tolerance(value: float) -> float:
+        return 1e-9 * max(1.0, abs(value))
+
+    def search(depth: int, spent: float, value_so_far: float):
+        nonlocal best_value, best_choice, nodes, limited
+        nodes += 1
+        if nodes > max_nodes:
+            limited = True
+            return
+        if depth == len(levels):
+            if value_so_far < best_value - tolerance(best_value):
+                best_value = value_so_far
+                best_choice = list(picks)
+            return
+
+        # Bound every child of this node at once, then visit the most
+        # promising first so good incumbents are found early
+        _, cost, value = levels[depth]
+        new_spent = spent + cost
+        new_value = value_so_far + value
+        rest = bounds[depth + 1]
+        lower = new_value + (rest.bound(budget - new_spent) if rest else 0.0)
+        lower[new_spent + min_cost_after[depth + 1] > budget] = np.inf
+
+        for j in np.argsort(lower, kind="stable").tolist():
+            if limited or lower[j] >= best_value - tolerance(best_value):
+                return
+            picks[depth] = j
+            search(depth + 1, float(new_spent[j]), float(new_value[j]))
+
+    search(0, 0.0, 0.0)
+
+    choices = [0] * len(levels)
+    total_cost = 0.0
+    for depth, class_index in enumerate(order):
+        kept, cost, _ = levels[depth]
+        choices[class_index] = int(kept[best_choice[depth]])
+        total_cost += cost[best_choice[depth]]
+
+    return KnapsackSolution(
+        status="node_limit" if limited else "optimal",
+        choices=choices,
+        total_cost=float(total_cost),
+        total_value=float(best_value),
+        nodes_explored=nodes,
+    )
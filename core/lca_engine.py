@@ -1,10 +1,13 @@
 import numpy as np
-import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import json
+import threading
 from pathlib import Path
+from types import MappingProxyType
+from .characterization import CharacterizationMatrix
+from .lca_cache import LRUTTLCache, canonical_digest
 
 
 class LCAMethod(Enum):
@@ -35,27 +38,234 @@ class LCAResult:
     recyclability: float  # percentage
     toxicity_score: float  # 0-10 scale
     certifications: List[str]
+    acidification_potential: float = 0.0  # kg SO2e per unit
+    eutrophication_potential: float = 0.0  # kg PO4e per unit (kg N eq under TRACI)
+    method: str = LCAMethod.ECOINVENT.value
+
+
+@dataclass
+class LCABatchResult:
+    """Columnar LCA results for a batch of materials, one array per field"""
+
+    embodied_carbon: np.ndarray
+    water_use: np.ndarray
+    energy_use: np.ndarray
+    recycled_content: np.ndarray
+    recyclability: np.ndarray
+    toxicity_score: np.ndarray
+    certifications: List[List[str]]
+    acidification_potential: np.ndarray
+    eutrophication_potential: np.ndarray
+    method: str = LCAMethod.ECOINVENT.value
+
+    def __len__(self) -> int:
+        return len(self.embodied_carbon)
+
+    def __getitem__(self, index: int) -> LCAResult:
+        return LCAResult(
+            embodied_carbon=float(self.embodied_carbon[index]),
+            water_use=float(self.water_use[index]),
+            energy_use=float(self.energy_use[index]),
+            recycled_content=float(self.recycled_content[index]),
+            recyclability=float(self.recyclability[index]),
+            toxicity_score=float(self.toxicity_score[index]),
+            certifications=self.certifications[index],
+            acidification_potential=float(self.acidification_potential[index]),
+            eutrophication_potential=float(self.eutrophication_potential[index]),
+            method=self.method,
+        )
+
+    def to_results(self) -> List[LCAResult]:
+        """Convert to one LCAResult per material"""
+        return [self[i] for i in range(len(self))]
+
+    def to_dict(self) -> Dict[str, List]:
+        """Convert to JSON-friendly columns"""
+        return {
+            "embodied_carbon": self.embodied_carbon.tolist(),
+            "water_use": self.water_use.tolist(),
+            "energy_use": self.energy_use.tolist(),
+            "recycled_content": self.recycled_content.tolist(),
+            "recyclability": self.recyclability.tolist(),
+            "toxicity_score": self.toxicity_score.tolist(),
+            "certifications": self.certifications,
+            "acidification_potential": self.acidification_potential.tolist(),
+            "eutrophication_potential": self.eutrophication_potential.tolist(),
+            "method": self.method,
+        }
+
+
+@dataclass
+class LCAAssessment:
+    """Cached LCA result and carbon label for one material specification
+
+    Instances are shared between cache hits and must be treated as read-only.
+    """
+
+    digest: str
+    lca_result: LCAResult
+    carbon_label: Dict
 
 
 class LCAEngine:
     """AI-powered Life Cycle Assessment Engine"""
 
-    def __init__(self, db_path: str = "data/ecoinvent.db"):
+    # Inputs that determine an LCA result, with the defaults the calculation uses
+    LCA_INPUT_DEFAULTS = {
+        "composition": {},
+        "manufacturing_process": "standard",
+        "transportation_distance": 0,
+        "recycled_content": 0,
+        "recyclability": 70,
+        "hazardous_components": {},
+    }
+
+    # Built-in factors, used when no impact factor database has been built and
+    # for ingredients the database lacks
+    DEFAULT_IMPACT_FACTORS = {
+        "concrete": {"GWP": 0.12, "AP": 0.0002, "EP": 0.00001},
+        "steel": {"GWP": 1.85, "AP": 0.008, "EP": 0.0005},
+        "wood": {"GWP": -0.9, "AP": 0.0001, "EP": 0.00002},
+        "bamboo": {"GWP": -1.2, "AP": 0.00005, "EP": 0.00001},
+        "mycelium": {"GWP": -0.5, "AP": 0.00001, "EP": 0.000005},
+    }
+
+    # Carbon multiplier per manufacturing process
+    PROCESS_FACTORS = {
+        "traditional": 1.0,
+        "low_energy": 0.8,
+        "carbon_capture": 0.6,
+        "renewable_energy": 0.7,
+        "circular": 0.5,
+    }
+
+    # Toxicity weight per hazardous component; anything else weighs 1
+    TOXICITY_WEIGHTS = {
+        "VOC": 3,
+        "formaldehyde": 5,
+        "lead": 8,
+        "asbestos": 10,
+        "phthalates": 4,
+    }
+
+    def __init__(
+        self,
+        db_path: str = "data/ecoinvent.db",
+        warm_up_ml_model: bool = False,
+        cache_size: int = 4096,
+        cache_ttl: Optional[float] = 3600,
+        method: LCAMethod = LCAMethod.ECOINVENT,
+    ):
         self.db_path = Path(db_path)
+        self.method = method
+        self.lca_cache = LRUTTLCache(maxsize=cache_size, ttl=cache_ttl)
+        # Characterization matrix per method, built on first use of each
+        self._characterization: Dict[LCAMethod, CharacterizationMatrix] = {}
+        self.impact_factors = self._load_impact_factors()
+
+        # The ML model (and scikit-learn itself) is loaded on first use
+        self._ml_model = None
+        self._ml_model_lock = threading.Lock()
+        if warm_up_ml_model:
+            self.warm_up_ml_model()
+
+    @property
+    def ml_model(self):
+        """ML model for predictive LCA, loaded on first access"""
+        if self._ml_model is None:
+            with self._ml_model_lock:
+                if self._ml_model is None:
+                    self._ml_model = self._load_ml_model()
+        return self._ml_model
+
+    def warm_up_ml_model(self, background: bool = True) -> Optional[threading.Thread]:
+        """Load the ML model ahead of its first use
+
+        With ``background`` the load runs in a daemon thread so callers (e.g.
+        API startup) are not delayed; the thread is returned for joining.
+        """
+        if not background:
+            self.ml_model
+            return None
+
+        thread = threading.Thread(
+            target=lambda: self.ml_model, name="lca-ml-warmup", daemon=True
+        )
+        thread.start()
+        return thread
+
+    @property
+    def impact_factors(self) -> Dict:
+        """Impact factors per ingredient
+
+        Cached assessments and characterization matrices are invalidated when
+        factors are assigned, so change them by assigning new ones; plain
+        dict factors are frozen on assignment to catch in-place edits.
+        """
+        return self._impact_factors
+
+    @impact_factors.setter
+    def impact_factors(self, factors: Dict):
+        if isinstance(factors, (dict, MappingProxyType)):
+            factors = {ingredient: dict(values) for ingredient, values in factors.items()}
+        # Cached assessments are keyed on the factor version, so stale entries
+        # can never be served; clearing just releases their memory
+        # Database-backed factors carry their own content digest
+        version = (getattr(factors, "version", None) or canonical_digest(factors))[:16]
+        if isinstance(factors, dict):
+            factors = MappingProxyType(
+                {ingredient: MappingProxyType(values) for ingredient, values in factors.items()}
+            )
+        self._impact_factors = factors
+        if version != getattr(self, "impact_factor_version", None):
+            self.impact_factor_version = version
+            self.lca_cache.clear()
+            self._characterization = {}
+
+    def reload_impact_factors(self):
+        """Reload impact factors, invalidating cached assessments if they changed"""
         self.impact_factors = self._load_impact_factors()
-        self.ml_model = self._load_ml_model()
 
     def _load_impact_factors(self) -> Dict:
-        """Load Ecoinvent impact factors"""
-        # In production, this would connect to Ecoinvent API
+        """Load Ecoinvent impact factors
+
+        When the indexed database at ``db_path`` has been built (see
+        ``data/ecoinvent_integration.py``) factors are looked up from it on
+        demand instead of being loaded, with the built-in ones as fallback.
+        """
+        if self.db_path.exists():
+            from data.ecoinvent_integration import EcoinventDatabase
+
+            return EcoinventDatabase(self.db_path, fallback=self.DEFAULT_IMPACT_FACTORS)
+        return dict(self.DEFAULT_IMPACT_FACTORS)
+
+    def _lookup_factors(self, ingredients) -> Dict[str, Dict]:
+        """Factors of the known ingredients, in one bulk lookup when the store supports it"""
+        get_many = getattr(self.impact_factors, "get_many", None)
+        if get_many is not None:
+            return get_many(ingredients)
         return {
-            "concrete": {"GWP": 0.12, "AP": 0.0002, "EP": 0.00001},
-            "steel": {"GWP": 1.85, "AP": 0.008, "EP": 0.0005},
-            "wood": {"GWP": -0.9, "AP": 0.0001, "EP": 0.00002},
-            "bamboo": {"GWP": -1.2, "AP": 0.00005, "EP": 0.00001},
-            "mycelium": {"GWP": -0.5, "AP": 0.00001, "EP": 0.000005},
+            ingredient: self.impact_factors[ingredient]
+            for ingredient in dict.fromkeys(ingredients)
+            if ingredient in self.impact_factors
         }
 
+    def characterization(self, method: Optional[LCAMethod] = None) -> CharacterizationMatrix:
+        """Cached characterization matrix of ``method`` (the engine's by default)"""
+        method = method or self.method
+        matrix = self._characterization.get(method)
+        if matrix is None:
+            matrix = self._characterization.setdefault(
+                method, CharacterizationMatrix(method.value)
+            )
+        return matrix
+
+    def _composition_impacts(
+        self, compositions: List[Dict[str, float]], method: Optional[LCAMethod] = None
+    ) -> np.ndarray:
+        """compositions x indicators (GWP, AP, EP, water, energy) in one sparse product"""
+        return self.characterization(method).totals(compositions, self._lookup_factors)
+
     def _load_ml_model(self):
         """Load ML model for predictive LCA"""
         # This would be a trained model for predicting LCA based on material properties
@@ -63,7 +273,53 @@ class LCAEngine:
 
         return RandomForestRegressor()
 
-    def calculate_carbon_footprint(self, material_data: Dict) -> LCAResult:
+    def material_digest(self, material_data: Dict, method: Optional[LCAMethod] = None) -> str:
+        """Stable content address of a material spec under the current factors
+
+        Only fields that affect the LCA are included, with defaults applied and
+        numbers normalized, so equivalent specs map to the same digest
+        regardless of key order or process.
+        """
+        normalized = {}
+        for key, default in self.LCA_INPUT_DEFAULTS.items():
+            value = material_data.get(key, default)
+            if isinstance(value, dict):
+                value = {k: float(v) for k, v in value.items()}
+            elif isinstance(value, (int, float)):
+                value = float(value)
+            normalized[key] = value
+        method = (method or self.method).value
+        return canonical_digest([self.impact_factor_version, method, normalized])
+
+    def assess_material(
+        self, material_data: Dict, method: Optional[LCAMethod] = None
+    ) -> LCAAssessment:
+        """LCA result and carbon label for a material, memoized by content digest"""
+        digest = self.material_digest(material_data, method)
+        assessment = self.lca_cache.get(digest)
+        if assessment is None:
+            lca_result = self.calculate_carbon_footprint(material_data, method)
+            assessment = LCAAssessment(
+                digest=digest,
+                lca_result=lca_result,
+                carbon_label=self.generate_carbon_label(lca_result),
+            )
+            self.lca_cache.put(digest, assessment)
+        return assessment
+
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters of the assessment cache"""
+        return {
+            **self.lca_cache.stats(),
+            "impact_factor_version": self.impact_factor_version,
+            "characterized_ingredients": {
+                method.value: len(matrix) for method, matrix in self._characterization.items()
+            },
+        }
+
+    def calculate_carbon_footprint(
+        self, material_data: Dict, method: Optional[LCAMethod] = None
+    ) -> LCAResult:
         """
         Calculate cradle-to-gate carbon footprint
 
@@ -74,19 +330,13 @@ class LCAEngine:
                 - transportation_distance: float (km)
                 - energy_source: String
                 - recycled_content: float
+            method: Characterization method, the engine's by default
         """
 
-        # Extract material composition
-        total_carbon = 0
-        water_use = 0
-        energy_use = 0
-
-        for material, percentage in material_data.get("composition", {}).items():
-            if material in self.impact_factors:
-                impact = self.impact_factors[material]
-                total_carbon += impact["GWP"] * percentage / 100
-                water_use += impact.get("water", 0) * percentage / 100
-                energy_use += impact.get("energy", 0) * percentage / 100
+        # All indicators of the composition, weighted by percentage
+        method = method or self.method
+        impacts = self._composition_impacts([material_data.get("composition", {})], method)
+        total_carbon, acidification, eutrophication, water_use, energy_use = impacts[0].tolist()
 
         # Adjust for manufacturing process
         process_factor = self._get_process_factor(
@@ -119,18 +369,104 @@ class LCAEngine:
             recyclability=material_data.get("recyclability", 70),
             toxicity_score=toxicity_score,
             certifications=certifications,
+            acidification_potential=acidification,
+            eutrophication_potential=eutrophication,
+            method=method.value,
+        )
+
+    def calculate_carbon_footprint_batch(
+        self, materials: List[Dict], method: Optional[LCAMethod] = None
+    ) -> LCABatchResult:
+        """
+        Vectorized ``calculate_carbon_footprint`` over many materials
+
+        Compositions become a sparse materials x ingredients matrix (stored
+        ELLPACK-style as per-slot ingredient indices and percentages) which
+        is multiplied by the method's cached ingredients x indicators
+        characterization matrix. Slots are accumulated in composition order,
+        so every value matches the scalar path exactly.
+        """
+        count = len(materials)
+        method = method or self.method
+
+        totals = self._composition_impacts([m.get("composition", {}) for m in materials], method)
+        total_carbon, acidification, eutrophication, water_use, energy_use = totals.T.copy()
+
+        # Adjust for manufacturing process
+        total_carbon *= np.array(
+            [
+                self._get_process_factor(m.get("manufacturing_process", "standard"))
+                for m in materials
+            ]
+        )
+
+        # Add transportation emissions (assuming truck transport)
+        total_carbon += (
+            np.array([m.get("transportation_distance", 0) for m in materials], dtype=float)
+            * 0.0001
         )
 
+        # Credit for recycled content
+        recycled_content = np.array(
+            [m.get("recycled_content", 0) for m in materials], dtype=float
+        )
+        total_carbon -= total_carbon * (recycled_content / 100) * 0.7
+
+        # Toxicity uses the same sparse layout over hazardous components
+        hazard_vocabulary = {name: i for i, name in enumerate(self.TOXICITY_WEIGHTS)}
+        hazard_weights = np.array(list(self.TOXICITY_WEIGHTS.values()) + [1, 0], dtype=float)
+        hazard_index, amounts = self._sparse_rows(
+            [m.get("hazardous_components", {}) for m in materials],
+            hazard_vocabulary,
+            unknown=len(hazard_vocabulary),
+        )
+        toxicity = np.zeros(count)
+        for slot in range(hazard_index.shape[1]):
+            toxicity += hazard_weights[hazard_index[:, slot]] * amounts[:, slot]
+        toxicity_score = np.minimum(toxicity, 10)
+
+        return LCABatchResult(
+            embodied_carbon=total_carbon,
+            water_use=water_use,
+            energy_use=energy_use,
+            recycled_content=recycled_content,
+            recyclability=np.array(
+                [m.get("recyclability", 70) for m in materials], dtype=float
+            ),
+            toxicity_score=toxicity_score,
+            certifications=[
+                self._generate_certifications(carbon, recycled)
+                for carbon, recycled in zip(total_carbon, recycled_content)
+            ],
+            acidification_potential=acidification,
+            eutrophication_potential=eutrophication,
+            method=method.value,
+        )
+
+    @staticmethod
+    def _sparse_rows(
+        rows: List[Dict[str, float]], vocabulary: Dict[str, int], unknown: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Pack dict rows into padded (column index, value) slot matrices
+
+        Padding slots point one past ``unknown`` (or past the vocabulary when
+        unknown keys are dropped) and carry a value of zero.
+        """
+        padding = len(vocabulary) + (0 if unknown is None else 1)
+        width = max((len(row) for row in rows), default=0)
+        index = np.full((len(rows), width), padding, dtype=np.int64)
+        values = np.zeros((len(rows), width))
+        for i, row in enumerate(rows):
+            for slot, (key, value) in enumerate(row.items()):
+                column = vocabulary.get(key, unknown)
+                if column is not None:
+                    index[i, slot] = column
+                    values[i, slot] = value
+        return index, values
+
     def _get_process_factor(self, process: str) -> float:
         """Get carbon multiplier for manufacturing process"""
-        factors = {
-            "traditional": 1.0,
-            "low_energy": 0.8,
-            "carbon_capture": 0.6,
-            "renewable_energy": 0.7,
-            "circular": 0.5,
-        }
-        return factors.get(process, 1.0)
+        return self.PROCESS_FACTORS.get(process, 1.0)
 
     def _calculate_toxicity_score(self, material_data: Dict) -> float:
         """Calculate toxicity score based on chemical composition"""
@@ -139,13 +475,7 @@ class LCAEngine:
         total_score = 0
 
         for component, amount in hazardous_components.items():
-            toxicity = {
-                "VOC": 3,
-                "formaldehyde": 5,
-                "lead": 8,
-                "asbestos": 10,
-                "phthalates": 4,
-            }.get(component, 1)
+            toxicity = self.TOXICITY_WEIGHTS.get(component, 1)
 
             total_score += toxicity * amount
 
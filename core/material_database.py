@@ -1,10 +1,29 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Iterable, Iterator, Tuple
+from collections.abc import MutableMapping
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 import uuid
+import bisect
+import heapq
 from enum import Enum
 import hashlib
+import base64
+import json
+import time
+import functools
+import threading
+import numpy as np
 from .lca_engine import LCAEngine
+from .integrity import (
+    EMPTY_LEAF,
+    InclusionProof,
+    IntegrityReport,
+    MerkleTree,
+    canonical_bytes,
+    digest_many,
+)
 
 
 class Certification(Enum):
@@ -16,6 +35,19 @@ class Certification(Enum):
     GREEN_GUARD = "GreenGuard"
 
 
+class FrozenDict(dict):
+    """Read-only dict; still a dict, so JSON encoding and ``dict(...)`` copies work"""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only; assign a new mapping instead")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
 @dataclass
 class MaterialPassport:
     """Digital passport for sustainable materials"""
@@ -25,7 +57,7 @@ class MaterialPassport:
     description: str = ""
     category: str = ""
 
-    # Environmental Data
+    # Environmental Data (read-only once stored, see __setattr__)
     lca_results: Dict = field(default_factory=dict)
     carbon_label: Dict = field(default_factory=dict)
 
@@ -44,7 +76,7 @@ class MaterialPassport:
     availability: str = ""  # "in-stock", "made-to-order", "limited"
     lead_time: int = 0  # days
 
-    # Certifications
+    # Certifications (stored as a tuple)
     certifications: List[Certification] = field(default_factory=list)
     third_party_verified: bool = False
 
@@ -53,13 +85,36 @@ class MaterialPassport:
     creation_date: datetime = field(default_factory=datetime.now)
     last_updated: datetime = field(default_factory=datetime.now)
 
+    # Cached sustainability score, cleared whenever one of its inputs changes
+    sustainability_score: Optional[float] = field(default=None, compare=False)
+
+    # Fields the sustainability score is derived from
+    _SCORE_INPUTS = frozenset({"lca_results", "certifications", "third_party_verified"})
+
+    def __setattr__(self, name: str, value: Any):
+        # Score inputs are stored immutable, so the cached score can only go
+        # stale through an assignment, which clears it
+        if name == "lca_results":
+            value = FrozenDict(value)
+        elif name == "certifications":
+            value = tuple(value)
+        super().__setattr__(name, value)
+        if name in self._SCORE_INPUTS:
+            super().__setattr__("sustainability_score", None)
+
+    # Fields left out of the canonical encoding: the hash itself and a cache
+    _UNHASHED_FIELDS = ("blockchain_hash", "sustainability_score")
+
+    def canonical_bytes(self) -> bytes:
+        """Deterministic encoding of the passport, independent of dict ordering"""
+        record = self.to_record()
+        for name in self._UNHASHED_FIELDS:
+            del record[name]
+        return canonical_bytes(record)
+
     def calculate_blockchain_hash(self) -> str:
         """Create immutable hash of material data"""
-        data_string = (
-            f"{self.id}{self.name}{self.lca_results}"
-            f"{self.supplier_id}{self.creation_date}"
-        )
-        return hashlib.sha256(data_string.encode()).hexdigest()
+        return hashlib.sha256(self.canonical_bytes()).hexdigest()
 
     def to_json(self) -> Dict:
         """Convert passport to JSON format"""
@@ -91,14 +146,1024 @@ class MaterialPassport:
             },
         }
 
+    # Fields stored as JSON text by ``to_record``
+    _DATETIME_FIELDS = ("creation_date", "last_updated")
 
-class MaterialDatabase:
-    """Central repository for sustainable materials"""
+    def to_record(self) -> Dict:
+        """Flat, JSON-serializable copy of every field, for storage backends"""
+        record = {name: getattr(self, name) for name in self.__dataclass_fields__}
+        record["certifications"] = [cert.value for cert in self.certifications]
+        for name in self._DATETIME_FIELDS:
+            record[name] = record[name].isoformat()
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict) -> "MaterialPassport":
+        """Rebuild a passport from ``to_record`` output"""
+        record = dict(record)
+        record["certifications"] = [Certification(c) for c in record["certifications"]]
+        for name in cls._DATETIME_FIELDS:
+            record[name] = datetime.fromisoformat(record[name])
+        return cls(**record)
+
+
+# Bit assigned to each certification in the columnar certification mask
+CERTIFICATION_BITS = {cert: 1 << i for i, cert in enumerate(Certification)}
+CERTIFICATION_VALUE_BITS = {cert.value: bit for cert, bit in CERTIFICATION_BITS.items()}
+
+_EMPTY_ROWS = np.empty(0, dtype=np.int64)
+
+
+class SortedIndex:
+    """Sorted (value, row) pairs answering range lookups with bisect"""
 
     def __init__(self):
+        self.keys: List[float] = []
+        self.rows: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_array(cls, values: np.ndarray, order: Optional[np.ndarray] = None) -> "SortedIndex":
+        """Build the index over rows 0..N-1, sorting unless ``order`` is given"""
+        index = cls()
+        if order is None:
+            order = np.argsort(values, kind="stable")
+        index.keys = values[order].tolist()
+        index.rows = order.tolist()
+        return index
+
+    def insert(self, value: float, row: int):
+        pos = bisect.bisect_right(self.keys, value)
+        self.keys.insert(pos, value)
+        self.rows.insert(pos, row)
+
+    def remove(self, value: float, row: int):
+        start, end = self._bounds(value, value)
+        pos = start + self.rows[start:end].index(row)
+        del self.keys[pos]
+        del self.rows[pos]
+
+    def _bounds(self, low: float, high: float) -> Tuple[int, int]:
+        start = bisect.bisect_left(self.keys, low)
+        end = bisect.bisect_right(self.keys, high)
+        return start, max(start, end)
+
+    def count_range(self, low: float = -np.inf, high: float = np.inf) -> int:
+        """Number of rows with low <= value <= high"""
+        start, end = self._bounds(low, high)
+        return end - start
+
+    def range(self, low: float = -np.inf, high: float = np.inf) -> np.ndarray:
+        """Rows with low <= value <= high, ordered by value"""
+        start, end = self._bounds(low, high)
+        return np.array(self.rows[start:end], dtype=np.int64)
+
+
+class MaterialColumnStore:
+    """Columnar shadow of the passport catalog used for vectorized filtering
+
+    Each passport occupies one row; the numeric attributes that
+    ``search_materials`` filters on are kept in contiguous NumPy arrays.
+    Secondary indexes (category and certification posting lists, sorted
+    carbon/recycled/cost indexes) are maintained alongside so a query can
+    start from its most selective predicate and check the rest with
+    vectorized gathers over the surviving rows only.
+    """
+
+    COLUMNS = {
+        "embodied_carbon": np.float64,
+        "recycled_content": np.float64,
+        "cost": np.float64,
+        "category": np.int32,
+        "cert_mask": np.int64,
+        "score": np.float64,
+        "live": np.bool_,
+        "supplier": np.int32,
+        "cert_count": np.int32,
+        # SHA-256 of the passport's canonical bytes; zero for removed rows
+        "digest": np.dtype((np.void, 32)),
+        # Merkle leaf position, assigned on insertion and kept across snapshots
+        "leaf": np.int64,
+        # Remaining sustainability score inputs, so rescoring needs no passports
+        "recyclability": np.float64,
+        "toxicity_score": np.float64,
+        "verified": np.bool_,
+    }
+
+    # Column -> attribute of its sorted index
+    SORTED_INDEXES = {
+        "embodied_carbon": "carbon_index",
+        "recycled_content": "recycled_index",
+        "cost": "cost_index",
+    }
+
+    def __init__(self, capacity: int = 1024):
+        self.ids: List[str] = []
+        self._rows: Optional[Dict[str, int]] = {}
+        self.category_codes: Dict[str, int] = {}
+        self.category_names: List[str] = []
+        self.supplier_codes: Dict[str, int] = {}
+        self.supplier_names: List[str] = []
+        self._size = 0
+        self.deleted = 0
+        # Leaf positions handed out so far; removed materials keep theirs vacant
+        self.leaf_count = 0
+        self._data = {
+            name: np.zeros(capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()
+        }
+
+        # Secondary indexes
+        self.category_index: Dict[str, List[int]] = {}
+        self.supplier_index: Dict[str, List[int]] = {}
+        self.certification_index: Dict[str, List[int]] = {
+            cert.value: [] for cert in Certification
+        }
+        self.carbon_index = SortedIndex()
+        # Carbon-sorted rows per category, for lower-carbon alternative lookups
+        self.category_carbon_index: Dict[str, SortedIndex] = {}
+        # Cost frontier per category, rebuilt after the category changes
+        self._frontiers: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.recycled_index = SortedIndex()
+        self.cost_index = SortedIndex()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def rows(self) -> Dict[str, int]:
+        """Material id -> row, built on first use for stores opened from arrays"""
+        if self._rows is None:
+            self._rows = dict(zip(self.ids, range(len(self.ids))))
+        return self._rows
+
+    @staticmethod
+    def _posting_lists(codes: np.ndarray, names: List[str]) -> Dict[str, List[int]]:
+        """Group rows by code with one stable sort; rows stay ascending per code"""
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(names))
+        groups = np.split(order, np.cumsum(counts)[:-1]) if len(names) else []
+        return {name: rows.tolist() for name, rows in zip(names, groups) if len(rows)}
+
+    @classmethod
+    def from_arrays(
+        cls,
+        ids: List[str],
+        data: Dict[str, np.ndarray],
+        category_names: List[str],
+        supplier_names: List[str],
+        orders: Optional[Dict[str, np.ndarray]] = None,
+        leaf_count: Optional[int] = None,
+    ) -> "MaterialColumnStore":
+        """Wrap existing column arrays (e.g. memory-mapped) and rebuild the indexes
+
+        Every row must be live. ``orders`` holds presorted row orders per
+        ``SORTED_INDEXES`` column; ``leaf_count`` defaults to one past the
+        last leaf in use.
+        """
+        orders = dict(orders or {})
+        store = cls(capacity=0)
+        store.ids = ids
+        store._rows = None
+        store.category_names = list(category_names)
+        store.category_codes = {name: code for code, name in enumerate(category_names)}
+        store.supplier_names = list(supplier_names)
+        store.supplier_codes = {name: code for code, name in enumerate(supplier_names)}
+        store._size = len(ids)
+        store._data = data
+        store.leaf_count = (
+            leaf_count
+            if leaf_count is not None
+            else int(data["leaf"][: store._size].max(initial=-1)) + 1
+        )
+
+        store.category_index = cls._posting_lists(data["category"][: store._size], category_names)
+        store.supplier_index = cls._posting_lists(data["supplier"][: store._size], supplier_names)
+        cert_mask = data["cert_mask"][: store._size]
+        for value, bit in CERTIFICATION_VALUE_BITS.items():
+            store.certification_index[value] = np.flatnonzero(cert_mask & bit).tolist()
+        for column, attr in cls.SORTED_INDEXES.items():
+            values = data[column][: store._size]
+            if orders.get(column) is None:
+                orders[column] = np.argsort(values, kind="stable")
+            setattr(store, attr, SortedIndex.from_array(values, orders[column]))
+
+        # Split the global carbon order by category; a stable sort keeps each
+        # category's rows in carbon order
+        carbon = data["embodied_carbon"][: store._size]
+        carbon_order = np.asarray(orders["embodied_carbon"])
+        grouped = carbon_order[np.argsort(data["category"][carbon_order], kind="stable")]
+        counts = np.bincount(data["category"][: store._size], minlength=len(category_names))
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        for code, name in enumerate(category_names):
+            if counts[code]:
+                rows = grouped[bounds[code] : bounds[code + 1]]
+                store.category_carbon_index[name] = SortedIndex.from_array(carbon, rows)
+        return store
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a view of the populated part of a column"""
+        return self._data[name][: self._size]
+
+    def _grow(self):
+        """Double the capacity of every column"""
+        for name, array in self._data.items():
+            grown = np.zeros(max(len(array) * 2, 1), dtype=array.dtype)
+            grown[: self._size] = array[: self._size]
+            self._data[name] = grown
+
+    def _category_code(self, category: str) -> int:
+        if category not in self.category_codes:
+            self.category_codes[category] = len(self.category_codes)
+            self.category_names.append(category)
+        return self.category_codes[category]
+
+    def _supplier_code(self, supplier_id: str) -> int:
+        if supplier_id not in self.supplier_codes:
+            self.supplier_codes[supplier_id] = len(self.supplier_codes)
+            self.supplier_names.append(supplier_id)
+        return self.supplier_codes[supplier_id]
+
+    def append(self, passport: "MaterialPassport") -> int:
+        """Append a passport as a new row and return its row number"""
+        if self._size == len(self._data["cost"]):
+            self._grow()
+
+        row = self._size
+        self.ids.append(passport.id)
+        self.rows[passport.id] = row
+        self._size += 1
+        self._data["leaf"][row] = self.leaf_count
+        self.leaf_count += 1
+        self._write_row(row, passport)
+        return row
+
+    def update(self, passport: "MaterialPassport"):
+        """Re-index an existing passport in place after its fields changed"""
+        row = self.rows[passport.id]
+        self._unindex_row(row)
+        self._write_row(row, passport)
+
+    def remove(self, material_id: str) -> int:
+        """Drop a passport from every index and return its (now dead) row
+
+        Rows are never reused, so row numbers and cursors stay stable.
+        """
+        row = self.rows.pop(material_id)
+        self._unindex_row(row)
+        self._data["live"][row] = False
+        self._data["digest"][row] = EMPTY_LEAF
+        self.ids[row] = None
+        self.deleted += 1
+        return row
+
+    def digests(self) -> np.ndarray:
+        """(rows, 32) uint8 view of the passport digests"""
+        return self.column("digest").view(np.uint8).reshape(-1, 32)
+
+    def leaves(self) -> np.ndarray:
+        """(leaf_count, 32) uint8 Merkle leaves; removed materials leave theirs empty"""
+        leaves = np.zeros((self.leaf_count, 32), dtype=np.uint8)
+        rows = self.live_rows()
+        leaves[self.column("leaf")[rows]] = self.digests()[rows]
+        return leaves
+
+    def cost_frontier(self, category: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Carbon and rows of the category's materials cheaper than every lower-carbon one
+
+        Whether a row is on the frontier depends only on the rows before it in
+        carbon order, so the frontier below any carbon level is a prefix.
+        """
+        frontier = self._frontiers.get(category)
+        if frontier is None:
+            index = self.category_carbon_index.get(category) or SortedIndex()
+            rows = np.array(index.rows, dtype=np.int64)
+            costs = self._data["cost"][rows]
+            cheapest_before = np.minimum.accumulate(np.concatenate([[np.inf], costs]))[:-1]
+            keep = costs < cheapest_before
+            frontier = (np.array(index.keys, dtype=np.float64)[keep], rows[keep])
+            self._frontiers[category] = frontier
+        return frontier
+
+    def live_rows(self) -> np.ndarray:
+        """Row numbers of every stored passport, in insertion order"""
+        if not self.deleted:
+            return np.arange(self._size, dtype=np.int64)
+        return np.flatnonzero(self.column("live"))
+
+    @staticmethod
+    def score_inputs(passport: "MaterialPassport") -> Dict[str, Any]:
+        """Values of the score-only columns, with the defaults the score uses"""
+        lca = passport.lca_results
+        return {
+            "recyclability": lca.get("recyclability", 0),
+            "toxicity_score": lca.get("toxicity_score", 10),
+            "verified": passport.third_party_verified,
+        }
+
+    def _write_row(self, row: int, passport: "MaterialPassport"):
+        lca = passport.lca_results
+        carbon = lca.get("embodied_carbon", float("inf"))
+        recycled = lca.get("recycled_content", 0)
+
+        self._data["embodied_carbon"][row] = carbon
+        self._data["recycled_content"][row] = recycled
+        self._data["cost"][row] = passport.cost_per_unit
+        self._data["category"][row] = self._category_code(passport.category)
+        self._data["cert_mask"][row] = self.certification_mask(passport.certifications)
+        self._data["cert_count"][row] = len(passport.certifications)
+        self._data["supplier"][row] = self._supplier_code(passport.supplier_id)
+        self._data["live"][row] = True
+        self._data["digest"][row] = bytes.fromhex(
+            passport.blockchain_hash or passport.calculate_blockchain_hash()
+        )
+        self._data["score"][row] = (
+            passport.sustainability_score
+            if passport.sustainability_score is not None
+            else np.nan
+        )
+        for name, value in self.score_inputs(passport).items():
+            self._data[name][row] = value
+
+        # Posting lists stay sorted by row so appends are the common O(1) case
+        bisect.insort(self.category_index.setdefault(passport.category, []), row)
+        bisect.insort(self.supplier_index.setdefault(passport.supplier_id, []), row)
+        for cert in set(passport.certifications):
+            bisect.insort(self.certification_index[cert.value], row)
+        self.carbon_index.insert(carbon, row)
+        if passport.category not in self.category_carbon_index:
+            self.category_carbon_index[passport.category] = SortedIndex()
+        self.category_carbon_index[passport.category].insert(carbon, row)
+        self._frontiers.pop(passport.category, None)
+        self.recycled_index.insert(recycled, row)
+        self.cost_index.insert(passport.cost_per_unit, row)
+
+    def _unindex_row(self, row: int):
+        """Drop a row from every secondary index using its stored values"""
+        category = self.category_names[self._data["category"][row]]
+        postings = self.category_index[category]
+        del postings[bisect.bisect_left(postings, row)]
+
+        supplier = self.supplier_names[self._data["supplier"][row]]
+        postings = self.supplier_index[supplier]
+        del postings[bisect.bisect_left(postings, row)]
+
+        cert_mask = int(self._data["cert_mask"][row])
+        for value, bit in CERTIFICATION_VALUE_BITS.items():
+            if cert_mask & bit:
+                postings = self.certification_index[value]
+                del postings[bisect.bisect_left(postings, row)]
+
+        self.carbon_index.remove(self._data["embodied_carbon"][row], row)
+        self.category_carbon_index[category].remove(self._data["embodied_carbon"][row], row)
+        self._frontiers.pop(category, None)
+        self.recycled_index.remove(self._data["recycled_content"][row], row)
+        self.cost_index.remove(self._data["cost"][row], row)
+
+    def set_scores(self, scores: np.ndarray):
+        """Overwrite the score column for every row"""
+        self._data["score"][: self._size] = scores
+
+    @staticmethod
+    def certification_mask(certifications: List[Certification]) -> int:
+        """Encode a list of certifications as a bitmask"""
+        mask = 0
+        for cert in certifications:
+            mask |= CERTIFICATION_BITS[cert]
+        return mask
+
+    def _plan(self, filters: Dict) -> Optional[List[Tuple[int, Callable, Callable]]]:
+        """Build (estimated rows, fetch, residual check) for each predicate
+
+        Returns None when a predicate can never match.
+        """
+        predicates = []
+
+        if "category" in filters:
+            category_rows = self.category_index.get(filters["category"])
+            if not category_rows:
+                return None
+            code = self.category_codes[filters["category"]]
+            predicates.append(
+                (
+                    len(category_rows),
+                    lambda: np.array(category_rows, dtype=np.int64),
+                    lambda rows: self._data["category"][rows] == code,
+                )
+            )
+
+        if "supplier_id" in filters:
+            supplier_rows = self.supplier_index.get(filters["supplier_id"])
+            if not supplier_rows:
+                return None
+            supplier_code = self.supplier_codes[filters["supplier_id"]]
+            predicates.append(
+                (
+                    len(supplier_rows),
+                    lambda: np.array(supplier_rows, dtype=np.int64),
+                    lambda rows: self._data["supplier"][rows] == supplier_code,
+                )
+            )
+
+        if "max_carbon" in filters:
+            max_carbon = filters["max_carbon"]
+            predicates.append(
+                (
+                    self.carbon_index.count_range(high=max_carbon),
+                    lambda: self.carbon_index.range(high=max_carbon),
+                    lambda rows: self._data["embodied_carbon"][rows] <= max_carbon,
+                )
+            )
+
+        if "min_recycled" in filters:
+            min_recycled = filters["min_recycled"]
+            predicates.append(
+                (
+                    self.recycled_index.count_range(low=min_recycled),
+                    lambda: self.recycled_index.range(low=min_recycled),
+                    lambda rows: self._data["recycled_content"][rows] >= min_recycled,
+                )
+            )
+
+        if filters.get("certifications"):
+            required = 0
+            for cert_str in filters["certifications"]:
+                if cert_str not in CERTIFICATION_VALUE_BITS:
+                    # No passport can hold an unknown certification
+                    return None
+                required |= CERTIFICATION_VALUE_BITS[cert_str]
+            cert_rows = min(
+                (self.certification_index[c] for c in filters["certifications"]),
+                key=len,
+            )
+
+            def has_certs(rows: np.ndarray) -> np.ndarray:
+                return (self._data["cert_mask"][rows] & required) == required
+
+            predicates.append(
+                (
+                    len(cert_rows),
+                    # Shortest posting list, intersected with the other bits
+                    lambda: self._take(np.array(cert_rows, dtype=np.int64), has_certs),
+                    has_certs,
+                )
+            )
+
+        if "cost_range" in filters:
+            min_cost, max_cost = filters["cost_range"]
+            predicates.append(
+                (
+                    self.cost_index.count_range(min_cost, max_cost),
+                    lambda: self.cost_index.range(min_cost, max_cost),
+                    lambda rows: (self._data["cost"][rows] >= min_cost)
+                    & (self._data["cost"][rows] <= max_cost),
+                )
+            )
+
+        return predicates
+
+    @staticmethod
+    def _take(rows: np.ndarray, check: Callable) -> np.ndarray:
+        return rows[check(rows)] if len(rows) else rows
+
+    def select(self, filters: Dict) -> np.ndarray:
+        """Return the row numbers matching the filters, in insertion order
+
+        The most selective index produces the candidate rows; every other
+        predicate is then applied as a vectorized check on those rows only.
+        """
+        plan = self._plan(filters)
+        if plan is None:
+            return _EMPTY_ROWS
+        if not plan:
+            return self.live_rows()
+
+        plan.sort(key=lambda predicate: predicate[0])
+        estimate, fetch, _ = plan[0]
+        if estimate == 0:
+            return _EMPTY_ROWS
+
+        rows = np.sort(fetch())
+        for _, _, check in plan[1:]:
+            rows = self._take(rows, check)
+        return rows
+
+
+class LazyPassportStore(MutableMapping):
+    """Passport mapping backed by a snapshot blob, decoding passports on first access
+
+    Snapshot passports are their canonical bytes at ``offsets[row]:offsets[row + 1]``
+    of the blob, the hash and score coming from the columns; decoded and newly
+    added passports are kept in a regular dict.
+    The first ``len(offsets) - 1`` rows of ``columns`` are the snapshot.
+    """
+
+    def __init__(self, columns: MaterialColumnStore, blob: np.ndarray, offsets: np.ndarray):
+        self._columns = columns
+        self._count = len(offsets) - 1
+        self._blob = blob
+        self._offsets = offsets
+        self._decoded: Dict[str, MaterialPassport] = {}
+        self._removed = 0
+
+    def _snapshot_row(self, material_id: str) -> Optional[int]:
+        row = self._columns.rows.get(material_id)
+        return row if row is not None and row < self._count else None
+
+    def _record(self, row: int) -> np.ndarray:
+        return self._blob[self._offsets[row] : self._offsets[row + 1]]
+
+    def decoded(self) -> Dict[str, MaterialPassport]:
+        """Passports decoded or added since loading, by id"""
+        return self._decoded
+
+    def encoded(self, material_id: str) -> Optional[bytes]:
+        """Canonical snapshot bytes of a passport not decoded since loading"""
+        row = self._snapshot_row(material_id)
+        if row is None or material_id in self._decoded:
+            return None
+        return self._record(row).tobytes()
+
+    def canonical_encoder(self) -> Callable[[int], Any]:
+        """Row -> canonical passport bytes, as zero-copy blob slices while undecoded"""
+        blob = memoryview(self._blob)
+        offsets = self._offsets.tolist()
+        ids = self._columns.ids
+        decoded = self._decoded
+
+        def encode(row: int):
+            passport = decoded.get(ids[row])
+            if passport is not None:
+                return passport.canonical_bytes()
+            return blob[offsets[row] : offsets[row + 1]]
+
+        return encode
+
+    def passport_at(self, row: int, cache: bool = True) -> MaterialPassport:
+        """Passport of a column-store row, without an id lookup
+
+        With ``cache=False`` a passport decoded here is not kept, e.g. when
+        exporting every passport once.
+        """
+        material_id = self._columns.ids[row]
+        passport = self._decoded.get(material_id)
+        if passport is None:
+            if row >= self._count:
+                raise KeyError(material_id)
+            record = json.loads(self._record(row).tobytes())
+            record["blockchain_hash"] = self._columns.column("digest")[row].tobytes().hex()
+            score = float(self._columns.column("score")[row])
+            record["sustainability_score"] = None if np.isnan(score) else score
+            passport = MaterialPassport.from_record(record)
+            if cache:
+                passport = self._decoded.setdefault(material_id, passport)
+        return passport
+
+    def __getitem__(self, material_id: str) -> MaterialPassport:
+        passport = self._decoded.get(material_id)
+        if passport is None:
+            row = self._snapshot_row(material_id)
+            if row is None:
+                raise KeyError(material_id)
+            passport = self.passport_at(row)
+        return passport
+
+    def __setitem__(self, material_id: str, passport: MaterialPassport):
+        self._decoded[material_id] = passport
+
+    def __delitem__(self, material_id: str):
+        """Forget a passport; call before removing it from the column store"""
+        if material_id not in self:
+            raise KeyError(material_id)
+        if self._snapshot_row(material_id) is not None:
+            self._removed += 1
+        self._decoded.pop(material_id, None)
+
+    def __contains__(self, material_id: object) -> bool:
+        return material_id in self._decoded or self._snapshot_row(material_id) is not None
+
+    def __len__(self) -> int:
+        added = sum(1 for mat_id in self._decoded if self._snapshot_row(mat_id) is None)
+        return self._count - self._removed + added
+
+    def __iter__(self) -> Iterator[str]:
+        for mat_id in self._columns.ids[: self._count]:
+            if mat_id is not None:
+                yield mat_id
+        for mat_id in list(self._decoded):
+            if self._snapshot_row(mat_id) is None:
+                yield mat_id
+
+
+@dataclass
+class CarbonAggregate:
+    """Running carbon totals over a set of materials"""
+
+    baseline: float  # industry average the savings potential is measured against
+    count: int = 0
+    carbon_sum: float = 0.0
+    savings_sum: float = 0.0  # sum of max(0, baseline - carbon)
+
+    def add(self, carbon: float, weight: int = 1):
+        """Add (weight 1) or remove (weight -1) one material"""
+        self.count += weight
+        if self.count == 0:
+            # Reset instead of carrying float residue from add/remove pairs
+            self.carbon_sum = self.savings_sum = 0.0
+            return
+        self.carbon_sum += weight * carbon
+        self.savings_sum += weight * max(0.0, self.baseline - carbon)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "average_carbon": self.carbon_sum / self.count if self.count else 0,
+            "carbon_savings_potential": self.savings_sum,
+        }
+
+
+@dataclass
+class SupplierAggregate:
+    """Running totals over one supplier's materials"""
+
+    count: int = 0
+    carbon_sum: float = 0.0
+    cost_sum: float = 0.0
+    certification_count: int = 0
+    category_counts: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, passport: "MaterialPassport", weight: int = 1):
+        """Add (weight 1) or remove (weight -1) one material"""
+        self.count += weight
+        if self.count == 0:
+            self.carbon_sum = self.cost_sum = 0.0
+            self.certification_count = 0
+            self.category_counts = {}
+            return
+        self.carbon_sum += weight * passport.lca_results.get("embodied_carbon", 0)
+        self.cost_sum += weight * passport.cost_per_unit
+        self.certification_count += weight * len(passport.certifications)
+        remaining = self.category_counts.get(passport.category, 0) + weight
+        if remaining:
+            self.category_counts[passport.category] = remaining
+        else:
+            del self.category_counts[passport.category]
+
+    def to_dict(self) -> Dict:
+        """Same shape as ``MaterialDatabase.get_supplier_analytics``"""
+        return {
+            "material_count": self.count,
+            "average_carbon": self.carbon_sum / self.count,
+            "average_cost": self.cost_sum / self.count,
+            "categories": list(self.category_counts),
+            "certification_count": self.certification_count,
+        }
+
+
+class TopScores:
+    """Bounded min-heap of the k highest-scoring rows
+
+    Ties go to the earlier row. When a row in the heap changes or is removed
+    the heap is marked stale and rebuilt from the score column on next read.
+    """
+
+    def __init__(self, k: int = 5):
+        self.k = k
+        self.heap: List[Tuple[float, int]] = []  # (score, -row)
+        self.members: set = set()
+        self.stale = False
+
+    def offer(self, score: float, row: int):
+        if self.stale:
+            return
+        entry = (score, -row)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            _, evicted = heapq.heapreplace(self.heap, entry)
+            self.members.discard(-evicted)
+        else:
+            return
+        self.members.add(row)
+
+    def discard(self, row: int):
+        if row in self.members:
+            self.stale = True
+
+    def rebuild(self, scores: np.ndarray, rows: np.ndarray):
+        """Reset from the scores of ``rows`` (row numbers ascending)"""
+        if len(rows) > self.k:
+            kth = np.partition(-scores, self.k - 1)[self.k - 1]
+            head = np.flatnonzero(-scores <= kth)
+            top = head[np.lexsort((rows[head], -scores[head]))][: self.k]
+        else:
+            top = np.arange(len(rows))
+        self.heap = [(float(scores[i]), -int(rows[i])) for i in top]
+        heapq.heapify(self.heap)
+        self.members = {int(rows[i]) for i in top}
+        self.stale = False
+
+    def rows(self) -> List[int]:
+        """Rows from best to worst"""
+        return [-row for _, row in sorted(self.heap, reverse=True)]
+
+
+class ReadWriteLock:
+    """Many concurrent readers or one writer
+
+    Waiting writers block new readers, so a stream of searches cannot starve
+    registrations. Both sides are reentrant, and the writer may also read;
+    upgrading a read to a write raises instead of deadlocking.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writes = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self):
+        depth = getattr(self._local, "reads", 0)
+        if depth or self._writer == threading.get_ident():
+            self._local.reads = depth + 1
+            try:
+                yield
+            finally:
+                self._local.reads -= 1
+            return
+
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        self._local.reads = 1
+        try:
+            yield
+        finally:
+            self._local.reads = 0
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer != me:
+                if getattr(self._local, "reads", 0):
+                    raise RuntimeError("Cannot upgrade a read lock to a write lock")
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._condition.wait()
+                finally:
+                    self._waiting_writers -= 1
+                self._writer = me
+            self._writes += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writes -= 1
+                if not self._writes:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+def _reads(method: Callable) -> Callable:
+    """Run a catalog method holding the catalog lock for reading"""
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.read():
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+def _writes(method: Callable) -> Callable:
+    """Run a catalog method holding the catalog lock exclusively"""
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.write():
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+@dataclass
+class SearchPage:
+    """One page of search results plus the cursor for the next page"""
+
+    results: List[MaterialPassport]
+    next_cursor: Optional[str] = None
+
+
+class MaterialDatabase:
+    """Central repository for sustainable materials
+
+    The column store, indexes, aggregates and Merkle tree change together on
+    every write, so public methods hold a readers-writer lock: searches and
+    reports run concurrently, inserts, updates and removals one at a time.
+    """
+
+    # sort_by -> (column, default order)
+    SORT_KEYS = {
+        "sustainability": ("score", "desc"),
+        "carbon": ("embodied_carbon", "asc"),
+        "cost": ("cost", "asc"),
+        "recycled": ("recycled_content", "desc"),
+    }
+
+    # kg CO2e/kg for construction materials; the dashboard's savings baseline
+    INDUSTRY_AVERAGE_CARBON = 2.5
+    DASHBOARD_TOP_K = 5
+
+    # Supplier leaderboard sort key -> default order
+    SUPPLIER_SORT_KEYS = {
+        "material_count": "desc",
+        "average_carbon": "asc",
+        "average_cost": "asc",
+        "certification_count": "desc",
+    }
+
+    # Weights of the sustainability score components
+    DEFAULT_SCORE_WEIGHTS = {
+        "carbon": 0.4,
+        "recycled_content": 0.3,
+        "recyclability": 0.2,
+        "toxicity": 0.1,
+        "certification_bonus": 5,
+        "verification_bonus": 10,
+    }
+
+    def __init__(self, score_weights: Optional[Dict[str, float]] = None):
         self.materials: Dict[str, MaterialPassport] = {}
         self.suppliers: Dict[str, Any] = {}
         self.categories = self._initialize_categories()
+        self.score_weights = {**self.DEFAULT_SCORE_WEIGHTS, **(score_weights or {})}
+        self.columns = MaterialColumnStore()
+
+        # Dashboard aggregates, maintained on every insert, update and removal
+        self.carbon_totals = CarbonAggregate(self.INDUSTRY_AVERAGE_CARBON)
+        self.category_carbon: Dict[str, CarbonAggregate] = {}
+        self.top_scores = TopScores(self.DASHBOARD_TOP_K)
+        self.supplier_stats: Dict[str, SupplierAggregate] = {}
+        # Merkle tree over column-store rows, built on first use
+        self._merkle: Optional[MerkleTree] = None
+        self._lock = ReadWriteLock()
+
+    # Bumped whenever the snapshot layout changes
+    SNAPSHOT_VERSION = 6
+
+    @_reads
+    def save_snapshot(self, path: str):
+        """
+        Write the catalog as a directory snapshot for fast worker startup
+
+        Numeric columns are stored as ``.npy`` files, passports as their
+        canonical bytes in one blob indexed by an offsets array. Removed materials
+        are compacted away. The manifest is written last, so a snapshot
+        without one is incomplete.
+
+        Args:
+            path: Snapshot directory, created if missing
+        """
+        directory = self._begin_snapshot(path)
+
+        live = self.columns.live_rows()
+        ids = [self.columns.ids[row] for row in live]
+        lazy = isinstance(self.materials, LazyPassportStore)
+
+        def records() -> Iterator[bytes]:
+            for mat_id in ids:
+                # Passports never decoded since loading are copied verbatim
+                record = self.materials.encoded(mat_id) if lazy else None
+                yield record if record is not None else self.materials[mat_id].canonical_bytes()
+
+        self._write_passport_blob(directory, records())
+
+        # Sorted index orders (renumbered to compacted rows), so loading skips the sorts
+        compacted = np.full(len(self.columns), -1, dtype=np.int64)
+        compacted[live] = np.arange(len(live))
+        orders = {
+            name: compacted[np.array(getattr(self.columns, attr).rows, dtype=np.int64)]
+            for name, attr in MaterialColumnStore.SORTED_INDEXES.items()
+        }
+        self._finish_snapshot(
+            directory,
+            ids,
+            {name: self.columns.column(name)[live] for name in MaterialColumnStore.COLUMNS},
+            orders,
+            self.columns.category_names,
+            self.columns.supplier_names,
+            self.columns.leaf_count,
+            self.suppliers,
+        )
+
+    @staticmethod
+    def _begin_snapshot(path: str) -> Path:
+        """Create the snapshot directory and drop any manifest from an earlier snapshot"""
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "manifest.json").unlink(missing_ok=True)
+        return directory
+
+    @staticmethod
+    def _write_passport_blob(directory: Path, records: Iterable[bytes]):
+        """Concatenate canonical passport bytes, row by row, and save their offsets"""
+        offsets = [0]
+        with open(directory / "passports.bin", "wb") as blob:
+            for record in records:
+                blob.write(record)
+                offsets.append(offsets[-1] + len(record))
+        np.save(directory / "passport_offsets.npy", np.array(offsets, dtype=np.int64))
+
+    def _finish_snapshot(
+        self,
+        directory: Path,
+        ids: List[str],
+        columns: Dict[str, np.ndarray],
+        orders: Dict[str, np.ndarray],
+        category_names: List[str],
+        supplier_names: List[str],
+        leaf_count: int,
+        suppliers: Dict,
+    ):
+        """Save the columns and sorted orders, then the manifest completing the snapshot"""
+        for name in MaterialColumnStore.COLUMNS:
+            np.save(directory / f"{name}.npy", columns[name])
+        for name in MaterialColumnStore.SORTED_INDEXES:
+            np.save(directory / f"{name}_order.npy", orders[name])
+
+        manifest = {
+            "version": self.SNAPSHOT_VERSION,
+            "count": len(ids),
+            "ids": ids,
+            "category_names": category_names,
+            "supplier_names": supplier_names,
+            "leaf_count": leaf_count,
+            "score_weights": self.score_weights,
+            "suppliers": suppliers,
+        }
+        with open(directory / "manifest.json", "w") as f:
+            json.dump(manifest, f, default=str)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "MaterialDatabase":
+        """
+        Open a snapshot written by ``save_snapshot``
+
+        Columns and the passport blob are memory-mapped copy-on-write, so
+        loading is bounded by rebuilding the indexes; passports are decoded
+        only when first accessed.
+        """
+        directory = Path(path)
+        manifest_path = directory / "manifest.json"
+        if not manifest_path.exists():
+            raise ValueError(f"No complete material snapshot at {path}")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest["version"] != cls.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {manifest['version']}")
+
+        database = cls(manifest["score_weights"])
+        database.suppliers = manifest["suppliers"]
+
+        ids = manifest["ids"]
+        data = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="c")
+            for name in MaterialColumnStore.COLUMNS
+        }
+        orders = {
+            name: np.load(directory / f"{name}_order.npy", mmap_mode="r")
+            for name in MaterialColumnStore.SORTED_INDEXES
+        }
+        database.columns = MaterialColumnStore.from_arrays(
+            ids,
+            data,
+            manifest["category_names"],
+            manifest["supplier_names"],
+            orders,
+            manifest["leaf_count"],
+        )
+
+        blob_path = directory / "passports.bin"
+        blob = (
+            np.memmap(blob_path, dtype=np.uint8, mode="r")
+            if blob_path.stat().st_size
+            else np.empty(0, dtype=np.uint8)
+        )
+        offsets = np.load(directory / "passport_offsets.npy", mmap_mode="r")
+        database.materials = LazyPassportStore(database.columns, blob, offsets)
+        database._rebuild_aggregates()
+        return database
 
     def _initialize_categories(self) -> Dict:
         """Initialize material categories"""
@@ -116,7 +1181,37 @@ class MaterialDatabase:
         lca_result = lca_engine.calculate_carbon_footprint(material_data)
         carbon_label = lca_engine.generate_carbon_label(lca_result)
 
-        # Create material passport
+        passport = self._build_passport(material_data, lca_result, carbon_label)
+        self._store_passports([passport])
+        return passport
+
+    def add_materials(
+        self, materials_data: List[Dict], lca_engine: "LCAEngine"
+    ) -> List[MaterialPassport]:
+        """Add many materials with one batched LCA calculation and one bulk store"""
+        return self.add_passports(self.build_passports(materials_data, lca_engine))
+
+    def build_passports(
+        self, materials_data: List[Dict], lca_engine: "LCAEngine"
+    ) -> List[MaterialPassport]:
+        """Hashed and scored passports from one batched LCA calculation, not yet stored"""
+        batch = lca_engine.calculate_carbon_footprint_batch(materials_data)
+        passports = []
+        for i, material_data in enumerate(materials_data):
+            lca_result = batch[i]
+            carbon_label = lca_engine.generate_carbon_label(lca_result)
+            passports.append(self._build_passport(material_data, lca_result, carbon_label))
+        return passports
+
+    def add_passports(self, passports: List[MaterialPassport]) -> List[MaterialPassport]:
+        """Store passports from ``build_passports`` in one bulk store"""
+        self._store_passports(passports)
+        return passports
+
+    def _build_passport(
+        self, material_data: Dict, lca_result, carbon_label: Dict
+    ) -> MaterialPassport:
+        """Create a hashed and scored passport from registration data"""
         passport = MaterialPassport(
             name=material_data["name"],
             description=material_data.get("description", ""),
@@ -139,11 +1234,298 @@ class MaterialDatabase:
         # Generate blockchain hash
         passport.blockchain_hash = passport.calculate_blockchain_hash()
 
-        # Store in database
-        self.materials[passport.id] = passport
+        # Score once up front; reads hit the cached value from now on
+        passport.sustainability_score = self._compute_sustainability_score(passport)
 
         return passport
 
+    @_writes
+    def _store_passports(self, passports: List[MaterialPassport]):
+        """Store new passports in the database
+
+        A passport is listed in ``materials`` only once it is indexed, so after
+        a failure part way through, the listed passports are the stored ones.
+        """
+        for passport in passports:
+            self._index_material(passport)
+            self.materials[passport.id] = passport
+
+    def _index_material(self, passport: MaterialPassport):
+        """Keep the columnar store and aggregates in sync with a newly stored passport"""
+        row = self.columns.append(passport)
+        self._track_aggregates(passport, 1)
+        self.top_scores.offer(passport.sustainability_score, row)
+        self._update_merkle(row)
+
+    def _track_aggregates(self, passport: MaterialPassport, weight: int):
+        """Add (1) or remove (-1) a passport from the running aggregates"""
+        supplier = self.supplier_stats.get(passport.supplier_id)
+        if supplier is None:
+            supplier = self.supplier_stats[passport.supplier_id] = SupplierAggregate()
+        supplier.add(passport, weight)
+        if supplier.count == 0:
+            del self.supplier_stats[passport.supplier_id]
+        record = self.suppliers.get(passport.supplier_id)
+        if record is not None:
+            record["materials_count"] = supplier.count
+
+        carbon = passport.lca_results.get("embodied_carbon", 0)
+        self.carbon_totals.add(carbon, weight)
+        category = self.category_carbon.get(passport.category)
+        if category is None:
+            category = self.category_carbon[passport.category] = CarbonAggregate(
+                self.INDUSTRY_AVERAGE_CARBON
+            )
+        category.add(carbon, weight)
+        if category.count == 0:
+            del self.category_carbon[passport.category]
+
+    def _rebuild_aggregates(self):
+        """Recompute the dashboard aggregates from the columns, e.g. after loading"""
+        rows = self.columns.live_rows()
+        carbon = self.columns.column("embodied_carbon")[rows]
+        carbon = np.where(np.isfinite(carbon), carbon, 0.0)
+        savings = np.maximum(0.0, self.INDUSTRY_AVERAGE_CARBON - carbon)
+        codes = self.columns.column("category")[rows]
+
+        self.carbon_totals = CarbonAggregate(
+            self.INDUSTRY_AVERAGE_CARBON, len(rows), float(carbon.sum()), float(savings.sum())
+        )
+        self.category_carbon = {}
+        counts = np.bincount(codes, minlength=len(self.columns.category_names))
+        carbon_sums = np.bincount(codes, carbon, minlength=len(counts))
+        savings_sums = np.bincount(codes, savings, minlength=len(counts))
+        for code, name in enumerate(self.columns.category_names):
+            if counts[code]:
+                self.category_carbon[name] = CarbonAggregate(
+                    self.INDUSTRY_AVERAGE_CARBON,
+                    int(counts[code]),
+                    float(carbon_sums[code]),
+                    float(savings_sums[code]),
+                )
+
+        suppliers = self.columns.column("supplier")[rows]
+        n_suppliers = len(self.columns.supplier_names)
+        counts = np.bincount(suppliers, minlength=n_suppliers)
+        carbon_sums = np.bincount(suppliers, carbon, minlength=n_suppliers)
+        cost_sums = np.bincount(suppliers, self.columns.column("cost")[rows], minlength=n_suppliers)
+        cert_counts = np.bincount(
+            suppliers, self.columns.column("cert_count")[rows], minlength=n_suppliers
+        )
+        # Category counts per (supplier, category) pair
+        pairs, pair_counts = np.unique(
+            suppliers.astype(np.int64) * len(self.columns.category_names) + codes,
+            return_counts=True,
+        )
+        self.supplier_stats = {
+            name: SupplierAggregate(
+                int(counts[code]),
+                float(carbon_sums[code]),
+                float(cost_sums[code]),
+                int(round(cert_counts[code])),
+            )
+            for code, name in enumerate(self.columns.supplier_names)
+            if counts[code]
+        }
+        for pair, count in zip(pairs.tolist(), pair_counts.tolist()):
+            supplier, category = divmod(pair, len(self.columns.category_names))
+            stats = self.supplier_stats[self.columns.supplier_names[supplier]]
+            stats.category_counts[self.columns.category_names[category]] = count
+        for supplier_id, record in self.suppliers.items():
+            stats = self.supplier_stats.get(supplier_id)
+            record["materials_count"] = stats.count if stats else 0
+
+        self.top_scores.stale = True
+
+    @_writes
+    def update_material(self, material_id: str, **changes) -> MaterialPassport:
+        """Update passport fields, rescoring and re-indexing the material"""
+        passport = self.materials[material_id]
+        for name in changes:
+            if not hasattr(passport, name):
+                raise AttributeError(f"MaterialPassport has no field '{name}'")
+
+        self._track_aggregates(passport, -1)
+        for name, value in changes.items():
+            setattr(passport, name, value)
+        passport.last_updated = datetime.now()
+        passport.blockchain_hash = passport.calculate_blockchain_hash()
+
+        self._calculate_sustainability_score(passport)
+        self.columns.update(passport)
+        self._track_aggregates(passport, 1)
+        row = self.columns.rows[material_id]
+        self.top_scores.discard(row)
+        self.top_scores.offer(passport.sustainability_score, row)
+        self._update_merkle(row)
+        return passport
+
+    @_writes
+    def remove_material(self, material_id: str) -> MaterialPassport:
+        """Delete a material from the catalog, its indexes and aggregates"""
+        passport = self.materials[material_id]
+        self._track_aggregates(passport, -1)
+        del self.materials[material_id]
+        row = self.columns.remove(material_id)
+        self.top_scores.discard(row)
+        self._update_merkle(row)
+        return passport
+
+    @property
+    def merkle(self) -> MerkleTree:
+        """Merkle tree of the passport digests, one leaf per material ever inserted
+
+        Each material keeps the leaf position it was given on insertion, also
+        across snapshots, so the root depends only on the catalog's history.
+        """
+        if self._merkle is None:
+            self._merkle = MerkleTree(self.columns.leaves())
+        return self._merkle
+
+    def _update_merkle(self, row: int):
+        if self._merkle is not None:
+            self._merkle.set(
+                int(self.columns.column("leaf")[row]),
+                self.columns.column("digest")[row].tobytes(),
+            )
+
+    @_reads
+    def merkle_root(self) -> str:
+        """Root hash over the whole catalog, read in O(1) once the tree is built"""
+        return self.merkle.root
+
+    @_reads
+    def inclusion_proof(self, material_id: str) -> InclusionProof:
+        """Proof that a passport's current hash is part of ``merkle_root()``"""
+        row = self.columns.rows[material_id]
+        return self.merkle.proof(int(self.columns.column("leaf")[row]))
+
+    @_reads
+    def verify_integrity(
+        self, max_workers: Optional[int] = None, chunk_size: int = 4096
+    ) -> IntegrityReport:
+        """
+        Rehash every passport and compare against the digests in the Merkle tree
+
+        Passports still undecoded since a snapshot load are hashed straight
+        from the memory-mapped blob.
+
+        Args:
+            max_workers: Hashing threads, defaults to the number of CPUs
+            chunk_size: Passports hashed per task
+        """
+        start = time.perf_counter()
+        rows = self.columns.live_rows()
+        if isinstance(self.materials, LazyPassportStore):
+            encode = self.materials.canonical_encoder()
+        else:
+
+            def encode(row: int) -> bytes:
+                return self.materials[self.columns.ids[row]].canonical_bytes()
+
+        digests = digest_many(rows.tolist(), encode, max_workers, chunk_size)
+        leaves = self.merkle.levels[0][self.columns.column("leaf")[rows]]
+        bad = np.flatnonzero((digests != leaves).any(axis=1))
+        return IntegrityReport(
+            checked=len(rows),
+            mismatched=[self.columns.ids[row] for row in rows[bad].tolist()],
+            root=self.merkle.root,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def get_dashboard_summary(self) -> Dict:
+        """Catalog-wide carbon aggregates, per-category breakdown and top materials
+
+        Served from running aggregates; only a stale top-k heap (after its
+        members changed) costs a scan of the score column, taken under the
+        write lock since it rebuilds the heap.
+        """
+        with self._lock.read():
+            if not self.top_scores.stale:
+                return self._dashboard_summary()
+        with self._lock.write():
+            return self._dashboard_summary()
+
+    def _dashboard_summary(self) -> Dict:
+        if self.top_scores.stale:
+            rows = self.columns.live_rows()
+            self.top_scores.rebuild(self.columns.column("score")[rows], rows)
+
+        totals = self.carbon_totals.to_dict()
+        return {
+            "total_materials": totals["count"],
+            "average_carbon": totals["average_carbon"],
+            "carbon_savings_potential": totals["carbon_savings_potential"],
+            "categories": {
+                name: aggregate.to_dict() for name, aggregate in self.category_carbon.items()
+            },
+            "top_performing_materials": [
+                {
+                    "id": mat.id,
+                    "name": mat.name,
+                    "carbon": mat.lca_results.get("embodied_carbon", 0),
+                    "score": self._calculate_sustainability_score(mat),
+                }
+                for mat in self._passports(self.top_scores.rows())
+            ],
+        }
+
+    @_writes
+    def rescore_materials(
+        self,
+        score_weights: Optional[Dict[str, float]] = None,
+        chunk_size: int = 10000,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """Recompute every cached sustainability score, e.g. after a weight change
+
+        Scores are computed from the columns, so passports of a loaded
+        snapshot stay undecoded; only passports already in memory are updated.
+        ``progress`` is called with (rescored, total) after each chunk.
+        """
+        if score_weights is not None:
+            self.score_weights = {**self.DEFAULT_SCORE_WEIGHTS, **score_weights}
+
+        total = len(self.columns)
+        scores = np.full(total, np.nan)
+        for start in range(0, total, chunk_size):
+            rows = slice(start, min(start + chunk_size, total))
+            scores[rows] = self._score_rows(rows)
+            if progress is not None:
+                progress(rows.stop, total)
+        scores[~self.columns.column("live")] = np.nan
+        self.columns.set_scores(scores)
+        self.top_scores.stale = True
+
+        if isinstance(self.materials, LazyPassportStore):
+            cached = self.materials.decoded()
+        else:
+            cached = self.materials
+        row_of = self.columns.rows
+        for mat_id, passport in cached.items():
+            passport.sustainability_score = float(scores[row_of[mat_id]])
+
+        return total - self.columns.deleted
+
+    def _score_rows(self, rows: slice) -> np.ndarray:
+        """``_compute_sustainability_score`` over a range of column-store rows"""
+        weights = self.score_weights
+        column = self.columns.column
+
+        # A missing embodied carbon is stored as inf, capped like the default of 10
+        score = (
+            (100 - np.minimum(column("embodied_carbon")[rows] * 10, 100)) * weights["carbon"]
+            + column("recycled_content")[rows] * weights["recycled_content"]
+            + column("recyclability")[rows] * weights["recyclability"]
+            + (10 - column("toxicity_score")[rows]) * 10 * weights["toxicity"]
+        )
+
+        cert_bonus = column("cert_count")[rows] * weights["certification_bonus"] + np.where(
+            column("verified")[rows], weights["verification_bonus"], 0.0
+        )
+
+        return np.minimum(score + cert_bonus, 100)
+
     def _parse_certifications(self, cert_strings: List[str]) -> List[Certification]:
         """Parse certification strings to enum values"""
         certs = []
@@ -158,67 +1540,152 @@ class MaterialDatabase:
                         break
         return certs
 
-    def search_materials(self, filters: Dict) -> List[MaterialPassport]:
-        """Search materials with advanced filtering"""
-        results = list(self.materials.values())
+    @_reads
+    def search_materials(
+        self,
+        filters: Dict,
+        sort_by: Optional[str] = None,
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List[MaterialPassport]:
+        """Search materials with advanced filtering
 
-        # Apply filters
-        if "category" in filters:
-            results = [m for m in results if m.category == filters["category"]]
+        Without ``sort_by`` every match is returned by ascending sustainability
+        score. See ``search_page`` for the sorting and pagination arguments.
+        """
+        if sort_by is None:
+            if cursor is not None:
+                raise ValueError("A search cursor requires sort_by")
+            rows = self.columns.select(filters)
+            scores = self.columns.column("score")[rows]
+            rows = rows[np.argsort(scores, kind="stable")][:limit]
+            return self._passports(rows)
 
-        if "max_carbon" in filters:
-            results = [
-                m
-                for m in results
-                if m.lca_results.get("embodied_carbon", float("inf"))
-                <= filters["max_carbon"]
-            ]
+        return self.search_page(filters, sort_by, order, limit, cursor).results
 
-        if "min_recycled" in filters:
-            results = [
-                m
-                for m in results
-                if m.lca_results.get("recycled_content", 0) >= filters["min_recycled"]
-            ]
-
-        if "certifications" in filters:
-            required_certs = set(filters["certifications"])
-            results = [
-                m
-                for m in results
-                if required_certs.issubset({c.value for c in m.certifications})
-            ]
+    @_reads
+    def search_page(
+        self,
+        filters: Dict,
+        sort_by: str = "sustainability",
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> SearchPage:
+        """Search with sorting pushed down into the column store
 
-        if "cost_range" in filters:
-            min_cost, max_cost = filters["cost_range"]
-            results = [
-                m for m in results if min_cost <= m.cost_per_unit <= max_cost
-            ]
+        Args:
+            filters: Same filters as ``search_materials``
+            sort_by: One of ``SORT_KEYS``
+            order: "asc" or "desc"; defaults to the natural order of ``sort_by``
+            limit: Page size; only the top ``limit`` rows are ordered
+            cursor: Opaque keyset cursor returned by the previous page
+        """
+        if sort_by not in self.SORT_KEYS:
+            raise ValueError(f"Unknown sort_by '{sort_by}'")
+        column, default_order = self.SORT_KEYS[sort_by]
+        order = order or default_order
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unknown order '{order}'")
 
-        # Sort by sustainability score
-        results.sort(key=lambda m: self._calculate_sustainability_score(m))
+        rows = self.columns.select(filters)
+        # Sort ascending on a signed key; row number breaks ties
+        keys = self.columns.column(column)[rows]
+        if order == "desc":
+            keys = -keys
 
-        return results
+        if cursor is not None:
+            last_key, last_row = self._decode_cursor(cursor, sort_by, order)
+            after = (keys > last_key) | ((keys == last_key) & (rows > last_row))
+            rows, keys = rows[after], keys[after]
+
+        if limit is not None and limit < len(rows):
+            # Top-k: partition, then order only the rows at or above the kth key
+            kth = np.partition(keys, limit - 1)[limit - 1]
+            head = np.flatnonzero(keys <= kth)
+            ranked = head[np.lexsort((rows[head], keys[head]))][:limit]
+            last = ranked[-1]
+            next_cursor = self._encode_cursor(keys[last], rows[last], sort_by, order)
+        else:
+            ranked = np.lexsort((rows, keys))
+            next_cursor = None
+
+        return SearchPage(results=self._passports(rows[ranked]), next_cursor=next_cursor)
+
+    def _passports(self, rows: np.ndarray) -> List[MaterialPassport]:
+        if isinstance(self.materials, LazyPassportStore):
+            return [self.materials.passport_at(row) for row in rows]
+        ids = self.columns.ids
+        return [self.materials[ids[row]] for row in rows]
+
+    @staticmethod
+    def _encode_cursor(key: float, row: int, sort_by: str, order: str) -> str:
+        payload = json.dumps([float(key), int(row), sort_by, order])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort_by: str, order: str) -> Tuple[float, int]:
+        try:
+            key, row, cursor_sort, cursor_order = json.loads(
+                base64.urlsafe_b64decode(cursor.encode())
+            )
+        except (ValueError, TypeError):
+            raise ValueError("Malformed search cursor")
+        if (cursor_sort, cursor_order) != (sort_by, order):
+            raise ValueError("Search cursor was issued for a different sort order")
+        return float(key), int(row)
 
     def _calculate_sustainability_score(self, material: MaterialPassport) -> float:
+        """Return the cached sustainability score, computing it if stale"""
+        if material.sustainability_score is None:
+            material.sustainability_score = self._compute_sustainability_score(material)
+        return material.sustainability_score
+
+    def _compute_sustainability_score(self, material: MaterialPassport) -> float:
         """Calculate overall sustainability score (0-100)"""
         lca = material.lca_results
+        weights = self.score_weights
 
         # Weighted average of multiple factors
         score = (
-            (100 - min(lca.get("embodied_carbon", 10) * 10, 100)) * 0.4
-            + lca.get("recycled_content", 0) * 0.3
-            + lca.get("recyclability", 0) * 0.2
-            + (10 - lca.get("toxicity_score", 10)) * 10 * 0.1
+            (100 - min(lca.get("embodied_carbon", 10) * 10, 100)) * weights["carbon"]
+            + lca.get("recycled_content", 0) * weights["recycled_content"]
+            + lca.get("recyclability", 0) * weights["recyclability"]
+            + (10 - lca.get("toxicity_score", 10)) * 10 * weights["toxicity"]
         )
 
         # Bonus for certifications
-        cert_bonus = len(material.certifications) * 5
+        cert_bonus = len(material.certifications) * weights["certification_bonus"]
         if material.third_party_verified:
-            cert_bonus += 10
+            cert_bonus += weights["verification_bonus"]
 
         return min(score + cert_bonus, 100)
 
+    @_reads
+    def lower_carbon_alternatives(
+        self, category: str, below_carbon: float
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Cost-efficient materials of a category with less embodied carbon
+
+        Only materials that no lower-carbon material matches on cost are kept,
+        so the result runs from the lowest carbon (and highest cost) upwards.
+
+        Args:
+            category: Material category
+            below_carbon: Embodied carbon the alternatives must be strictly under
+
+        Returns:
+            Ids, costs and embodied carbon of the alternatives, by ascending carbon
+        """
+        carbon, rows = self.columns.cost_frontier(category)
+        end = np.searchsorted(carbon, below_carbon, side="left")
+        rows = rows[:end]
+        ids = self.columns.ids
+        return [ids[row] for row in rows.tolist()], self.columns.column("cost")[rows], carbon[:end]
+
+    @_reads
     def get_material_comparison(self, material_ids: List[str]) -> List[Dict]:
         """Compare multiple materials side by side"""
         comparison = []
@@ -239,29 +1706,55 @@ class MaterialDatabase:
 
         return comparison
 
+    @_writes
+    def register_supplier(self, supplier_id: str, record: Dict) -> Dict:
+        """Store a supplier record, counting materials registered before it"""
+        count = self.get_supplier_analytics(supplier_id).get("material_count", 0)
+        record = {**record, "id": supplier_id, "materials_count": count}
+        self.suppliers[supplier_id] = record
+        return record
+
+    @_reads
     def get_supplier_analytics(self, supplier_id: str) -> Dict:
         """Get analytics for a specific supplier"""
-        supplier_materials = [
-            m for m in self.materials.values() if m.supplier_id == supplier_id
-        ]
+        stats = self.supplier_stats.get(supplier_id)
+        return stats.to_dict() if stats else {}
 
-        if not supplier_materials:
-            return {}
+    @_reads
+    def get_supplier_leaderboard(
+        self,
+        sort_by: str = "average_carbon",
+        order: Optional[str] = None,
+        limit: Optional[int] = 50,
+        min_materials: int = 1,
+    ) -> List[Dict]:
+        """
+        Rank suppliers by an aggregate of their materials
 
-        avg_carbon = sum(
-            m.lca_results.get("embodied_carbon", 0) for m in supplier_materials
-        ) / len(supplier_materials)
+        Args:
+            sort_by: One of ``SUPPLIER_SORT_KEYS``
+            order: "asc" or "desc"; defaults to the natural order of ``sort_by``
+            limit: Number of suppliers to return
+            min_materials: Skip suppliers with fewer materials
+        """
+        if sort_by not in self.SUPPLIER_SORT_KEYS:
+            raise ValueError(f"Unknown sort_by '{sort_by}'")
+        order = order or self.SUPPLIER_SORT_KEYS[sort_by]
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unknown order '{order}'")
 
-        avg_cost = sum(m.cost_per_unit for m in supplier_materials) / len(
-            supplier_materials
-        )
+        entries = [
+            {"supplier_id": supplier_id, **stats.to_dict()}
+            for supplier_id, stats in self.supplier_stats.items()
+            if stats.count >= min_materials
+        ]
+        sign = -1 if order == "desc" else 1
+        entries.sort(key=lambda entry: (sign * entry[sort_by], entry["supplier_id"]))
+        return self._leaderboard(entries[:limit])
 
-        return {
-            "material_count": len(supplier_materials),
-            "average_carbon": avg_carbon,
-            "average_cost": avg_cost,
-            "categories": list(set(m.category for m in supplier_materials)),
-            "certification_count": sum(
-                len(m.certifications) for m in supplier_materials
-            ),
-        }
+    def _leaderboard(self, entries: List[Dict]) -> List[Dict]:
+        """Number entries and attach registered supplier names"""
+        for rank, entry in enumerate(entries, 1):
+            record = self.suppliers.get(entry["supplier_id"]) or {}
+            entry.update(rank=rank, name=record.get("name"))
+        return entries
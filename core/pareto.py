@@ -0,0 +1,130 @@
+import bisect
+import numpy as np
+
+
+def non_dominated_ranks(points: np.ndarray) -> np.ndarray:
+    """
+    Pareto rank of every point (0 = non-dominated), all objectives minimized
+
+    Two objectives use an O(N log N) sweep; more objectives fall back to
+    NSGA-II fast non-dominated sorting.
+
+    Args:
+        points: N x M array of objective values
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) == 0:
+        return np.empty(0, dtype=np.int64)
+    if points.shape[1] == 2:
+        return _ranks_2d(points)
+    return _ranks_nsga(points)
+
+
+def _ranks_2d(points: np.ndarray) -> np.ndarray:
+    """Sweep in (f1, f2) order, placing each point in the first front it joins"""
+    # Identical points never dominate each other, so rank distinct points only
+    unique, inverse = np.unique(points, axis=0, return_inverse=True)
+
+    # Sorted by f1 then f2, every earlier point with f2 <= ours dominates us.
+    # front_min[k] is the smallest f2 in front k and is nondecreasing in k.
+    front_min = []
+    ranks = np.empty(len(unique), dtype=np.int64)
+    for i, f2 in enumerate(unique[:, 1].tolist()):
+        rank = bisect.bisect_right(front_min, f2)
+        if rank == len(front_min):
+            front_min.append(f2)
+        else:
+            front_min[rank] = f2
+        ranks[i] = rank
+
+    return ranks[inverse.reshape(-1)]
+
+
+def _ranks_nsga(points: np.ndarray, block: int = 1024) -> np.ndarray:
+    """NSGA-II fast non-dominated sort with a vectorized dominance matrix"""
+    n = len(points)
+    dominates = np.zeros((n, n), dtype=bool)
+    for start in range(0, n, block):
+        chunk = points[start : start + block]
+        # One objective at a time; reducing over a short last axis is far slower
+        no_worse = np.ones((len(chunk), n), dtype=bool)
+        better = np.zeros((len(chunk), n), dtype=bool)
+        for objective in range(points.shape[1]):
+            mine, theirs = chunk[:, objective, None], points[None, :, objective]
+            no_worse &= mine <= theirs
+            better |= mine < theirs
+        dominates[start : start + block] = no_worse & better
+
+    dominated_count = dominates.sum(axis=0)
+    ranks = np.full(n, -1, dtype=np.int64)
+    front = np.flatnonzero(dominated_count == 0)
+    rank = 0
+    while len(front):
+        ranks[front] = rank
+        dominated_count = dominated_count - dominates[front].sum(axis=0)
+        dominated_count[front] = -1
+        front = np.flatnonzero(dominated_count == 0)
+        rank += 1
+    return ranks
+
+
+def crowding_distance(points: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """NSGA-II crowding distance of every point within its own front"""
+    points = np.asarray(points, dtype=float)
+    distance = np.zeros(len(points))
+    for rank in np.unique(ranks):
+        members = np.flatnonzero(ranks == rank)
+        if len(members) <= 2:
+            distance[members] = np.inf
+            continue
+        for objective in points[members].T:
+            order = np.argsort(objective, kind="stable")
+            sorted_values = objective[order]
+            span = sorted_values[-1] - sorted_values[0]
+            distance[members[order[[0, -1]]]] = np.inf
+            if span > 0:
+                distance[members[order[1:-1]]] += (
+                    sorted_values[2:] - sorted_values[:-2]
+                ) / span
+    return distance
+
+
+class ParetoArchive:
+    """
+    Distinct designs of Pareto rank <= ``max_rank`` among every design offered
+
+    Adding points never lowers the rank of a point already seen, and every
+    point dominating a kept one is kept too, so pruning each batch and the
+    merged archive to ``max_rank`` keeps exactly the designs that rank that
+    well over everything offered, with their true ranks, in bounded memory.
+    """
+
+    def __init__(self, n_variables: int, n_objectives: int, max_rank: int = 0, block: int = 512):
+        self.max_rank = max_rank
+        self.block = block
+        self.designs = np.empty((0, n_variables), dtype=np.int64)
+        self.points = np.empty((0, n_objectives))
+        self.offered = 0
+
+    def _prune(self, designs: np.ndarray, points: np.ndarray):
+        designs, first = np.unique(designs, axis=0, return_index=True)
+        points = points[first]
+        keep = non_dominated_ranks(points) <= self.max_rank
+        return designs[keep], points[keep]
+
+    def add(self, designs: np.ndarray, points: np.ndarray):
+        """
+        Offer a batch of designs with their objective values (minimized)
+
+        Args:
+            designs: N x V array of decision variables
+            points: N x M array of objective values
+        """
+        self.offered += len(designs)
+        for start in range(0, len(designs), self.block):
+            batch = self._prune(
+                designs[start : start + self.block], points[start : start + self.block]
+            )
+            self.designs, self.points = self._prune(
+                np.concatenate([self.designs, batch[0]]), np.concatenate([self.points, batch[1]])
+            )
@@ -0,0 +1,207 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .generative_design import (
+    CandidateContext,
+    DesignAlternative,
+    EvolutionConfig,
+    evolve_designs,
+)
+
+
+@dataclass
+class PortfolioResult:
+    """Optimized alternatives for one building of a portfolio"""
+
+    building_id: str
+    alternatives: List[DesignAlternative]
+    elapsed_ms: float
+    evaluations: int
+
+
+class SharedCandidateTables:
+    """Candidate cost/carbon/score tables placed in one shared-memory block
+
+    Worker processes attach by name and get zero-copy NumPy views, so the
+    catalog is never pickled per building.
+    """
+
+    TABLES = ("unit_cost", "unit_carbon", "material_scores")
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: Tuple[int, int], owner: bool):
+        self.shm = shm
+        self.shape = shape
+        self.owner = owner
+        size = shape[0] * shape[1]
+        buffer = np.ndarray((len(self.TABLES) * size + shape[0],), dtype=np.float64, buffer=shm.buf)
+        self.tables = {
+            name: buffer[i * size : (i + 1) * size].reshape(shape)
+            for i, name in enumerate(self.TABLES)
+        }
+        self.counts = buffer[len(self.TABLES) * size :]
+
+    @classmethod
+    def create(cls, context: CandidateContext) -> "SharedCandidateTables":
+        shape = context.unit_cost.shape
+        nbytes = (len(cls.TABLES) * shape[0] * shape[1] + shape[0]) * 8
+        shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 8))
+        shared = cls(shm, shape, owner=True)
+        for name in cls.TABLES:
+            shared.tables[name][...] = getattr(context, name)
+        shared.counts[...] = context.counts
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, shape: Tuple[int, int]) -> "SharedCandidateTables":
+        return cls(shared_memory.SharedMemory(name=name), shape, owner=False)
+
+    def close(self):
+        self.tables = {}
+        self.counts = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# Tables attached once per worker process by the pool initializer
+_worker_tables: Optional[SharedCandidateTables] = None
+
+
+def _init_worker(shm_name: str, shape: Tuple[int, int]):
+    global _worker_tables
+    _worker_tables = SharedCandidateTables.attach(shm_name, shape)
+
+
+def _optimize_building(
+    tables: SharedCandidateTables,
+    rows: List[int],
+    quantities: List[float],
+    max_budget: float,
+    max_carbon: float,
+    config: EvolutionConfig,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int, float]:
+    """Run the GA for one building on a subset of component rows"""
+    start = time.perf_counter()
+    quantity = np.asarray(quantities)[:, None]
+    result = evolve_designs(
+        tables.tables["unit_cost"][rows] * quantity,
+        tables.tables["unit_carbon"][rows] * quantity,
+        tables.tables["material_scores"][rows],
+        tables.counts[rows].astype(np.int64),
+        max_budget,
+        max_carbon,
+        config,
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return (
+        result.designs,
+        result.total_cost,
+        result.total_carbon,
+        result.scores,
+        result.evaluations,
+        elapsed_ms,
+    )
+
+
+def _optimize_building_in_worker(index: int, *task) -> Tuple:
+    return (index,) + _optimize_building(_worker_tables, *task)
+
+
+def optimize_portfolio(
+    context: CandidateContext,
+    buildings: List[Tuple[str, List[int], List[float], float, float]],
+    config: EvolutionConfig,
+    max_workers: Optional[int] = None,
+) -> Iterator[PortfolioResult]:
+    """
+    Optimize many buildings in parallel, yielding results as each finishes
+
+    Args:
+        context: candidate tables shared by every building
+        buildings: (building id, context rows, quantities, max_budget,
+            max_carbon) per building
+        config: optimizer settings; seeds are offset per building so runs stay
+            reproducible
+        max_workers: process count; 0 runs in-process, None uses every core
+    """
+
+    def seeded(index: int) -> EvolutionConfig:
+        return config if config.seed is None else replace(config, seed=config.seed + index)
+
+    def to_result(building_id, rows, designs, cost, carbon, scores, evaluations, elapsed):
+        components = [context.components[row] for row in rows]
+        alternatives = []
+        for i, design in enumerate(designs):
+            full_design = np.zeros(len(context.components), dtype=np.int64)
+            full_design[rows] = design
+            tradeoffs = context.tradeoffs(full_design)
+            alternatives.append(
+                DesignAlternative(
+                    material_selections={
+                        c: context.candidates[c][j].id for c, j in zip(components, design)
+                    },
+                    total_cost=float(cost[i]),
+                    total_carbon=float(carbon[i]),
+                    sustainability_score=float(scores[i]),
+                    tradeoffs={c: tradeoffs[c] for c in components},
+                )
+            )
+        return PortfolioResult(building_id, alternatives, elapsed, evaluations)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    # Buildings without candidate components have nothing to optimize; the
+    # others keep their input index, which offsets their seed
+    tasks = []
+    for index, building in enumerate(buildings):
+        if building[1]:
+            tasks.append((index, building))
+        else:
+            yield PortfolioResult(building[0], [], 0.0, 0)
+    if not tasks:
+        return
+
+    tables = SharedCandidateTables.create(context)
+    try:
+        if max_workers == 0:
+            for index, (building_id, rows, quantities, budget, carbon) in tasks:
+                output = _optimize_building(tables, rows, quantities, budget, carbon, seeded(index))
+                yield to_result(building_id, rows, *output)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(tables.shm.name, tables.shape),
+        ) as pool:
+            pending = {
+                pool.submit(
+                    _optimize_building_in_worker,
+                    index,
+                    rows,
+                    quantities,
+                    budget,
+                    carbon,
+                    seeded(index),
+                )
+                for index, (_, rows, quantities, budget, carbon) in tasks
+            }
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, *output = future.result()
+                        building_id, rows = buildings[index][:2]
+                        yield to_result(building_id, rows, *output)
+            finally:
+                for future in pending:
+                    future.cancel()
+    finally:
+        tables.close()
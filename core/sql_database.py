@@ -0,0 +1,1128 @@
+import csv
+import io
+import itertools
+import json
+import queue
+import sqlite3
+import time
+import uuid
+from collections.abc import Mapping, MutableMapping
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+from .integrity import (
+    DIGEST_SIZE,
+    EMPTY_LEAF,
+    InclusionProof,
+    IntegrityReport,
+    digest_many,
+    empty_root,
+    node_digest,
+)
+from .material_database import (
+    CERTIFICATION_VALUE_BITS,
+    MaterialColumnStore,
+    MaterialDatabase,
+    MaterialPassport,
+    SearchPage,
+)
+
+
+class ConnectionPool:
+    """
+    Pooled DB-API connections for a PostgreSQL or SQLite database URL
+
+    PostgreSQL uses psycopg2's ThreadedConnectionPool. SQLite keeps a queue of
+    connections to the same database; ``sqlite://`` (no path) is a private
+    in-memory database shared by the pool's connections.
+    """
+
+    def __init__(self, database_url: str, min_connections: int = 1, max_connections: int = 10):
+        url = urlparse(database_url)
+        self.dialect = "postgresql" if url.scheme.startswith("postgres") else url.scheme
+        if self.dialect == "postgresql":
+            # Imported lazily so SQLite-only deployments do not load psycopg2
+            from psycopg2.pool import ThreadedConnectionPool
+
+            self._pool = ThreadedConnectionPool(min_connections, max_connections, database_url)
+        elif self.dialect == "sqlite":
+            path = url.path[1:] if url.path.startswith("/") else url.path
+            if path in ("", ":memory:"):
+                path = f"file:materials-{uuid.uuid4().hex}?mode=memory&cache=shared"
+            else:
+                path = f"file:{path}"
+            self._sqlite_path = path
+            self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+            self._open = 0
+            self.max_connections = max_connections
+            # Keep one connection open so an in-memory database lives as long as the pool
+            self._keepalive = self._sqlite_connect()
+        else:
+            raise ValueError(f"Unsupported database URL scheme '{url.scheme}'")
+
+    @property
+    def placeholder(self) -> str:
+        return "%s" if self.dialect == "postgresql" else "?"
+
+    def _sqlite_connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._sqlite_path, uri=True, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _acquire(self):
+        if self.dialect == "postgresql":
+            return self._pool.getconn()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            if self._open < self.max_connections:
+                self._open += 1
+                return self._sqlite_connect()
+            return self._idle.get()
+
+    def _release(self, conn):
+        if self.dialect == "postgresql":
+            self._pool.putconn(conn)
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commits on success and rolls back on error"""
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    def close(self):
+        if self.dialect == "postgresql":
+            self._pool.closeall()
+            return
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+        self._keepalive.close()
+
+
+class _PassportMapping(Mapping):
+    """Read-only mapping of material id -> passport, loaded lazily from SQL
+
+    Passports are decoded on access; changes must go through
+    ``SQLMaterialDatabase.update_material`` to be persisted.
+    """
+
+    def __init__(self, database: "SQLMaterialDatabase", batch_size: int = 1000):
+        self.database = database
+        self.batch_size = batch_size
+
+    def __getitem__(self, material_id: str) -> MaterialPassport:
+        rows = self.database._query("SELECT passport FROM materials WHERE id = ?", (material_id,))
+        if not rows:
+            raise KeyError(material_id)
+        return MaterialPassport.from_record(json.loads(rows[0][0]))
+
+    def __contains__(self, material_id: object) -> bool:
+        return bool(self.database._query("SELECT 1 FROM materials WHERE id = ?", (material_id,)))
+
+    def __len__(self) -> int:
+        return self.database._query("SELECT COUNT(*) FROM materials")[0][0]
+
+    def __iter__(self) -> Iterator[str]:
+        for _, material_id, _ in self._scan(with_passport=False):
+            yield material_id
+
+    def values(self) -> Iterator[MaterialPassport]:
+        for _, _, passport in self._scan():
+            yield MaterialPassport.from_record(json.loads(passport))
+
+    def items(self) -> Iterator[Tuple[str, MaterialPassport]]:
+        for _, material_id, passport in self._scan():
+            yield material_id, MaterialPassport.from_record(json.loads(passport))
+
+    def _scan(self, with_passport: bool = True) -> Iterator[Tuple]:
+        """Walk the table in insertion order, one keyset batch at a time"""
+        column = "passport" if with_passport else "NULL"
+        last = 0
+        while True:
+            rows = self.database._query(
+                f"SELECT row_id, id, {column} FROM materials WHERE row_id > ? "
+                "ORDER BY row_id LIMIT ?",
+                (last, self.batch_size),
+            )
+            yield from rows
+            if len(rows) < self.batch_size:
+                return
+            last = rows[-1][0]
+
+
+class _SupplierMapping(MutableMapping):
+    """Mapping of supplier id -> supplier record stored as JSON
+
+    ``materials_count`` is counted from the materials table on read, so it is
+    current however many workers register materials.
+    """
+
+    def __init__(self, database: "SQLMaterialDatabase"):
+        self.database = database
+
+    def __getitem__(self, supplier_id: str) -> Dict:
+        rows = self.database._query("SELECT data FROM suppliers WHERE id = ?", (supplier_id,))
+        if not rows:
+            raise KeyError(supplier_id)
+        record = json.loads(rows[0][0])
+        record["materials_count"] = self.database._query(
+            "SELECT COUNT(*) FROM materials WHERE supplier_id = ?", (supplier_id,)
+        )[0][0]
+        return record
+
+    def __setitem__(self, supplier_id: str, record: Dict):
+        self.database._execute(
+            "INSERT INTO suppliers (id, data) VALUES (?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET data = excluded.data",
+            (supplier_id, json.dumps(record, default=str)),
+        )
+
+    def __delitem__(self, supplier_id: str):
+        if supplier_id not in self:
+            raise KeyError(supplier_id)
+        self.database._execute("DELETE FROM suppliers WHERE id = ?", (supplier_id,))
+
+    def __contains__(self, supplier_id: object) -> bool:
+        return bool(self.database._query("SELECT 1 FROM suppliers WHERE id = ?", (supplier_id,)))
+
+    def __len__(self) -> int:
+        return self.database._query("SELECT COUNT(*) FROM suppliers")[0][0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([row[0] for row in self.database._query("SELECT id FROM suppliers")])
+
+
+class SQLMaterialDatabase(MaterialDatabase):
+    """
+    ``MaterialDatabase`` persisted in PostgreSQL (or SQLite for local use)
+
+    The filterable attributes live in indexed columns next to the full
+    passport as JSON, so searches, sorting and keyset pagination run in SQL
+    and every API or Celery worker shares one catalog. ``row_id`` preserves
+    insertion order and breaks sort ties, matching the in-memory backend.
+
+    The Merkle tree over passport hashes is kept in ``merkle_nodes``, one row
+    per (level, position), and updated in the transaction that changes a
+    passport. A material's leaf is at ``row_id - 1``; row ids are never
+    reused, so the root matches an in-memory catalog with the same history.
+
+    Score weights are stored with the catalog. Every write scores passports
+    under the stored weights, read after locking out other writers, so a
+    rescore in one worker applies to registrations in every other.
+    """
+
+    # Filterable / sortable columns, mirroring MaterialColumnStore
+    # SQLite caps bound parameters per statement
+    MAX_VARIABLES = 900
+    # catalog_meta key holding the number of Merkle leaf positions in use
+    MERKLE_SIZE = "merkle_size"
+
+    SQL_COLUMNS = {
+        "score": "score",
+        "embodied_carbon": "embodied_carbon",
+        "cost": "cost",
+        "recycled_content": "recycled_content",
+    }
+    INSERT_COLUMNS = (
+        "id",
+        "name",
+        "category",
+        "supplier_id",
+        "embodied_carbon",
+        "recycled_content",
+        "cost",
+        "cert_mask",
+        "cert_count",
+        "score",
+        "passport",
+    )
+    # Column-store columns exported to snapshots as stored
+    SNAPSHOT_COLUMNS = (
+        "embodied_carbon",
+        "recycled_content",
+        "cost",
+        "cert_mask",
+        "cert_count",
+        "score",
+    )
+    INDEXED_COLUMNS = (
+        "category",
+        "supplier_id",
+        "embodied_carbon",
+        "recycled_content",
+        "cost",
+        "score",
+    )
+
+    def __init__(
+        self,
+        database_url: str,
+        score_weights: Optional[Dict[str, float]] = None,
+        min_connections: int = 1,
+        max_connections: int = 10,
+    ):
+        super().__init__(score_weights)
+        self.pool = ConnectionPool(database_url, min_connections, max_connections)
+        self._create_schema()
+        self.materials = _PassportMapping(self)
+        self.suppliers = _SupplierMapping(self)
+        # Searches run in SQL; there is no in-process column store
+        self.columns = None
+
+    def _create_schema(self):
+        row_id = (
+            "BIGSERIAL PRIMARY KEY"
+            if self.pool.dialect == "postgresql"
+            else "INTEGER PRIMARY KEY AUTOINCREMENT"
+        )
+        statements = [
+            f"""CREATE TABLE IF NOT EXISTS materials (
+                row_id {row_id},
+                id TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL,
+                category TEXT NOT NULL,
+                supplier_id TEXT NOT NULL,
+                embodied_carbon DOUBLE PRECISION NOT NULL,
+                recycled_content DOUBLE PRECISION NOT NULL,
+                cost DOUBLE PRECISION NOT NULL,
+                cert_mask BIGINT NOT NULL,
+                cert_count INTEGER NOT NULL,
+                score DOUBLE PRECISION NOT NULL,
+                passport TEXT NOT NULL
+            )""",
+            "CREATE TABLE IF NOT EXISTS suppliers (id TEXT PRIMARY KEY, data TEXT NOT NULL)",
+            # Only nodes ever set are stored; a missing node is an empty subtree
+            """CREATE TABLE IF NOT EXISTS merkle_nodes (
+                level INTEGER NOT NULL,
+                position BIGINT NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (level, position)
+            )""",
+            "CREATE TABLE IF NOT EXISTS catalog_meta (key TEXT PRIMARY KEY, value BIGINT NOT NULL)",
+            # Sustainability score weights the stored scores were computed with
+            """CREATE TABLE IF NOT EXISTS score_weights (
+                name TEXT PRIMARY KEY,
+                value DOUBLE PRECISION NOT NULL
+            )""",
+        ]
+        statements += [
+            f"CREATE INDEX IF NOT EXISTS idx_materials_{column} ON materials ({column})"
+            for column in self.INDEXED_COLUMNS
+        ]
+        # Lower-carbon alternatives within a category, for the swap planner
+        statements.append(
+            "CREATE INDEX IF NOT EXISTS idx_materials_category_carbon "
+            "ON materials (category, embodied_carbon)"
+        )
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(
+                self._sql("SELECT 1 FROM catalog_meta WHERE key = ?"), (self.MERKLE_SIZE,)
+            )
+            built = cursor.fetchone() is not None
+            cursor.execute(
+                self._sql(
+                    "INSERT INTO catalog_meta (key, value) VALUES (?, 0) "
+                    "ON CONFLICT (key) DO NOTHING"
+                ),
+                (self.MERKLE_SIZE,),
+            )
+            # A new catalog starts with this instance's weights; stored ones win
+            cursor.executemany(
+                self._sql(
+                    "INSERT INTO score_weights (name, value) VALUES (?, ?) "
+                    "ON CONFLICT (name) DO NOTHING"
+                ),
+                list(self.score_weights.items()),
+            )
+            self._load_score_weights(cursor)
+        if not built:
+            # Catalogs stored before the tree existed get it built once
+            self._build_merkle()
+
+    def _sql(self, query: str) -> str:
+        return query.replace("?", self.pool.placeholder)
+
+    def _query(self, query: str, params: Tuple = ()) -> List[Tuple]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self._sql(query), params)
+            return cursor.fetchall()
+
+    def _execute(self, query: str, params: Tuple = ()):
+        with self.pool.connection() as conn:
+            conn.cursor().execute(self._sql(query), params)
+
+    def _cursor_execute(self, cursor, query: str, params: Tuple = ()):
+        cursor.execute(self._sql(query), params)
+
+    def _lock_writers(self, cursor):
+        """Serialize writers for the rest of the caller's transaction"""
+        self._cursor_execute(
+            cursor,
+            "UPDATE catalog_meta SET value = value WHERE key = ?",
+            (self.MERKLE_SIZE,),
+        )
+
+    def _load_score_weights(self, cursor):
+        """Adopt the catalog's stored score weights"""
+        self._cursor_execute(cursor, "SELECT name, value FROM score_weights")
+        self.score_weights = {**self.DEFAULT_SCORE_WEIGHTS, **dict(cursor.fetchall())}
+
+    @staticmethod
+    def _digest(passport: MaterialPassport) -> bytes:
+        """Merkle leaf of a passport, as kept in the in-memory column store"""
+        return bytes.fromhex(passport.blockchain_hash or passport.calculate_blockchain_hash())
+
+    def _row(self, passport: MaterialPassport) -> Tuple:
+        """Column values for one passport, in ``INSERT_COLUMNS`` order, scoring it afresh"""
+        passport.sustainability_score = self._compute_sustainability_score(passport)
+        lca = passport.lca_results
+        return (
+            passport.id,
+            passport.name,
+            passport.category,
+            passport.supplier_id,
+            lca.get("embodied_carbon", float("inf")),
+            lca.get("recycled_content", 0),
+            passport.cost_per_unit,
+            MaterialColumnStore.certification_mask(passport.certifications),
+            len(passport.certifications),
+            passport.sustainability_score,
+            json.dumps(passport.to_record(), default=str),
+        )
+
+    def _store_passports(
+        self, passports: List[MaterialPassport], row_ids: Optional[List[int]] = None
+    ):
+        """Bulk insert: COPY on PostgreSQL, executemany on SQLite
+
+        ``row_ids`` places the passports at given rows (and so Merkle leaves),
+        e.g. when importing a snapshot; new row ids are assigned by default.
+        """
+        names = self.INSERT_COLUMNS
+        if row_ids is not None:
+            names = ("row_id",) + names
+        columns = ", ".join(names)
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            self._lock_writers(cursor)
+            self._load_score_weights(cursor)
+            rows = [self._row(passport) for passport in passports]
+            if row_ids is not None:
+                rows = [(row_id,) + row for row_id, row in zip(row_ids, rows)]
+            if self.pool.dialect == "postgresql":
+                buffer = io.StringIO()
+                # Quote every string so empty text is not read back as NULL
+                csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(rows)
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY materials ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            else:
+                placeholders = ", ".join("?" * len(names))
+                cursor.executemany(
+                    f"INSERT INTO materials ({columns}) VALUES ({placeholders})", rows
+                )
+
+            digests = {passport.id: self._digest(passport) for passport in passports}
+            leaves = {}
+            ids = list(digests)
+            for start in range(0, len(ids), self.MAX_VARIABLES):
+                chunk = ids[start : start + self.MAX_VARIABLES]
+                self._cursor_execute(
+                    cursor,
+                    f"SELECT id, row_id FROM materials WHERE id IN ({', '.join('?' * len(chunk))})",
+                    tuple(chunk),
+                )
+                for material_id, row_id in cursor.fetchall():
+                    leaves[row_id - 1] = digests[material_id]
+            self._set_leaves(cursor, leaves)
+
+    def update_material(self, material_id: str, **changes) -> MaterialPassport:
+        """Update passport fields, rescoring and rewriting the stored row"""
+        passport = self.materials[material_id]
+        for name, value in changes.items():
+            if not hasattr(passport, name):
+                raise AttributeError(f"MaterialPassport has no field '{name}'")
+            setattr(passport, name, value)
+        passport.last_updated = datetime.now()
+        passport.blockchain_hash = passport.calculate_blockchain_hash()
+
+        assignments = ", ".join(f"{column} = ?" for column in self.INSERT_COLUMNS[1:])
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            self._lock_writers(cursor)
+            self._load_score_weights(cursor)
+            values = self._row(passport)
+            self._cursor_execute(
+                cursor,
+                f"UPDATE materials SET {assignments} WHERE id = ?",
+                values[1:] + (material_id,),
+            )
+            self._cursor_execute(
+                cursor, "SELECT row_id FROM materials WHERE id = ?", (material_id,)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                raise KeyError(material_id)
+            self._set_leaves(cursor, {row[0] - 1: self._digest(passport)})
+        return passport
+
+    def rescore_materials(
+        self,
+        score_weights: Optional[Dict[str, float]] = None,
+        chunk_size: int = 10000,
+        progress=None,
+    ) -> int:
+        """Recompute every stored sustainability score, one chunk per transaction
+
+        New weights are stored before the first chunk, so every worker scores
+        registrations with them from then on; rows written earlier are all
+        reached by the scan, which runs until no row is left.
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            self._lock_writers(cursor)
+            if score_weights is not None:
+                weights = {**self.DEFAULT_SCORE_WEIGHTS, **score_weights}
+                cursor.execute("DELETE FROM score_weights")
+                cursor.executemany(
+                    self._sql("INSERT INTO score_weights (name, value) VALUES (?, ?)"),
+                    list(weights.items()),
+                )
+            self._load_score_weights(cursor)
+
+        total = len(self.materials)
+        rescored = 0
+        last = 0
+        while True:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                # Read under the lock too, so no concurrent update is overwritten
+                self._lock_writers(cursor)
+                self._cursor_execute(
+                    cursor,
+                    "SELECT row_id, passport FROM materials WHERE row_id > ? "
+                    "ORDER BY row_id LIMIT ?",
+                    (last, chunk_size),
+                )
+                rows = cursor.fetchall()
+                updates = []
+                for row_id, data in rows:
+                    record = json.loads(data)
+                    passport = MaterialPassport.from_record(record)
+                    record["sustainability_score"] = self._compute_sustainability_score(passport)
+                    updates.append(
+                        (record["sustainability_score"], json.dumps(record, default=str), row_id)
+                    )
+                cursor.executemany(
+                    self._sql("UPDATE materials SET score = ?, passport = ? WHERE row_id = ?"),
+                    updates,
+                )
+            if not rows:
+                break
+            rescored += len(rows)
+            last = rows[-1][0]
+            if progress is not None:
+                progress(rescored, total)
+
+        return rescored
+
+    def remove_material(self, material_id: str) -> MaterialPassport:
+        """Delete a material from the catalog"""
+        passport = self.materials[material_id]
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            self._cursor_execute(
+                cursor, "SELECT row_id FROM materials WHERE id = ?", (material_id,)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                raise KeyError(material_id)
+            self._cursor_execute(cursor, "DELETE FROM materials WHERE id = ?", (material_id,))
+            self._set_leaves(cursor, {row[0] - 1: EMPTY_LEAF})
+        return passport
+
+    def get_dashboard_summary(self) -> Dict:
+        """Dashboard aggregates computed in SQL, consistent across workers"""
+        savings = "SUM(CASE WHEN embodied_carbon < ? THEN ? - embodied_carbon ELSE 0 END)"
+        baseline = (self.INDUSTRY_AVERAGE_CARBON, self.INDUSTRY_AVERAGE_CARBON)
+
+        def aggregate(count, carbon_sum, savings_sum) -> Dict:
+            return {
+                "count": count,
+                "average_carbon": carbon_sum / count if count else 0,
+                "carbon_savings_potential": savings_sum or 0.0,
+            }
+
+        totals = aggregate(
+            *self._query(
+                f"SELECT COUNT(*), SUM(embodied_carbon), {savings} FROM materials", baseline
+            )[0]
+        )
+        categories = self._query(
+            f"SELECT category, COUNT(*), SUM(embodied_carbon), {savings} "
+            "FROM materials GROUP BY category",
+            baseline,
+        )
+        top = self._fetch(
+            "SELECT passport FROM materials ORDER BY score DESC, row_id LIMIT ?",
+            [self.DASHBOARD_TOP_K],
+        )
+        return {
+            "total_materials": totals["count"],
+            "average_carbon": totals["average_carbon"],
+            "carbon_savings_potential": totals["carbon_savings_potential"],
+            "categories": {row[0]: aggregate(*row[1:]) for row in categories},
+            "top_performing_materials": [
+                {
+                    "id": mat.id,
+                    "name": mat.name,
+                    "carbon": mat.lca_results.get("embodied_carbon", 0),
+                    "score": self._calculate_sustainability_score(mat),
+                }
+                for mat in top
+            ],
+        }
+
+    def _where(self, filters: Dict) -> Optional[Tuple[str, List]]:
+        """Translate search filters to a WHERE clause, or None if nothing can match"""
+        clauses, params = [], []
+        if "category" in filters:
+            clauses.append("category = ?")
+            params.append(filters["category"])
+        if "supplier_id" in filters:
+            clauses.append("supplier_id = ?")
+            params.append(filters["supplier_id"])
+        if "max_carbon" in filters:
+            clauses.append("embodied_carbon <= ?")
+            params.append(filters["max_carbon"])
+        if "min_recycled" in filters:
+            clauses.append("recycled_content >= ?")
+            params.append(filters["min_recycled"])
+        if filters.get("certifications"):
+            required = 0
+            for cert_str in filters["certifications"]:
+                if cert_str not in CERTIFICATION_VALUE_BITS:
+                    return None
+                required |= CERTIFICATION_VALUE_BITS[cert_str]
+            clauses.append("(cert_mask & ?) = ?")
+            params += [required, required]
+        if "cost_range" in filters:
+            clauses.append("cost BETWEEN ? AND ?")
+            params += list(filters["cost_range"])
+
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _fetch(self, query: str, params: List) -> List[MaterialPassport]:
+        rows = self._query(query, tuple(params))
+        return [MaterialPassport.from_record(json.loads(row[0])) for row in rows]
+
+    def search_materials(
+        self,
+        filters: Dict,
+        sort_by: Optional[str] = None,
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List[MaterialPassport]:
+        """Search materials with filtering pushed into SQL"""
+        if sort_by is None:
+            if cursor is not None:
+                raise ValueError("A search cursor requires sort_by")
+            where = self._where(filters)
+            if where is None:
+                return []
+            clause, params = where
+            query = f"SELECT passport FROM materials{clause} ORDER BY score, row_id"
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            return self._fetch(query, params)
+
+        return self.search_page(filters, sort_by, order, limit, cursor).results
+
+    def search_page(
+        self,
+        filters: Dict,
+        sort_by: str = "sustainability",
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> SearchPage:
+        """Sorted, keyset-paginated search executed as one indexed SQL query"""
+        if sort_by not in self.SORT_KEYS:
+            raise ValueError(f"Unknown sort_by '{sort_by}'")
+        column, default_order = self.SORT_KEYS[sort_by]
+        column = self.SQL_COLUMNS[column]
+        order = order or default_order
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unknown order '{order}'")
+
+        where = self._where(filters)
+        if where is None:
+            return SearchPage(results=[])
+        clause, params = where
+
+        # Cursor keys are signed like the in-memory backend: negated for desc
+        sign = -1.0 if order == "desc" else 1.0
+        if cursor is not None:
+            last_key, last_row = self._decode_cursor(cursor, sort_by, order)
+            comparison = "<" if order == "desc" else ">"
+            clause += (" AND " if clause else " WHERE ") + (
+                f"({column} {comparison} ? OR ({column} = ? AND row_id > ?))"
+            )
+            params += [sign * last_key, sign * last_key, last_row]
+
+        query = (
+            f"SELECT passport, {column}, row_id FROM materials{clause} "
+            f"ORDER BY {column} {order.upper()}, row_id"
+        )
+        if limit is not None:
+            # One extra row tells whether another page exists
+            query += " LIMIT ?"
+            params.append(limit + 1)
+
+        rows = self._query(query, tuple(params))
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            _, key, row_id = rows[-1]
+            next_cursor = self._encode_cursor(sign * key, row_id, sort_by, order)
+
+        return SearchPage(
+            results=[MaterialPassport.from_record(json.loads(row[0])) for row in rows],
+            next_cursor=next_cursor,
+        )
+
+    def get_supplier_analytics(self, supplier_id: str) -> Dict:
+        """Get analytics for a specific supplier, aggregated in SQL"""
+        count, avg_carbon, avg_cost, cert_count = self._query(
+            "SELECT COUNT(*), AVG(embodied_carbon), AVG(cost), SUM(cert_count) "
+            "FROM materials WHERE supplier_id = ?",
+            (supplier_id,),
+        )[0]
+        if not count:
+            return {}
+
+        categories = self._query(
+            "SELECT DISTINCT category FROM materials WHERE supplier_id = ?", (supplier_id,)
+        )
+        return {
+            "material_count": count,
+            "average_carbon": avg_carbon,
+            "average_cost": avg_cost,
+            "categories": [row[0] for row in categories],
+            "certification_count": int(cert_count),
+        }
+
+    def get_supplier_leaderboard(
+        self,
+        sort_by: str = "average_carbon",
+        order: Optional[str] = None,
+        limit: Optional[int] = 50,
+        min_materials: int = 1,
+    ) -> List[Dict]:
+        """Rank suppliers with one GROUP BY over the supplier_id index"""
+        if sort_by not in self.SUPPLIER_SORT_KEYS:
+            raise ValueError(f"Unknown sort_by '{sort_by}'")
+        order = order or self.SUPPLIER_SORT_KEYS[sort_by]
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unknown order '{order}'")
+
+        query = (
+            "SELECT supplier_id, COUNT(*) AS material_count, "
+            "AVG(embodied_carbon) AS average_carbon, AVG(cost) AS average_cost, "
+            "SUM(cert_count) AS certification_count "
+            "FROM materials GROUP BY supplier_id HAVING COUNT(*) >= ? "
+            f"ORDER BY {sort_by} {order.upper()}, supplier_id"
+        )
+        params: Tuple = (max(min_materials, 1),)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        rows = self._query(query, params)
+        if not rows:
+            return []
+
+        supplier_ids = [row[0] for row in rows]
+        categories: Dict[str, List[str]] = {supplier_id: [] for supplier_id in supplier_ids}
+        placeholders = ", ".join("?" * len(supplier_ids))
+        for supplier_id, category in self._query(
+            "SELECT supplier_id, category FROM materials "
+            f"WHERE supplier_id IN ({placeholders}) "
+            "GROUP BY supplier_id, category ORDER BY MIN(row_id)",
+            tuple(supplier_ids),
+        ):
+            categories[supplier_id].append(category)
+
+        return self._leaderboard(
+            [
+                {
+                    "supplier_id": supplier_id,
+                    "material_count": count,
+                    "average_carbon": avg_carbon,
+                    "average_cost": avg_cost,
+                    "categories": categories[supplier_id],
+                    "certification_count": int(cert_count),
+                }
+                for supplier_id, count, avg_carbon, avg_cost, cert_count in rows
+            ]
+        )
+
+    def lower_carbon_alternatives(
+        self, category: str, below_carbon: float
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Cost-efficient lower-carbon alternatives, filtered with a window function"""
+        rows = self._query(
+            "SELECT id, cost, embodied_carbon FROM ("
+            "SELECT id, cost, embodied_carbon, row_id, MIN(cost) OVER ("
+            "ORDER BY embodied_carbon, row_id ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING"
+            ") AS cheapest_below FROM materials WHERE category = ? AND embodied_carbon < ?"
+            ") AS ranked WHERE cheapest_below IS NULL OR cost < cheapest_below "
+            "ORDER BY embodied_carbon, row_id",
+            (category, below_carbon),
+        )
+        return (
+            [row[0] for row in rows],
+            np.array([row[1] for row in rows], dtype=np.float64),
+            np.array([row[2] for row in rows], dtype=np.float64),
+        )
+
+    @staticmethod
+    def _height(size: int) -> int:
+        """Levels above the leaves of a tree over ``size`` leaf positions"""
+        return max(0, size - 1).bit_length()
+
+    def _nodes(self, cursor, level: int, positions: List[int]) -> Dict[int, bytes]:
+        """Stored nodes among ``positions`` of one level"""
+        nodes = {}
+        for start in range(0, len(positions), self.MAX_VARIABLES):
+            chunk = positions[start : start + self.MAX_VARIABLES]
+            self._cursor_execute(
+                cursor,
+                "SELECT position, digest FROM merkle_nodes "
+                f"WHERE level = ? AND position IN ({', '.join('?' * len(chunk))})",
+                (level, *chunk),
+            )
+            nodes.update((position, bytes.fromhex(digest)) for position, digest in cursor)
+        return nodes
+
+    def _write_nodes(self, cursor, level: int, nodes: Dict[int, bytes]):
+        cursor.executemany(
+            self._sql(
+                "INSERT INTO merkle_nodes (level, position, digest) VALUES (?, ?, ?) "
+                "ON CONFLICT (level, position) DO UPDATE SET digest = excluded.digest"
+            ),
+            [(level, position, digest.hex()) for position, digest in nodes.items()],
+        )
+
+    def _set_leaves(self, cursor, leaves: Dict[int, bytes]):
+        """
+        Set Merkle leaves and rehash their ancestors, in the caller's transaction
+
+        Levels are rehashed one at a time, reading the siblings each level
+        needs in one query, so a bulk insert costs O(height) queries. Writers
+        are serialized on the ``merkle_size`` row, which they lock first.
+
+        Args:
+            leaves: Leaf position -> digest (``EMPTY_LEAF`` to clear it)
+        """
+        if not leaves:
+            return
+        self._lock_writers(cursor)
+        self._cursor_execute(
+            cursor, "SELECT value FROM catalog_meta WHERE key = ?", (self.MERKLE_SIZE,)
+        )
+        size = cursor.fetchone()[0]
+        new_size = max(size, max(leaves) + 1)
+        height, new_height = self._height(size), self._height(new_size)
+
+        if size and new_height > height:
+            # Growing: the old root gains empty right siblings up to the new height
+            root = self._nodes(cursor, height, [0]).get(0, empty_root(height))
+            for level in range(height + 1, new_height + 1):
+                root = node_digest(root, empty_root(level - 1))
+                self._write_nodes(cursor, level, {0: root})
+
+        nodes = dict(leaves)
+        for level in range(new_height):
+            self._write_nodes(cursor, level, nodes)
+            parents = sorted({position >> 1 for position in nodes})
+            siblings = [
+                child
+                for parent in parents
+                for child in (2 * parent, 2 * parent + 1)
+                if child not in nodes
+            ]
+            children = {**self._nodes(cursor, level, siblings), **nodes}
+            empty = empty_root(level)
+            nodes = {
+                parent: node_digest(
+                    children.get(2 * parent, empty), children.get(2 * parent + 1, empty)
+                )
+                for parent in parents
+            }
+        self._write_nodes(cursor, new_height, nodes)
+
+        if new_size != size:
+            self._cursor_execute(
+                cursor,
+                "UPDATE catalog_meta SET value = ? WHERE key = ?",
+                (new_size, self.MERKLE_SIZE),
+            )
+
+    def _build_merkle(self, batch_size: int = 10000):
+        """Set the leaf of every stored passport, one batch per transaction"""
+        last = 0
+        while True:
+            rows = self._query(
+                "SELECT row_id, passport FROM materials WHERE row_id > ? ORDER BY row_id LIMIT ?",
+                (last, batch_size),
+            )
+            if not rows:
+                return
+            leaves = {
+                row_id - 1: self._digest(MaterialPassport.from_record(json.loads(data)))
+                for row_id, data in rows
+            }
+            with self.pool.connection() as conn:
+                self._set_leaves(conn.cursor(), leaves)
+            last = rows[-1][0]
+
+    def merkle_root(self) -> str:
+        """Root hash over the whole catalog, read from the topmost stored node"""
+        rows = self._query(
+            "SELECT digest FROM merkle_nodes WHERE position = 0 ORDER BY level DESC LIMIT 1"
+        )
+        return rows[0][0] if rows else EMPTY_LEAF.hex()
+
+    def inclusion_proof(self, material_id: str) -> InclusionProof:
+        """Proof that a passport's current hash is part of ``merkle_root()``"""
+        rows = self._query("SELECT row_id FROM materials WHERE id = ?", (material_id,))
+        if not rows:
+            raise KeyError(material_id)
+        index = rows[0][0] - 1
+
+        size = self._query("SELECT value FROM catalog_meta WHERE key = ?", (self.MERKLE_SIZE,))[0][
+            0
+        ]
+        while True:
+            height = self._height(size)
+            wanted = [(0, index), (height, 0)]
+            wanted += [(level, (index >> level) ^ 1) for level in range(height)]
+            # One statement, so the nodes and the tree size come from one commit
+            rows = self._query(
+                "SELECT level, position, digest FROM merkle_nodes WHERE "
+                + " OR ".join("(level = ? AND position = ?)" for _ in wanted)
+                + " UNION ALL SELECT -1, value, '' FROM catalog_meta WHERE key = ?",
+                tuple(value for node in wanted for value in node) + (self.MERKLE_SIZE,),
+            )
+            nodes = {(level, position): digest for level, position, digest in rows}
+            current = next(position for (level, position) in nodes if level == -1)
+            if self._height(current) == height:
+                break
+            size = current  # The tree grew meanwhile; read it again
+
+        def node(level: int, position: int) -> str:
+            return nodes.get((level, position)) or empty_root(level).hex()
+
+        return InclusionProof(
+            index=index,
+            leaf=node(0, index),
+            siblings=[node(level, (index >> level) ^ 1) for level in range(height)],
+            root=node(height, 0),
+        )
+
+    def verify_integrity(
+        self, max_workers: Optional[int] = None, chunk_size: int = 4096, batch_size: int = 100_000
+    ) -> IntegrityReport:
+        """Rehash stored passports, a batch at a time, against their stored hashes"""
+
+        def stored_digest(passport: MaterialPassport) -> bytes:
+            try:
+                digest = bytes.fromhex(passport.blockchain_hash)
+            except ValueError:
+                return EMPTY_LEAF
+            return digest if len(digest) == DIGEST_SIZE else EMPTY_LEAF
+
+        start = time.perf_counter()
+        checked, mismatched = 0, []
+        passports = iter(self.materials.values())
+        while True:
+            batch = list(itertools.islice(passports, batch_size))
+            if not batch:
+                break
+            digests = digest_many(batch, MaterialPassport.canonical_bytes, max_workers, chunk_size)
+            stored = np.frombuffer(b"".join(map(stored_digest, batch)), dtype=np.uint8)
+            bad = np.flatnonzero((digests != stored.reshape(-1, DIGEST_SIZE)).any(axis=1))
+            mismatched += [batch[i].id for i in bad.tolist()]
+            checked += len(batch)
+
+        return IntegrityReport(
+            checked=checked,
+            mismatched=mismatched,
+            root=self.merkle_root(),
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def save_snapshot(self, path: str, batch_size: int = 10000):
+        """
+        Export the catalog in the ``MaterialDatabase`` snapshot format
+
+        Rows are read in row_id order, a keyset batch at a time, and passports
+        streamed into the blob; only the numeric columns are held in memory.
+        Each material keeps its leaf position, so the snapshot has this
+        catalog's Merkle root whichever backend opens it.
+
+        Args:
+            path: Snapshot directory, created if missing
+            batch_size: Rows read per query
+        """
+        with self.pool.connection() as conn:
+            self._load_score_weights(conn.cursor())
+        directory = self._begin_snapshot(path)
+        ids: List[str] = []
+        values: Dict[str, List] = {name: [] for name in MaterialColumnStore.COLUMNS}
+        category_codes: Dict[str, int] = {}
+        supplier_codes: Dict[str, int] = {}
+
+        def records() -> Iterator[bytes]:
+            last = 0
+            while True:
+                rows = self._query(
+                    f"SELECT row_id, category, supplier_id, {', '.join(self.SNAPSHOT_COLUMNS)}, "
+                    "passport FROM materials WHERE row_id > ? ORDER BY row_id LIMIT ?",
+                    (last, batch_size),
+                )
+                for row_id, category, supplier_id, *numbers, data in rows:
+                    passport = MaterialPassport.from_record(json.loads(data))
+                    ids.append(passport.id)
+                    values["leaf"].append(row_id - 1)
+                    values["category"].append(
+                        category_codes.setdefault(category, len(category_codes))
+                    )
+                    values["supplier"].append(
+                        supplier_codes.setdefault(supplier_id, len(supplier_codes))
+                    )
+                    for name, value in zip(self.SNAPSHOT_COLUMNS, numbers):
+                        values[name].append(value)
+                    for name, value in MaterialColumnStore.score_inputs(passport).items():
+                        values[name].append(value)
+                    values["digest"].append(self._digest(passport))
+                    yield passport.canonical_bytes()
+                if len(rows) < batch_size:
+                    return
+                last = rows[-1][0]
+
+        self._write_passport_blob(directory, records())
+
+        values["live"] = [True] * len(ids)
+        values["digest"] = b"".join(values["digest"])
+        columns = {
+            name: (
+                np.frombuffer(values[name], dtype=dtype)
+                if name == "digest"
+                else np.array(values[name], dtype=dtype)
+            )
+            for name, dtype in MaterialColumnStore.COLUMNS.items()
+        }
+        orders = {
+            name: np.argsort(columns[name], kind="stable")
+            for name in MaterialColumnStore.SORTED_INDEXES
+        }
+        leaf_count = self._query(
+            "SELECT value FROM catalog_meta WHERE key = ?", (self.MERKLE_SIZE,)
+        )[0][0]
+        self._finish_snapshot(
+            directory,
+            ids,
+            columns,
+            orders,
+            list(category_codes),
+            list(supplier_codes),
+            leaf_count,
+            {supplier_id: self.suppliers[supplier_id] for supplier_id in self.suppliers},
+        )
+
+    @classmethod
+    def load_snapshot(
+        cls, path: str, database_url: str = "sqlite://", batch_size: int = 10000
+    ) -> "SQLMaterialDatabase":
+        """
+        Import a snapshot written by either backend's ``save_snapshot``
+
+        Passports are inserted a batch per transaction at the row ids of their
+        leaf positions, so the imported catalog has the snapshot's Merkle root
+        and new materials are added after every position the snapshot used.
+
+        Args:
+            path: Snapshot directory
+            database_url: Database to import into; it must hold no materials
+            batch_size: Passports inserted per transaction
+        """
+        snapshot = MaterialDatabase.load_snapshot(path)
+        database = cls(database_url, snapshot.score_weights)
+        if len(database.materials):
+            database.close()
+            raise ValueError("Cannot import a snapshot into a catalog that holds materials")
+
+        for supplier_id, record in snapshot.suppliers.items():
+            database.suppliers[supplier_id] = record
+        rows = snapshot.columns.live_rows()
+        leaves = snapshot.columns.column("leaf")
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            database._store_passports(
+                [snapshot.materials.passport_at(row, cache=False) for row in batch.tolist()],
+                (leaves[batch] + 1).tolist(),
+            )
+        database._reserve_leaves(snapshot.columns.leaf_count)
+        return database
+
+    def _reserve_leaves(self, count: int):
+        """Extend the tree to ``count`` leaf positions and start new row ids after them"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            self._cursor_execute(
+                cursor, "SELECT value FROM catalog_meta WHERE key = ?", (self.MERKLE_SIZE,)
+            )
+            if cursor.fetchone()[0] < count:
+                self._set_leaves(cursor, {count - 1: EMPTY_LEAF})
+            if not count:
+                return
+            if self.pool.dialect == "postgresql":
+                cursor.execute(
+                    "SELECT setval(pg_get_serial_sequence('materials', 'row_id'), "
+                    "GREATEST(%s, (SELECT COALESCE(MAX(row_id), 0) FROM materials)))",
+                    (count,),
+                )
+            else:
+                cursor.execute(
+                    "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'materials'",
+                    (count,),
+                )
+                if not cursor.rowcount:
+                    cursor.execute(
+                        "INSERT INTO sqlite_sequence (name, seq) VALUES ('materials', ?)",
+                        (count,),
+                    )
+
+    def close(self):
+        self.pool.close()
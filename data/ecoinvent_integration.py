@@ -0,0 +1,436 @@
+import argparse
+import csv
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.lca_cache import LRUTTLCache
+from core.lca_engine import LCAMethod
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS impact_factors (
+    ingredient TEXT NOT NULL,
+    indicator TEXT NOT NULL,
+    value REAL NOT NULL,
+    unit TEXT,
+    source TEXT,
+    PRIMARY KEY (ingredient, indicator)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Impact category names -> indicator keys used by the LCA engine. A category maps
+# when its lower case name starts with the words, e.g. "acidification potential -
+# average European" or "climate change GWP 100a"
+INDICATOR_ALIASES = (
+    ("climate change", "GWP"),
+    ("global warming", "GWP"),
+    ("gwp", "GWP"),
+    ("acidification", "AP"),
+    ("eutrophication", "EP"),
+    ("water", "water"),
+    ("cumulative energy demand", "energy"),
+    ("energy", "energy"),
+)
+
+# LCIA method names in exports (lower case substrings) -> LCAMethod values
+METHOD_ALIASES = (
+    ("cml", LCAMethod.CML.value),
+    ("traci", LCAMethod.TRACI.value),
+    ("impact world", LCAMethod.IMPACT_WORLD.value),
+    ("impact 2002", LCAMethod.IMPACT_WORLD.value),
+)
+
+# Column names accepted for the ingredient / indicator / value / unit of CSV rows
+CSV_COLUMNS = {
+    "ingredient": ("ingredient", "material", "activity name", "activity_name", "process", "name"),
+    "indicator": ("indicator", "impact category", "impact_category", "category"),
+    "value": ("value", "amount", "score"),
+    "unit": ("unit", "indicator unit"),
+    "method": ("method", "impact method", "lcia method", "method name"),
+}
+
+# SQLite caps bound parameters per statement
+_MAX_VARIABLES = 900
+
+
+def normalize_ingredient(name: str) -> str:
+    """Lookup key of an ingredient / process name: lower case, single spaces"""
+    return " ".join(str(name).lower().split())
+
+
+# Non-100-year warming potentials keep their own names instead of becoming "GWP"
+_OTHER_HORIZON = re.compile(r"\b(20|500)\s*a\b|gwp\s*(20|500)\b")
+
+# Sub-categories (e.g. "eutrophication: freshwater", "climate change - fossil") and
+# toxicity categories (e.g. "freshwater aquatic ecotoxicity") keep their own names
+_SUBCATEGORY = re.compile(
+    r"\b(freshwater|marine|terrestrial|aquatic|fossil|biogenic|land use|nuclear|biomass"
+    r"|wind|solar|hydro|geothermal)\b"
+)
+_TOXICITY = re.compile(r"toxic")
+
+_INDICATOR_PATTERNS = tuple(
+    (re.compile(rf"{re.escape(keyword)}\b"), indicator) for keyword, indicator in INDICATOR_ALIASES
+)
+
+
+def normalize_method(name: Optional[str]) -> Optional[str]:
+    """LCAMethod value of an LCIA method name, or None if it is not a known method"""
+    lowered = str(name or "").lower()
+    return next((method for keyword, method in METHOD_ALIASES if keyword in lowered), None)
+
+
+def normalize_indicator(name: str) -> str:
+    """Engine indicator key (e.g. "GWP", or "TRACI:EP") for an impact category name"""
+    method, separator, indicator = str(name).partition(":")
+    if separator and method.strip() in {m.value for m in LCAMethod}:
+        return f"{method.strip()}:{normalize_indicator(indicator)}"
+    lowered = str(name).strip().lower()
+    if _OTHER_HORIZON.search(lowered) or _TOXICITY.search(lowered):
+        return str(name).strip()
+    for pattern, indicator in _INDICATOR_PATTERNS:
+        match = pattern.match(lowered)
+        if match:
+            if _SUBCATEGORY.search(lowered, match.end()):
+                break
+            return indicator
+    return str(name).strip()
+
+
+class EcoinventDatabase(Mapping):
+    """
+    Read-only mapping of ingredient -> {indicator: value}, backed by SQLite
+
+    Factors live in a ``WITHOUT ROWID`` table whose primary key is
+    (ingredient, indicator), read through a memory-mapped connection, so
+    opening the database loads nothing and a lookup is one index probe.
+    Looked-up ingredients are kept in an LRU cache; ``get_many`` fetches all
+    misses of a batch in one query. Ingredients missing from the database
+    fall back to ``fallback`` (e.g. built-in defaults).
+    """
+
+    def __init__(
+        self,
+        path,
+        cache_size: int = 16384,
+        fallback: Optional[Dict[str, Dict[str, float]]] = None,
+        mmap_size: int = 256 * 1024 * 1024,
+    ):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Impact factor database {self.path} does not exist")
+        self.fallback = fallback or {}
+        self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._lock = threading.Lock()
+        self.cache = LRUTTLCache(maxsize=cache_size, ttl=None)
+
+        metadata = dict(self._conn.execute("SELECT key, value FROM metadata"))
+        self.ingredient_count = int(metadata.get("ingredients", 0))
+        self.factor_count = int(metadata.get("factors", 0))
+        digest = hashlib.sha256(
+            f"{metadata.get('version', '')}:{sorted(self.fallback.items())}".encode()
+        )
+        # Content digest of the factors, used to key cached LCA results
+        self.version = digest.hexdigest()
+        # Fallback ingredients the database does not shadow, for len()
+        self._fallback_only = len(self.fallback) - len(
+            self._query([normalize_ingredient(i) for i in self.fallback])
+        )
+
+    def close(self):
+        self._conn.close()
+
+    def _query(self, ingredients: List[str]) -> Dict[str, Dict[str, float]]:
+        found: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for start in range(0, len(ingredients), _MAX_VARIABLES):
+                chunk = ingredients[start : start + _MAX_VARIABLES]
+                rows = self._conn.execute(
+                    "SELECT ingredient, indicator, value FROM impact_factors "
+                    f"WHERE ingredient IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for ingredient, indicator, value in rows:
+                    found.setdefault(ingredient, {})[indicator] = value
+        return found
+
+    def get_many(self, ingredients: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """Factors of every known ingredient among ``ingredients``, misses in one query"""
+        result: Dict[str, Dict[str, float]] = {}
+        missing = []
+        for ingredient in dict.fromkeys(ingredients):
+            factors = self.cache.get(ingredient)
+            if factors is None:
+                missing.append(ingredient)
+            elif factors:
+                result[ingredient] = factors
+        if missing:
+            found = self._query([normalize_ingredient(i) for i in missing])
+            for ingredient in missing:
+                factors = found.get(normalize_ingredient(ingredient)) or self.fallback.get(
+                    ingredient, {}
+                )
+                # Unknown ingredients are cached as {} so repeated misses skip SQLite
+                self.cache.put(ingredient, factors)
+                if factors:
+                    result[ingredient] = factors
+        return result
+
+    def __getitem__(self, ingredient: str) -> Dict[str, float]:
+        factors = self.get_many([ingredient]).get(ingredient)
+        if factors is None:
+            raise KeyError(ingredient)
+        return factors
+
+    def __contains__(self, ingredient) -> bool:
+        return ingredient in self.get_many([ingredient])
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            ingredients = [
+                row[0]
+                for row in self._conn.execute("SELECT DISTINCT ingredient FROM impact_factors")
+            ]
+        yield from ingredients
+        known = set(ingredients)
+        yield from (i for i in self.fallback if normalize_ingredient(i) not in known)
+
+    def __len__(self) -> int:
+        return self.ingredient_count + self._fallback_only
+
+    def matrix(self, ingredients: List[str], indicators: Tuple[str, ...]) -> np.ndarray:
+        """ingredients x indicators array of factors; unknown entries are 0"""
+        factors = self.get_many(ingredients)
+        table = np.zeros((len(ingredients), len(indicators)))
+        for row, ingredient in enumerate(ingredients):
+            impact = factors.get(ingredient, {})
+            table[row] = [impact.get(indicator, 0) for indicator in indicators]
+        return table
+
+    def stats(self) -> Dict:
+        return {
+            "path": str(self.path),
+            "ingredients": self.ingredient_count,
+            "factors": self.factor_count,
+            "version": self.version,
+            "cache": self.cache.stats(),
+        }
+
+
+def _column(fieldnames: List[str], name: str) -> Optional[str]:
+    lowered = {field.strip().lower(): field for field in fieldnames}
+    return next((lowered[alias] for alias in CSV_COLUMNS[name] if alias in lowered), None)
+
+
+Row = Tuple[str, str, float, Optional[str], Optional[str]]
+
+
+def read_csv(path) -> Iterator[Row]:
+    """
+    (ingredient, indicator, value, unit, method) rows of an exported CSV
+
+    Long exports have one row per ingredient and indicator (ingredient,
+    indicator, value and optional unit and method columns); wide exports
+    have an ingredient column and one numeric column per indicator.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as stream:
+        reader = csv.DictReader(stream)
+        fields = reader.fieldnames or []
+        ingredient_col = _column(fields, "ingredient")
+        if ingredient_col is None:
+            raise ValueError(f"{path}: no ingredient column among {fields}")
+        indicator_col = _column(fields, "indicator")
+        value_col = _column(fields, "value")
+        unit_col = _column(fields, "unit")
+        method_col = _column(fields, "method")
+
+        if indicator_col and value_col:
+            for row in reader:
+                if row[value_col] not in (None, ""):
+                    yield (
+                        row[ingredient_col],
+                        row[indicator_col],
+                        float(row[value_col]),
+                        row.get(unit_col) if unit_col else None,
+                        row.get(method_col) if method_col else None,
+                    )
+            return
+
+        indicator_cols = [f for f in fields if f not in (ingredient_col, unit_col, method_col)]
+        for row in reader:
+            for column in indicator_cols:
+                try:
+                    value = float(row[column])
+                except (TypeError, ValueError):
+                    continue  # empty, or a text column such as a location
+                yield row[ingredient_col], column, value, None, None
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def read_ecospold(path) -> Iterator[Row]:
+    """
+    (ingredient, indicator, value, unit, method) rows of an ecospold LCIA dataset
+
+    EcoSpold2 datasets (``activity/@activityName`` with ``impactIndicator``
+    elements) and EcoSpold1 datasets (``referenceFunction/@name`` with
+    impact ``exchange`` elements carrying a category) are parsed
+    incrementally, one element at a time.
+    """
+    ingredient = None
+    for _, element in ET.iterparse(path, events=("end",)):
+        tag = _local(element.tag)
+        if tag == "activity" and element.get("activityName"):
+            ingredient = element.get("activityName")
+        elif tag == "referenceFunction" and element.get("name"):
+            ingredient = element.get("name")
+        elif tag == "impactIndicator" and ingredient is not None:
+            texts = {_local(child.tag): (child.text or "").strip() for child in element}
+            # e.g. "climate change" + "GWP 100a"
+            indicator = " ".join(
+                text for text in (texts.get("impactCategoryName"), texts.get("name")) if text
+            )
+            if indicator and element.get("amount") is not None:
+                yield (
+                    ingredient,
+                    indicator,
+                    float(element.get("amount")),
+                    texts.get("unitName"),
+                    texts.get("impactMethodName"),
+                )
+        elif tag == "exchange" and ingredient is not None and element.get("category"):
+            yield (
+                ingredient,
+                element.get("category"),
+                float(element.get("meanValue", element.get("amount", 0))),
+                element.get("unit"),
+                None,
+            )
+        if tag in ("impactIndicator", "exchange"):
+            element.clear()
+
+
+def _sources(paths: Iterable) -> Iterator[Path]:
+    for path in map(Path, paths):
+        if path.is_dir():
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if Path(name).suffix.lower() in (".csv", ".spold", ".xml"):
+                        yield Path(root) / name
+        else:
+            yield path
+
+
+def ingest(
+    db_path,
+    paths: Iterable,
+    aliases: Optional[Dict[str, str]] = None,
+    batch_size: int = 10_000,
+) -> int:
+    """
+    Load exported CSV and ecospold files into the impact factor database
+
+    Rows are streamed into SQLite in batches; an (ingredient, indicator) pair
+    seen again replaces the earlier value. Rows of a known LCIA method are
+    also stored under a method-specific indicator (e.g. "TRACI:EP"), which
+    that method's characterization prefers. Returns the number of distinct
+    (ingredient, indicator) factors written.
+
+    Args:
+        db_path: SQLite file, created if missing
+        paths: CSV / ecospold (.spold, .xml) files or directories of them
+        aliases: Source process name -> ingredient key, e.g.
+            {"market for concrete, normal": "concrete"}
+        batch_size: Rows per insert transaction
+    """
+    aliases = {normalize_ingredient(k): v for k, v in (aliases or {}).items()}
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    statement = (
+        "INSERT INTO impact_factors (ingredient, indicator, value, unit, source) "
+        "VALUES (?, ?, ?, ?, ?) ON CONFLICT (ingredient, indicator) DO UPDATE SET "
+        "value = excluded.value, unit = excluded.unit, source = excluded.source"
+    )
+    written = set()
+    try:
+        for source in _sources(paths):
+            reader = read_csv if source.suffix.lower() == ".csv" else read_ecospold
+            batch = []
+            for ingredient, indicator, value, unit, method in reader(source):
+                key = normalize_ingredient(ingredient)
+                key = normalize_ingredient(aliases.get(key, key))
+                indicator = normalize_indicator(indicator)
+                batch.append((key, indicator, value, unit, source.name))
+                method = normalize_method(method)
+                if method and ":" not in indicator:
+                    batch.append((key, f"{method}:{indicator}", value, unit, source.name))
+                if len(batch) >= batch_size:
+                    with conn:
+                        conn.executemany(statement, batch)
+                    written.update(row[:2] for row in batch)
+                    batch = []
+            with conn:
+                conn.executemany(statement, batch)
+            written.update(row[:2] for row in batch)
+        _update_metadata(conn)
+    finally:
+        conn.close()
+    return len(written)
+
+
+def _update_metadata(conn: sqlite3.Connection):
+    """Record counts and a content digest, so readers never scan the table to get them"""
+    digest = hashlib.sha256()
+    for row in conn.execute(
+        "SELECT ingredient, indicator, value FROM impact_factors ORDER BY ingredient, indicator"
+    ):
+        digest.update(repr(row).encode())
+    ingredients, factors = conn.execute(
+        "SELECT COUNT(DISTINCT ingredient), COUNT(*) FROM impact_factors"
+    ).fetchone()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+            [
+                ("version", digest.hexdigest()),
+                ("ingredients", str(ingredients)),
+                ("factors", str(factors)),
+            ],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the local impact factor database")
+    parser.add_argument("paths", nargs="+", help="CSV / ecospold files or directories")
+    parser.add_argument("--db", default="data/ecoinvent.db")
+    parser.add_argument(
+        "--alias",
+        action="append",
+        default=[],
+        metavar="SOURCE=INGREDIENT",
+        help="Map a source process name to an ingredient key",
+    )
+    args = parser.parse_args()
+
+    aliases = dict(alias.split("=", 1) for alias in args.alias)
+    rows = ingest(args.db, args.paths, aliases)
+    print(f"Ingested {rows} impact factors into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.generative_design import DesignAlternative
+from integrations.takeoff import DEFAULT_CHUNK_SIZE, run_takeoff
+
+# Transient statuses retried with backoff; Retry-After is honoured when sent
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Demo building data per integration ``name``, returned when a model has no
+# exported element schedule on disk
+SAMPLE_BUILDINGS = {
+    "revit": {
+        "project_name": "Sample Building",
+        "area": 1500,  # m2
+        "volume": 4500,  # m3
+        "components": {
+            "foundation": {"area": 1500, "volume": 450, "material": "concrete"},
+            "structure": {"area": 1500, "volume": 225, "material": "steel"},
+            "walls": {"area": 4500, "volume": 450, "material": "concrete"},
+            "insulation": {"area": 4500, "volume": 225, "material": "fiberglass"},
+            "roofing": {"area": 1500, "volume": 120, "material": "steel"},
+            "flooring": {"area": 1500, "volume": 30, "material": "concrete"},
+        },
+        "materials": {
+            "concrete": {"quantity": 100, "unit": "m3"},
+            "steel": {"quantity": 50, "unit": "ton"},
+            "fiberglass": {"quantity": 20, "unit": "m3"},
+        },
+    },
+    "rhino": {
+        "project_name": "Sample Rhino Building",
+        "area": 1200,  # m2
+        "volume": 3600,  # m3
+        "components": {
+            "foundation": {"area": 1200, "volume": 360, "material": "concrete"},
+            "structure": {"area": 1200, "volume": 180, "material": "timber"},
+            "walls": {"area": 3600, "volume": 360, "material": "brick"},
+            "insulation": {"area": 3600, "volume": 180, "material": "cellulose"},
+            "roofing": {"area": 1200, "volume": 96, "material": "clay"},
+            "flooring": {"area": 1200, "volume": 24, "material": "bamboo"},
+        },
+        "materials": {
+            "concrete": {"quantity": 80, "unit": "m3"},
+            "timber": {"quantity": 40, "unit": "m3"},
+            "cellulose": {"quantity": 15, "unit": "m3"},
+        },
+    },
+}
+
+
+@dataclass
+class ClientConfig:
+    """Connection pooling, batching, concurrency and retry settings"""
+
+    pool_connections: int = 4  # hosts with a kept-alive pool
+    pool_maxsize: int = 16  # kept-alive connections per host
+    max_concurrency: int = 16  # requests in flight during async pushes
+    batch_size: int = 500  # component updates per request
+    max_retries: int = 3
+    backoff_factor: float = 0.1  # sleeps 0.1 s, 0.2 s, 0.4 s, ...
+    timeout: float = 30.0  # seconds per request
+
+
+@dataclass
+class PushResult:
+    """Outcome of pushing material selections for many alternatives"""
+
+    alternatives: int
+    updates: int
+    requests: int
+    errors: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def status(self) -> str:
+        if not self.errors:
+            return "success"
+        return "failed" if len(self.errors) == self.requests else "partial"
+
+    def to_dict(self) -> Dict:
+        return {
+            "status": self.status,
+            "alternatives": self.alternatives,
+            "updated_components": self.updates,
+            "requests": self.requests,
+            "errors": self.errors,
+            "elapsed_ms": self.elapsed_ms,
+        }
+
+
+class IntegrationClient:
+    """
+    HTTP client shared by the BIM integrations
+
+    One pooled session keeps connections alive, component updates are sent
+    ``batch_size`` per request, and transient failures (connection errors and
+    ``RETRY_STATUSES``) are retried with exponential backoff. Each batch
+    carries an ``Idempotency-Key`` so a retried batch is applied once.
+
+    Integrations subclass it with their ``name`` (which also selects the
+    ``SAMPLE_BUILDINGS`` entry), ``default_base_url`` and ``update_path``.
+    """
+
+    name = "integration"
+    default_base_url = ""
+    update_path = "/model/v1/materials"
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        config: Optional[ClientConfig] = None,
+    ):
+        self.api_key = api_key
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.config = config or ClientConfig()
+        self.session = self._build_session()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _build_session(self) -> requests.Session:
+        config = self.config
+        retry = Retry(
+            total=config.max_retries,
+            backoff_factor=config.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,  # POSTs are safe to retry: batches are idempotent
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            max_retries=retry,
+            pool_block=True,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            }
+        )
+        return session
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.config.max_concurrency, thread_name_prefix=self.name
+            )
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def export_building_data(self, model_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+        """Extract building data from a model
+
+        An element schedule exported from the model (CSV, NDJSON or JSON) is
+        streamed through the quantity takeoff, ``chunk_size`` elements at a
+        time. Without one, the integration's sample building is returned.
+        """
+        if os.path.isfile(model_path):
+            takeoff = run_takeoff(model_path, chunk_size=chunk_size)
+            project_name = os.path.splitext(os.path.basename(model_path))[0]
+            return takeoff.to_building_data(project_name)
+
+        # This would call the modelling tool's API to extract model data
+        # For demo, return sample data
+        if self.name not in SAMPLE_BUILDINGS:
+            raise FileNotFoundError(f"No element schedule at {model_path}")
+        return copy.deepcopy(SAMPLE_BUILDINGS[self.name])
+
+    @staticmethod
+    def material_updates(
+        design_alternative: DesignAlternative, alternative_id: Optional[str] = None
+    ) -> List[Dict]:
+        """Component updates for one alternative"""
+        updates = []
+        for component, mat_id in design_alternative.material_selections.items():
+            update = {
+                "component": component,
+                "material_id": mat_id,
+                "parameters": {
+                    "carbon_footprint": design_alternative.total_carbon,
+                    "cost_impact": design_alternative.total_cost,
+                },
+            }
+            if alternative_id is not None:
+                update["alternative_id"] = alternative_id
+            updates.append(update)
+        return updates
+
+    def _batches(self, updates: List[Dict]) -> List[List[Dict]]:
+        size = self.config.batch_size
+        return [updates[start : start + size] for start in range(0, len(updates), size)]
+
+    def post_updates(self, updates: List[Dict]) -> Dict:
+        """Send one batch of component updates (blocking, retried)"""
+        body = json.dumps({"updates": updates}, sort_keys=True, separators=(",", ":"))
+        response = self.session.post(
+            f"{self.base_url}{self.update_path}",
+            data=body,
+            headers={"Idempotency-Key": hashlib.sha256(body.encode()).hexdigest()},
+            timeout=self.config.timeout,
+        )
+        response.raise_for_status()
+        return response.json() if response.content else {}
+
+    def import_material_selections(self, design_alternative: DesignAlternative) -> Dict:
+        """Push the material selections of one alternative back into the model"""
+        updates = self.material_updates(design_alternative)
+        for batch in self._batches(updates):
+            self.post_updates(batch)
+
+        return {
+            "status": "success",
+            "updated_components": len(updates),
+            "total_carbon_reduction": design_alternative.total_carbon,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    async def push_alternatives_async(
+        self,
+        alternatives: Sequence[DesignAlternative],
+        alternative_ids: Optional[Sequence[str]] = None,
+    ) -> PushResult:
+        """
+        Push many alternatives concurrently
+
+        Updates of all alternatives are packed into ``batch_size`` batches and
+        sent ``max_concurrency`` at a time over the pooled session. A batch
+        that still fails after its retries is reported in ``errors``; the
+        others are still sent.
+
+        Args:
+            alternatives: Design alternatives to push
+            alternative_ids: Id per alternative, defaults to its position
+        """
+        started = time.perf_counter()
+        ids = alternative_ids or [str(i) for i in range(len(alternatives))]
+        updates = [
+            update
+            for alternative, alternative_id in zip(alternatives, ids)
+            for update in self.material_updates(alternative, alternative_id)
+        ]
+        batches = self._batches(updates)
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self.executor, self.post_updates, batch) for batch in batches),
+            return_exceptions=True,
+        )
+        return PushResult(
+            alternatives=len(alternatives),
+            updates=len(updates),
+            requests=len(batches),
+            errors=[str(result) for result in results if isinstance(result, Exception)],
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    def push_alternatives(
+        self,
+        alternatives: Sequence[DesignAlternative],
+        alternative_ids: Optional[Sequence[str]] = None,
+    ) -> PushResult:
+        """Blocking wrapper of ``push_alternatives_async`` for callers without a loop"""
+        return asyncio.run(self.push_alternatives_async(alternatives, alternative_ids))
+
+    def create_visualization(self, design_data: Dict) -> str:
+        """Create 3D visualization of material selections"""
+
+        visualization_data = {
+            "materials": design_data.get("material_selections", {}),
+            "carbon_intensity": design_data.get("total_carbon", 0),
+            "cost_breakdown": design_data.get("total_cost", 0),
+            "sustainability_score": design_data.get("sustainability_score", 0),
+        }
+
+        # Generate visualization URL or data
+        return json.dumps(visualization_data)
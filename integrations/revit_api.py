@@ -1,89 +1,9 @@
-import json
-from typing import Dict, List, Optional
-import requests
-from datetime import datetime
+from integrations.base import IntegrationClient
 
-from terraweave.core.generative_design import DesignAlternative
 
-
-class RevitIntegration:
+class RevitIntegration(IntegrationClient):
     """Integration with Autodesk Revit"""
 
-    def __init__(self, api_key: str, base_url: str = "https://developer.api.autodesk.com"):
-        self.api_key = api_key
-        self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            }
-        )
-
-    def export_building_data(self, revit_file_path: str) -> Dict:
-        """Extract building data from Revit model"""
-        # This would call Revit API to extract model data
-        # For demo, return sample data
-
-        return {
-            "project_name": "Sample Building",
-            "area": 1500,  # m2
-            "volume": 4500,  # m3
-            "components": {
-                "foundation": {"area": 1500, "volume": 450, "material": "concrete"},
-                "structure": {"area": 1500, "volume": 225, "material": "steel"},
-                "walls": {"area": 4500, "volume": 450, "material": "concrete"},
-                "insulation": {"area": 4500, "volume": 225, "material": "fiberglass"},
-                "roofing": {"area": 1500, "volume": 120, "material": "steel"},
-                "flooring": {"area": 1500, "volume": 30, "material": "concrete"},
-            },
-            "materials": {
-                "concrete": {"quantity": 100, "unit": "m3"},
-                "steel": {"quantity": 50, "unit": "ton"},
-                "fiberglass": {"quantity": 20, "unit": "m3"},
-            },
-        }
-
-    def import_material_selections(self, design_alternative: DesignAlternative) -> Dict:
-        """Import material selections back into Revit"""
-
-        # Format data for Revit API
-        material_updates = []
-        for component, mat_id in design_alternative.material_selections.items():
-            material_updates.append(
-                {
-                    "component": component,
-                    "material_id": mat_id,
-                    "parameters": {
-                        "carbon_footprint": design_alternative.total_carbon,
-                        "cost_impact": design_alternative.total_cost,
-                    },
-                }
-            )
-
-        # Call Revit API to update materials
-        # response = self.session.post(
-        #     f"{self.base_url}/model/v1/materials",
-        #     json={"updates": material_updates}
-        # )
-
-        # For demo, return success
-        return {
-            "status": "success",
-            "updated_components": len(material_updates),
-            "total_carbon_reduction": design_alternative.total_carbon,
-            "timestamp": datetime.now().isoformat(),
-        }
-
-    def create_visualization(self, design_data: Dict) -> str:
-        """Create 3D visualization of material selections"""
-
-        visualization_data = {
-            "materials": design_data.get("material_selections", {}),
-            "carbon_intensity": design_data.get("total_carbon", 0),
-            "cost_breakdown": design_data.get("total_cost", 0),
-            "sustainability_score": design_data.get("sustainability_score", 0),
-        }
-
-        # Generate visualization URL or data
-        return json.dumps(visualization_data)
+    name = "revit"
+    default_base_url = "https://developer.api.autodesk.com"
+    update_path = "/model/v1/materials"
@@ -0,0 +1,161 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+class _StubState:
+    def __init__(self, latency_ms: float, failure_rate: float, seed: int):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.duplicates = 0
+        self.updates = 0
+        self.alternatives = set()
+        # Idempotency-Key -> response body of the batch it applied
+        self.applied: Dict[str, bytes] = {}
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "duplicates": self.duplicates,
+                "updates": self.updates,
+                "alternatives": len(self.alternatives),
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so client connection pooling takes effect; without Nagle the
+    # separately written headers and body are not held back by delayed ACKs
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "ThreadingHTTPServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send(200, json.dumps(self.server.state.stats()).encode())
+        else:
+            self._send(404, b'{"detail":"Not found"}')
+
+    def do_POST(self):
+        state: _StubState = self.server.state
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if state.latency_ms:
+            time.sleep(state.latency_ms / 1000)
+
+        with state.lock:
+            state.requests += 1
+            if state.random.random() < state.failure_rate:
+                state.failures += 1
+                failed = True
+            else:
+                failed = False
+        if failed:
+            self._send(503, b'{"detail":"Injected failure"}')
+            return
+
+        try:
+            updates = json.loads(body)["updates"]
+        except (ValueError, KeyError, TypeError):
+            self._send(400, b'{"detail":"Expected {\\"updates\\": [...]}"}')
+            return
+
+        key = self.headers.get("Idempotency-Key")
+        with state.lock:
+            if key and key in state.applied:
+                state.duplicates += 1
+                response = state.applied[key]
+            else:
+                state.updates += len(updates)
+                state.alternatives.update(
+                    update["alternative_id"] for update in updates if "alternative_id" in update
+                )
+                response = json.dumps({"status": "success", "accepted": len(updates)}).encode()
+                if key:
+                    state.applied[key] = response
+        self._send(200, response)
+
+
+class StubServer:
+    """
+    Local stand-in for the Revit/Rhino model APIs, for offline throughput tests
+
+    Accepts batched component updates on any POST path, optionally sleeping
+    ``latency_ms`` per request and failing a ``failure_rate`` share of them
+    with 503 to exercise retries. Repeated Idempotency-Keys are applied once.
+    ``GET /stats`` (or ``stats()``) reports what was received.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = _StubState(latency_ms, failure_rate, seed)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stats(self) -> Dict:
+        return self.httpd.state.stats()
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the BIM integration stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.latency_ms, args.failure_rate)
+    print(f"Stub integration server on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+import csv
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Export column names accepted for each element field
+FIELD_ALIASES = {
+    "component": ("component", "category", "Category"),
+    "ifc_class": ("ifc_class", "IfcClass", "ifc_type", "IfcType", "entity"),
+    "material": ("material", "Material", "material_name", "Structural Material"),
+    "volume": ("volume", "Volume", "NetVolume", "net_volume"),
+    "area": ("area", "Area", "NetArea", "net_area"),
+}
+
+# Revit categories and IFC classes (lower case) per design component
+COMPONENT_ALIASES = {
+    "foundation": ("foundation", "structural foundations", "ifcfooting", "ifcpile"),
+    "structure": (
+        "structure",
+        "structural framing",
+        "structural columns",
+        "ifcbeam",
+        "ifccolumn",
+        "ifcmember",
+        "ifcplate",
+    ),
+    "walls": ("walls", "wall", "ifcwall", "ifcwallstandardcase", "ifccurtainwall"),
+    "insulation": ("insulation",),
+    "roofing": ("roofing", "roofs", "roof", "ifcroof"),
+    "flooring": ("flooring", "floors", "floor", "ifcslab", "ifccovering"),
+}
+
+# Keywords in export material names -> material names used by the design templates
+MATERIAL_KEYWORDS = (
+    ("mineral wool", "mineral_wool"),
+    ("rock wool", "mineral_wool"),
+    ("glass wool", "fiberglass"),
+    ("fiberglass", "fiberglass"),
+    ("fibreglass", "fiberglass"),
+    ("cellulose", "cellulose"),
+    ("mycelium", "mycelium"),
+    ("straw", "straw_bale"),
+    ("bamboo", "bamboo"),
+    ("timber", "timber"),
+    ("wood", "timber"),
+    ("clt", "timber"),
+    ("glulam", "timber"),
+    ("steel", "steel"),
+    ("brick", "brick"),
+    ("masonry", "brick"),
+    ("clay", "clay"),
+    ("rubber", "recycled_rubber"),
+    ("concrete", "concrete"),
+    ("cement", "concrete"),
+)
+
+# Insulation layers are reported under their host (e.g. walls) by most exporters
+INSULATION_MATERIALS = frozenset({"fiberglass", "mineral_wool", "cellulose", "mycelium"})
+
+UNKNOWN_MATERIAL = "unknown"
+
+
+class ElementMapper:
+    """Maps export categories, IFC classes and material names to design components
+
+    Raw names repeat across a model, so every mapping is memoized; memory
+    grows with the number of distinct names, not elements.
+    """
+
+    def __init__(
+        self,
+        component_aliases: Optional[Dict[str, Iterable[str]]] = None,
+        material_keywords: Optional[Iterable[Tuple[str, str]]] = None,
+    ):
+        self.aliases: Dict[str, str] = {}
+        for component, aliases in (component_aliases or COMPONENT_ALIASES).items():
+            for alias in aliases:
+                self.aliases[alias.lower()] = component
+        self.keywords = [
+            (re.compile(rf"\b{re.escape(keyword)}"), material)
+            for keyword, material in (material_keywords or MATERIAL_KEYWORDS)
+        ]
+        self._materials: Dict[str, str] = {}
+        self._components: Dict[Tuple[str, str, str], Optional[str]] = {}
+
+    def material(self, name: str) -> str:
+        """Template material name for an export material name"""
+        material = self._materials.get(name)
+        if material is None:
+            lowered = name.lower()
+            material = next(
+                (mat for pattern, mat in self.keywords if pattern.search(lowered)),
+                re.sub(r"\W+", "_", lowered).strip("_") or UNKNOWN_MATERIAL,
+            )
+            self._materials[name] = material
+        return material
+
+    def component(self, category: str, ifc_class: str, material: str) -> Optional[str]:
+        """Design component of an element, or None when it cannot be mapped"""
+        key = (category, ifc_class, material)
+        if key not in self._components:
+            component = self.aliases.get(category.strip().lower()) or self.aliases.get(
+                ifc_class.strip().lower()
+            )
+            if component is not None and material in INSULATION_MATERIALS:
+                component = "insulation"
+            self._components[key] = component
+        return self._components[key]
+
+
+@dataclass
+class ComponentTakeoff:
+    """Measured quantities of one design component"""
+
+    volume: float = 0.0  # m3
+    area: float = 0.0  # m2
+    element_count: int = 0
+    material_volumes: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def dominant_material(self) -> str:
+        if not self.material_volumes:
+            return UNKNOWN_MATERIAL
+        return max(self.material_volumes, key=self.material_volumes.get)
+
+
+@dataclass
+class Takeoff:
+    """Quantity takeoff of a whole model, grouped by component and material"""
+
+    components: Dict[str, ComponentTakeoff]
+    element_count: int
+    unmapped_count: int
+    invalid_count: int
+    unmapped_categories: Dict[str, int]
+
+    def quantities(self) -> Dict[str, float]:
+        """Volume per component, the quantities design scoring weights by"""
+        return {component: takeoff.volume for component, takeoff in self.components.items()}
+
+    def material_quantities(self) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for takeoff in self.components.values():
+            for material, volume in takeoff.material_volumes.items():
+                totals[material] = totals.get(material, 0.0) + volume
+        return totals
+
+    def to_building_data(self, project_name: str = "", area: Optional[float] = None) -> Dict:
+        """
+        Building data in the shape returned by the BIM integrations
+
+        Args:
+            project_name: Name reported for the project
+            area: Gross floor area; defaults to the measured flooring area,
+                else the largest component area
+        """
+        if area is None:
+            flooring = self.components.get("flooring")
+            area = (
+                flooring.area
+                if flooring and flooring.area
+                else max((t.area for t in self.components.values()), default=0.0)
+            )
+        return {
+            "project_name": project_name,
+            "area": area,
+            "volume": sum(t.volume for t in self.components.values()),
+            "components": {
+                component: {
+                    "area": takeoff.area,
+                    "volume": takeoff.volume,
+                    "material": takeoff.dominant_material,
+                    "element_count": takeoff.element_count,
+                }
+                for component, takeoff in self.components.items()
+            },
+            "materials": {
+                material: {"quantity": volume, "unit": "m3"}
+                for material, volume in self.material_quantities().items()
+            },
+            "takeoff": {
+                "element_count": self.element_count,
+                "unmapped_count": self.unmapped_count,
+                "invalid_count": self.invalid_count,
+                "unmapped_categories": self.unmapped_categories,
+            },
+        }
+
+
+def _field(row: Dict, name: str) -> str:
+    for alias in FIELD_ALIASES[name]:
+        value = row.get(alias)
+        if value not in (None, ""):
+            return str(value)
+    return ""
+
+
+def _values(rows: List[Dict], name: str) -> List:
+    """One field of every row, read from the first row's column for it when present"""
+    aliases = FIELD_ALIASES[name]
+    column = next((alias for alias in aliases if alias in rows[0]), aliases[0])
+    values = [row.get(column) for row in rows]
+    for i, value in enumerate(values):
+        if value is None or value == "":
+            values[i] = _field(rows[i], name)
+    return values
+
+
+_QUANTITY = re.compile(r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)")
+
+
+def _number(value) -> float:
+    """Quantity as a float; exporters may append units ("12.5 m3"), missing is 0"""
+    if value is None or value == "":
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        match = _QUANTITY.match(str(value))
+        return float(match.group(1)) if match else math.nan
+
+
+def _numbers(values: List) -> np.ndarray:
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter(map(_number, values), dtype=np.float64, count=len(values))
+
+
+class TakeoffAggregator:
+    """
+    Group-by-sum of element quantities per (component, material), a chunk at a time
+
+    Each chunk is reduced with ``np.unique`` and ``np.bincount``; only the
+    running per-pair totals are kept, so memory is bounded by the chunk size
+    and the number of distinct components and materials.
+    """
+
+    def __init__(
+        self,
+        mapper: Optional[ElementMapper] = None,
+        volume_factor: float = 1.0,
+        area_factor: float = 1.0,
+    ):
+        """
+        Args:
+            mapper: Element mapping rules
+            volume_factor: Export volume unit -> m3 (e.g. 0.0283168 for ft3)
+            area_factor: Export area unit -> m2 (e.g. 0.092903 for ft2)
+        """
+        self.mapper = mapper or ElementMapper()
+        self.volume_factor = volume_factor
+        self.area_factor = area_factor
+        self.component_names: List[str] = []
+        self.material_names: List[str] = []
+        self._component_codes: Dict[str, int] = {}
+        self._material_codes: Dict[str, int] = {}
+        # Distinct raw (category, IFC class, material) triples and their codes
+        self._elements: Dict[Tuple, int] = {}
+        self._element_components: List[int] = []
+        self._element_materials: List[int] = []
+        self._element_labels: List[str] = []
+        # (component code, material code) -> [volume, area, element count]
+        self._totals: Dict[Tuple[int, int], List[float]] = {}
+        self.element_count = 0
+        self.unmapped_count = 0
+        self.invalid_count = 0
+        self.unmapped_categories: Dict[str, int] = {}
+
+    @staticmethod
+    def _code(name: str, codes: Dict[str, int], names: List[str]) -> int:
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(names)
+            names.append(name)
+        return code
+
+    def _element(self, key: Tuple) -> int:
+        """Code of a raw element type, mapping it on first sight"""
+        category, ifc_class, name = ("" if value is None else str(value) for value in key)
+        material = self.mapper.material(name)
+        component = self.mapper.component(category, ifc_class, material)
+        self._element_components.append(
+            -1
+            if component is None
+            else self._code(component, self._component_codes, self.component_names)
+        )
+        self._element_materials.append(
+            self._code(material, self._material_codes, self.material_names)
+        )
+        self._element_labels.append(category or ifc_class or "(none)")
+        code = self._elements[key] = len(self._element_labels) - 1
+        return code
+
+    def add_chunk(self, rows: List[Dict]):
+        """Aggregate one chunk of raw element rows"""
+        if not rows:
+            return
+        n = len(rows)
+        elements = self._elements
+        keys = zip(
+            _values(rows, "component"), _values(rows, "ifc_class"), _values(rows, "material")
+        )
+        codes = np.fromiter(
+            (elements[key] if key in elements else self._element(key) for key in keys),
+            dtype=np.int64,
+            count=n,
+        )
+        components = np.array(self._element_components, dtype=np.int64)[codes]
+        materials = np.array(self._element_materials, dtype=np.int64)[codes]
+        volumes = _numbers(_values(rows, "volume"))
+        areas = _numbers(_values(rows, "area"))
+
+        invalid = ~(np.isfinite(volumes) & np.isfinite(areas))
+        mapped = components >= 0
+        keep = mapped & ~invalid
+        self.element_count += n
+        self.unmapped_count += int((~mapped).sum())
+        self.invalid_count += int((mapped & invalid).sum())
+        unmapped = np.bincount(codes[~mapped], minlength=len(self._element_labels))
+        for code in np.flatnonzero(unmapped).tolist():
+            label = self._element_labels[code]
+            self.unmapped_categories[label] = self.unmapped_categories.get(label, 0) + int(
+                unmapped[code]
+            )
+
+        keys = (components[keep] << 32) | materials[keep]
+        pairs, inverse = np.unique(keys, return_inverse=True)
+        volume_sums = np.bincount(inverse, volumes[keep], minlength=len(pairs))
+        area_sums = np.bincount(inverse, areas[keep], minlength=len(pairs))
+        counts = np.bincount(inverse, minlength=len(pairs))
+        for key, volume, area, count in zip(
+            pairs.tolist(), volume_sums.tolist(), area_sums.tolist(), counts.tolist()
+        ):
+            totals = self._totals.setdefault((key >> 32, key & 0xFFFFFFFF), [0.0, 0.0, 0])
+            totals[0] += volume * self.volume_factor
+            totals[1] += area * self.area_factor
+            totals[2] += count
+
+    def result(self) -> Takeoff:
+        components: Dict[str, ComponentTakeoff] = {}
+        for (component, material), (volume, area, count) in self._totals.items():
+            takeoff = components.setdefault(self.component_names[component], ComponentTakeoff())
+            takeoff.volume += volume
+            takeoff.area += area
+            takeoff.element_count += count
+            name = self.material_names[material]
+            takeoff.material_volumes[name] = takeoff.material_volumes.get(name, 0.0) + volume
+        return Takeoff(
+            components=components,
+            element_count=self.element_count,
+            unmapped_count=self.unmapped_count,
+            invalid_count=self.invalid_count,
+            unmapped_categories=dict(self.unmapped_categories),
+        )
+
+
+def _iter_json_array(stream: TextIO, buffer_size: int = 1 << 16) -> Iterator[Dict]:
+    """Elements of a JSON array (top level or under "elements"), decoded incrementally"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+
+    def fill() -> bool:
+        nonlocal buffer, position
+        data = stream.read(buffer_size)
+        buffer = buffer[position:] + data
+        position = 0
+        return bool(data)
+
+    while True:
+        while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ","):
+            position += 1
+        if position == len(buffer):
+            if not fill():
+                return
+            continue
+
+        if not started:
+            # Skip to the opening bracket of the element array
+            start = buffer.find("[", position)
+            if start < 0:
+                if not fill():
+                    raise ValueError("No JSON array of elements found")
+                continue
+            position = start + 1
+            started = True
+            continue
+        if buffer[position] == "]":
+            return
+
+        try:
+            element, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if not fill():
+                raise
+            continue
+        position = end
+        yield element
+
+
+def _iter_ndjson(stream: TextIO) -> Iterator[Dict]:
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _chunks(rows: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    chunk: List[Dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# File suffix -> export format
+FORMATS = {".csv": "csv", ".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def read_elements(
+    path: str, fmt: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[List[Dict]]:
+    """
+    Stream element rows from a BIM export in chunks of ``chunk_size``
+
+    Args:
+        path: Element list exported as CSV, NDJSON or JSON (an array, or an
+            object with an "elements" array); flattened IFC exports carry an
+            IFC class column
+        fmt: "csv", "ndjson" or "json"; inferred from the suffix by default
+    """
+    fmt = fmt or FORMATS.get(Path(path).suffix.lower())
+    if fmt not in FORMATS.values():
+        raise ValueError(f"Unsupported takeoff format for {path}")
+
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8-sig") as stream:
+        if fmt == "csv":
+            rows: Iterable[Dict] = csv.DictReader(stream)
+        elif fmt == "ndjson":
+            rows = _iter_ndjson(stream)
+        else:
+            rows = _iter_json_array(stream)
+        yield from _chunks(rows, chunk_size)
+
+
+def run_takeoff(
+    path: str,
+    fmt: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    mapper: Optional[ElementMapper] = None,
+    volume_factor: float = 1.0,
+    area_factor: float = 1.0,
+) -> Takeoff:
+    """Quantity takeoff of an element export, streamed chunk by chunk"""
+    aggregator = TakeoffAggregator(mapper, volume_factor, area_factor)
+    for chunk in read_elements(path, fmt, chunk_size):
+        aggregator.add_chunk(chunk)
+    return aggregator.result()
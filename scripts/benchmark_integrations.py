@@ -0,0 +1,104 @@
+"""Benchmark pushing design alternatives to a BIM integration, offline.
+
+Starts the local stub server with a simulated per-request latency (and
+optionally injected 503s), then pushes synthetic alternatives one request
+per alternative and batched/concurrently through ``IntegrationClient``.
+
+Usage:
+    python scripts/benchmark_integrations.py [--alternatives 500] [--latency-ms 50]
+                                             [--failure-rate 0.05] [--batch-size 500]
+                                             [--concurrency 16] [--skip-sequential] [--json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.generative_design import DesignAlternative  # noqa: E402
+from integrations.base import ClientConfig, IntegrationClient  # noqa: E402
+from integrations.stub_server import StubServer  # noqa: E402
+
+COMPONENTS = ("foundation", "structure", "walls", "insulation", "roofing", "flooring")
+
+
+def make_alternatives(count: int, seed: int = 0) -> List[DesignAlternative]:
+    rng = random.Random(seed)
+    return [
+        DesignAlternative(
+            material_selections={c: f"MAT_{rng.randrange(100000):06d}" for c in COMPONENTS},
+            total_cost=rng.uniform(1e5, 1e6),
+            total_carbon=rng.uniform(1e4, 1e5),
+            sustainability_score=rng.uniform(0, 100),
+            tradeoffs={},
+        )
+        for _ in range(count)
+    ]
+
+
+def run(args) -> Dict:
+    alternatives = make_alternatives(args.alternatives)
+    config = ClientConfig(
+        pool_maxsize=args.concurrency,
+        max_concurrency=args.concurrency,
+        batch_size=args.batch_size,
+    )
+    report = {"alternatives": args.alternatives, "latency_ms": args.latency_ms}
+
+    if not args.skip_sequential:
+        with StubServer(latency_ms=args.latency_ms, failure_rate=args.failure_rate) as server:
+            with IntegrationClient("stub", server.url, config) as client:
+                start = time.perf_counter()
+                for alternative in alternatives:
+                    client.import_material_selections(alternative)
+                report["sequential_ms"] = (time.perf_counter() - start) * 1000
+            report["sequential_server"] = server.stats()
+
+    with StubServer(latency_ms=args.latency_ms, failure_rate=args.failure_rate) as server:
+        with IntegrationClient("stub", server.url, config) as client:
+            result = client.push_alternatives(alternatives)
+        report["batched"] = result.to_dict()
+        report["batched_server"] = server.stats()
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alternatives", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated per request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of 503 responses")
+    parser.add_argument("--batch-size", type=int, default=ClientConfig.batch_size)
+    parser.add_argument("--concurrency", type=int, default=ClientConfig.max_concurrency)
+    parser.add_argument("--skip-sequential", action="store_true", help="Skip the baseline")
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report")
+    args = parser.parse_args()
+
+    report = run(args)
+    batched = report["batched"]
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        if "sequential_ms" in report:
+            print(
+                f"sequential: {report['sequential_ms']:.0f} ms, "
+                f"{report['sequential_server']['requests']} requests"
+            )
+        print(
+            f"batched:    {batched['elapsed_ms']:.0f} ms, {batched['requests']} requests, "
+            f"{batched['updated_components']} updates, status {batched['status']}"
+        )
+    received = report["batched_server"]["updates"]
+    if received != batched["updated_components"]:
+        print(f"Server applied {received} of {batched['updated_components']} updates")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Measure the cold-start import cost of the API module.
+
+Runs ``python -X importtime -c "import api.endpoints"`` in a fresh
+interpreter and reports the total import time plus the heaviest modules,
+so cold start in autoscaled containers can be tracked over time.
+
+Usage:
+    python scripts/measure_import_time.py [--module api.endpoints] [--top 15]
+                                          [--runs 3] [--json] [--max-ms 1500]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure(module: str) -> Tuple[float, List[Dict]]:
+    """Import ``module`` in a fresh interpreter
+
+    Returns the wall-clock time in ms and the per-module import timings.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append(
+            {
+                "module": name.strip(),
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+    return wall_ms, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="api.endpoints")
+    parser.add_argument("--top", type=int, default=15, help="Heaviest modules to list")
+    parser.add_argument("--runs", type=int, default=3, help="Runs; the fastest is kept")
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report")
+    parser.add_argument(
+        "--max-ms", type=float, default=None, help="Exit non-zero above this import time"
+    )
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(args.runs, 1))]
+    wall_ms, modules = min(runs, key=lambda run: run[0])
+    total = next(m for m in modules if m["module"] == args.module)
+    heaviest = sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)
+    # Only top-level packages, otherwise the list is the same chain repeated
+    top_level = [m for m in heaviest if "." not in m["module"]][: args.top]
+
+    report = {
+        "module": args.module,
+        "import_ms": total["cumulative_ms"],
+        "wall_ms": wall_ms,
+        "heaviest_packages": top_level,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{args.module}: {report['import_ms']:.1f} ms import, {wall_ms:.1f} ms wall")
+        for m in top_level:
+            print(f"  {m['cumulative_ms']:9.1f} ms  {m['module']}")
+
+    if args.max_ms is not None and report["import_ms"] > args.max_ms:
+        print(f"Import time exceeds budget of {args.max_ms:.0f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 import os
+from typing import Dict, List, Optional
 
 from celery import Celery
+from celery.signals import worker_init
 
 
 def _get_env(name: str, default: str) -> str:
@@ -8,13 +10,171 @@ def _get_env(name: str, default: str) -> str:
     return value if value else default
 
 
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
 celery_app = Celery(
     "terraweave",
     broker=_get_env("REDIS_URL", "redis://redis:6379/0"),
-    backend=_get_env("REDIS_URL", "redis://redis:6379/0"),
+    backend=_get_env("CELERY_RESULT_BACKEND", _get_env("REDIS_URL", "redis://redis:6379/0")),
 )
+celery_app.conf.update(
+    task_track_started=True,
+    # Eager mode runs tasks inline, e.g. for tests without a broker; storing
+    # eager results keeps /tasks/status working when a result backend exists
+    task_always_eager=_env_flag("CELERY_TASK_ALWAYS_EAGER"),
+    task_store_eager_result=_env_flag("CELERY_TASK_STORE_EAGER_RESULT"),
+)
+
+LCA_CHUNK_SIZE = 1000
+RESCORE_CHUNK_SIZE = 10000
+
+
+def _shared_catalog_error() -> Optional[str]:
+    """Why a worker cannot see the API's catalog, or None if it can"""
+    if os.getenv("DATABASE_URL"):
+        return None
+    return (
+        "Celery workers need DATABASE_URL: without a shared database every worker "
+        "builds its own empty in-memory catalog, so rescoring and catalog-based "
+        "design optimization would silently do nothing"
+    )
+
+
+@worker_init.connect
+def _check_shared_catalog(**kwargs):
+    """Refuse to start a worker that would run catalog tasks against an empty catalog"""
+    error = _shared_catalog_error()
+    if error:
+        # Celery logs and swallows exceptions from signal handlers, not SystemExit
+        raise SystemExit(error)
+
+
+def _services():
+    """Engines shared with the API process
+
+    Imported lazily: the API module imports this one to enqueue tasks. A worker
+    process gets its own engines, so it only shares the API's catalog through
+    the database backend (DATABASE_URL), which is checked at worker startup;
+    eager tasks run in the API process itself.
+    """
+    from api.endpoints import design_engine, lca_engine, material_db
+
+    return lca_engine, material_db, design_engine
+
+
+def _report_progress(task, current: int, total: int, stage: str):
+    """Publish a PROGRESS state with partial-completion metadata"""
+    if task.request.is_eager and not celery_app.conf.task_store_eager_result:
+        return
+    task.update_state(
+        state="PROGRESS",
+        meta={
+            "stage": stage,
+            "current": current,
+            "total": total,
+            "percent": 100.0 * current / total if total else 100.0,
+        },
+    )
 
 
 @celery_app.task
 def ping() -> str:
     return "pong"
+
+
+@celery_app.task(bind=True)
+def optimize_design_task(
+    self,
+    building_data: Dict,
+    max_budget: Optional[float] = None,
+    max_carbon: Optional[float] = None,
+    evolution_overrides: Optional[Dict] = None,
+    mode: str = "evolutionary",
+    top_k: int = 10,
+) -> Dict:
+    """Run ``/design/optimize`` off the request path, reporting GA generations"""
+    from dataclasses import replace
+
+    from core.generative_design import DesignConstraint
+
+    _, _, design_engine = _services()
+    constraints = DesignConstraint(
+        max_budget=max_budget or float("inf"), max_carbon=max_carbon or float("inf")
+    )
+    area = building_data["area"]
+
+    if mode == "exact":
+        _report_progress(self, 0, 1, "solving")
+        solution = design_engine.solve_exact(building_data, constraints)
+        alternatives = [solution.alternative] if solution.alternative else []
+        response = {
+            "status": solution.status,
+            "infeasible_reason": solution.reason,
+            "nodes_explored": solution.nodes_explored,
+        }
+    else:
+        config = replace(design_engine.evolution_config, **(evolution_overrides or {}))
+        alternatives = design_engine.optimize_material_selection(
+            building_data,
+            constraints,
+            config,
+            progress=lambda generation, total: _report_progress(
+                self, generation, total, "evolving"
+            ),
+        )
+        response = {}
+
+    response.update(
+        {
+            "alternatives": [alt.to_json(area) for alt in alternatives[:top_k]],
+            "building_area": area,
+        }
+    )
+    return response
+
+
+@celery_app.task(bind=True)
+def batch_lca_task(
+    self,
+    materials: List[Dict],
+    chunk_size: int = LCA_CHUNK_SIZE,
+    method: Optional[str] = None,
+) -> Dict:
+    """Batched LCA in fixed-size chunks, returned column-wise like the sync endpoint"""
+    from core.lca_engine import LCAMethod
+
+    lca_engine, _, _ = _services()
+    lca_method = LCAMethod(method) if method else None
+
+    columns: Dict[str, list] = {}
+    for start in range(0, len(materials), chunk_size):
+        batch = lca_engine.calculate_carbon_footprint_batch(
+            materials[start : start + chunk_size], lca_method
+        )
+        for name, values in batch.to_dict().items():
+            if name == "method":
+                columns[name] = values
+            else:
+                columns.setdefault(name, []).extend(values)
+        _report_progress(self, min(start + chunk_size, len(materials)), len(materials), "lca")
+
+    return {"count": len(materials), "lca_results": columns}
+
+
+@celery_app.task(bind=True)
+def rescore_catalog_task(
+    self,
+    score_weights: Optional[Dict[str, float]] = None,
+    chunk_size: int = RESCORE_CHUNK_SIZE,
+) -> Dict:
+    """Recompute cached sustainability scores, e.g. after a weight change"""
+    _, material_db, _ = _services()
+
+    rescored = material_db.rescore_materials(
+        score_weights,
+        chunk_size=chunk_size,
+        progress=lambda done, total: _report_progress(self, done, total, "rescoring"),
+    )
+    return {"rescored": rescored, "score_weights": material_db.score_weights}
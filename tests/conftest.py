@@ -0,0 +1,54 @@
+import os
+import random
+from typing import Dict, List
+
+import pytest
+
+# Celery tasks run inline with results kept in memory, so no broker is needed
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "1")
+os.environ.setdefault("CELERY_TASK_STORE_EAGER_RESULT", "1")
+os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+
+from core.lca_engine import LCAEngine
+from core.material_database import MaterialDatabase
+
+CATEGORIES = ["foundation", "structure", "walls", "insulation", "roofing", "flooring"]
+INGREDIENTS = ["concrete", "steel", "wood", "bamboo", "mycelium", "unknown"]
+CERTIFICATIONS = ["LEED", "BREEAM", "Cradle to Cradle", "FSC", "GreenGuard", "leed"]
+PROCESSES = ["traditional", "low_energy", "carbon_capture", "renewable_energy", "standard"]
+
+
+def material_data(count: int, seed: int = 0) -> List[Dict]:
+    """Random but reproducible registration payloads"""
+    rng = random.Random(seed)
+    materials = []
+    for i in range(count):
+        materials.append(
+            {
+                "name": f"Material {i}",
+                "category": rng.choice(CATEGORIES),
+                "composition": {
+                    ingredient: rng.uniform(1, 100)
+                    for ingredient in rng.sample(INGREDIENTS, rng.randint(1, 4))
+                },
+                "manufacturing_process": rng.choice(PROCESSES),
+                "transportation_distance": rng.uniform(0, 2000),
+                "recycled_content": rng.uniform(0, 100),
+                "cost_per_unit": rng.uniform(1, 500),
+                "supplier_id": f"SUP_{rng.randint(0, 9)}",
+                "certifications": rng.sample(CERTIFICATIONS, rng.randint(0, 3)),
+            }
+        )
+    return materials
+
+
+@pytest.fixture(scope="session")
+def lca_engine() -> LCAEngine:
+    return LCAEngine()
+
+
+@pytest.fixture
+def catalog(lca_engine) -> MaterialDatabase:
+    database = MaterialDatabase()
+    database.add_materials(material_data(300), lca_engine)
+    return database
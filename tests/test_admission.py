@@ -0,0 +1,105 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from api.middleware.admission import AdmissionController, RouteLimit
+
+
+def test_stream_holds_its_slot_until_exhausted():
+    admission = AdmissionController(
+        max_workers=2, max_pending=1, limits={"/stream": RouteLimit(max_concurrency=1)}
+    )
+
+    async def scenario():
+        items = await admission.stream("/stream", iter(range(3)))
+        with pytest.raises(HTTPException) as rejected:
+            await admission.stream("/stream", iter(()))
+        assert rejected.value.status_code == 503
+        assert [item async for item in items] == [0, 1, 2]
+        again = await admission.stream("/stream", iter(["x"]))
+        return [item async for item in again]
+
+    try:
+        assert asyncio.run(scenario()) == ["x"]
+        route = admission.metrics()["routes"]["/stream"]
+        assert (route["admitted"], route["rejected"], route["running"]) == (2, 1, 0)
+    finally:
+        admission.shutdown()
+
+
+def test_stream_closes_an_abandoned_generator():
+    admission = AdmissionController(max_workers=1)
+    closed = []
+
+    def produce():
+        try:
+            yield from range(10)
+        finally:
+            closed.append(True)
+
+    async def scenario():
+        items = await admission.stream("/stream", produce())
+        async for item in items:
+            if item == 2:
+                break
+        await items.aclose()
+
+    try:
+        asyncio.run(scenario())
+        admission.executor.submit(lambda: None).result()
+        assert closed == [True]
+        assert admission.metrics()["routes"]["/stream"]["running"] == 0
+    finally:
+        admission.shutdown()
+
+
+@pytest.mark.parametrize(
+    "method, path",
+    [
+        ("GET", "/integrity/root"),
+        ("GET", "/materials/{material_id}/proof"),
+        ("DELETE", "/materials/{material_id}"),
+        ("GET", "/suppliers/leaderboard"),
+        ("GET", "/suppliers/SUP_1/analytics"),
+        ("POST", "/suppliers/register"),
+    ],
+)
+def test_catalog_routes_wait_for_the_lock_off_the_event_loop(catalog, monkeypatch, method, path):
+    from api import endpoints
+
+    monkeypatch.setattr(endpoints, "material_db", catalog)
+    path = path.format(material_id=next(iter(catalog.materials)))
+    body = {"name": "Acme", "contact": {"email": "a@example.com"}, "specialties": ["timber"]}
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_write_lock():
+        with catalog._lock.write():
+            locked.set()
+            release.wait(5)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=endpoints.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            blocked = asyncio.ensure_future(
+                client.request(method, path, json=body if method == "POST" else None)
+            )
+            await asyncio.sleep(0.05)
+            # The event loop keeps serving while the catalog route waits on the pool
+            health = await asyncio.wait_for(client.get("/health"), 2)
+            assert not blocked.done()
+            release.set()
+            return health, await blocked
+
+    holder = threading.Thread(target=hold_write_lock)
+    holder.start()
+    locked.wait(5)
+    try:
+        health, response = asyncio.run(scenario())
+    finally:
+        release.set()
+        holder.join()
+    assert health.status_code == 200
+    assert response.status_code == 200, response.text
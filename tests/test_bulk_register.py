@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.material_database import MaterialDatabase
+
+from .conftest import material_data
+
+
+@pytest.fixture
+def api(monkeypatch):
+    from api import endpoints
+
+    monkeypatch.setattr(endpoints, "material_db", MaterialDatabase())
+    monkeypatch.setattr(endpoints, "BULK_REGISTER_CHUNK_SIZE", 4)
+    return endpoints
+
+
+def register(api, lines):
+    body = "".join(line + "\n" for line in lines).encode()
+    response = TestClient(api.app).post(
+        "/materials/register/bulk", params={"supplier_id": "SUP_1"}, content=body
+    )
+    assert response.status_code == 200
+    *results, summary = map(json.loads, response.text.splitlines())
+    return results, summary["summary"]
+
+
+def test_valid_rows_register_in_line_order(api):
+    materials = material_data(10, seed=3)
+    results, summary = register(api, [json.dumps(m) for m in materials])
+
+    assert summary == {"registered": 10, "failed": 0}
+    assert [r["line"] for r in results] == list(range(1, 11))
+    assert all(r["status"] == "success" for r in results)
+    names = [api.material_db.materials[r["material_id"]].name for r in results]
+    assert names == [m["name"] for m in materials]
+    assert {p.supplier_id for p in api.material_db.materials.values()} == {"SUP_1"}
+
+
+def test_invalid_rows_get_error_results_in_place(api):
+    valid = [json.dumps(m) for m in material_data(6, seed=4)]
+    missing_cost = json.dumps({"name": "No cost", "category": "walls", "composition": {}})
+    lines = [valid[0], "{not json", valid[1], "", missing_cost] + valid[2:]
+    results, summary = register(api, lines)
+
+    assert summary == {"registered": 6, "failed": 2}
+    # Blank lines are skipped but still counted
+    assert [r["line"] for r in results] == [1, 2, 3, 5, 6, 7, 8, 9]
+    assert [r["status"] for r in results] == ["success", "error", "success", "error"] + [
+        "success"
+    ] * 4
+    assert len(api.material_db.materials) == 6
+
+
+def test_empty_body_registers_nothing(api):
+    results, summary = register(api, [])
+    assert results == []
+    assert summary == {"registered": 0, "failed": 0}
+
+
+def test_fallback_keeps_rows_a_failed_bulk_store_did_store(api, monkeypatch):
+    catalog = api.material_db
+    store = catalog._store_passports
+
+    def fail_after_first(passports):
+        store(passports[:1])
+        if len(passports) > 1:
+            raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(catalog, "_store_passports", fail_after_first)
+    results, summary = register(api, [json.dumps(m) for m in material_data(4, seed=5)])
+
+    assert summary == {"registered": 4, "failed": 0}
+    assert len(catalog.materials) == 4
+    assert sorted(catalog.materials) == sorted(r["material_id"] for r in results)
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from core.characterization import INDICATORS, CharacterizationMatrix
+from core.lca_engine import LCAEngine, LCAMethod
+
+FACTORS = {
+    "steel": {"GWP": 2.0, "AP": 0.01, "EP": 0.003, "water": 5.0, "CED": 20.0, "TRACI:EP": 0.05},
+    "wood": {
+        "GWP100": -1.0,
+        "acidification": 0.002,
+        "eutrophication": 0.001,
+        "water use": 1.0,
+        "energy": 3.0,
+    },
+    "glass": {"climate change": 0.8, "AP": 0.004, "Impact World+:GWP": 0.9},
+}
+COMPOSITIONS = [
+    {"steel": 50, "wood": 50},
+    {"wood": 100, "unknown": 20},
+    {"glass": 30, "steel": 10, "wood": 60},
+    {},
+]
+# TRACI eutrophication is in kg N eq: 7.29 kg N eq per kg P, which is 3.06 kg PO4 eq
+TRACI_EP = 7.29 / 3.06
+
+# Dense ingredient x (GWP, AP, EP, water, energy) factors per method, by hand
+DENSE = {
+    "CML": {
+        "steel": [2.0, 0.01, 0.003, 5.0, 20.0],
+        "wood": [-1.0, 0.002, 0.001, 1.0, 3.0],
+        "glass": [0.8, 0.004, 0.0, 0.0, 0.0],
+    },
+    "TRACI": {
+        "steel": [2.0, 0.01, 0.05, 5.0, 20.0],
+        "wood": [-1.0, 0.002, 0.001 * TRACI_EP, 1.0, 3.0],
+        "glass": [0.8, 0.004, 0.0, 0.0, 0.0],
+    },
+    "Impact World+": {
+        "steel": [2.0, 0.01, 0.003, 5.0, 20.0],
+        "wood": [-1.0, 0.002, 0.001, 1.0, 3.0],
+        "glass": [0.9, 0.004, 0.0, 0.0, 0.0],
+    },
+}
+DENSE["Ecoinvent"] = DENSE["CML"]
+
+
+def dense_totals(compositions, method):
+    ingredients = list(FACTORS)
+    shares = np.array([[c.get(i, 0) / 100 for i in ingredients] for c in compositions])
+    factors = np.array([DENSE[method][i] for i in ingredients])
+    return shares @ factors
+
+
+def lookup(ingredients):
+    return {i: FACTORS[i] for i in ingredients if i in FACTORS}
+
+
+@pytest.mark.parametrize("method", [m.value for m in LCAMethod])
+def test_totals_match_a_dense_reference(method):
+    # A small capacity makes the matrix grow while ingredients are added
+    matrix = CharacterizationMatrix(method, capacity=1)
+    totals = matrix.totals(COMPOSITIONS, lookup)
+    assert totals.shape == (len(COMPOSITIONS), len(INDICATORS))
+    np.testing.assert_allclose(totals, dense_totals(COMPOSITIONS, method), rtol=1e-12)
+
+    # Each composition on its own gives exactly its row of the batch
+    for i, composition in enumerate(COMPOSITIONS):
+        assert (matrix.totals([composition], lookup)[0] == totals[i]).all()
+
+
+@pytest.mark.parametrize("method", list(LCAMethod))
+def test_engine_characterizes_with_its_impact_factors(method):
+    engine = LCAEngine(db_path="missing.db")
+    engine.impact_factors = FACTORS
+    np.testing.assert_allclose(
+        engine._composition_impacts(COMPOSITIONS, method),
+        dense_totals(COMPOSITIONS, method.value),
+        rtol=1e-12,
+    )
+    result = engine.calculate_carbon_footprint({"composition": COMPOSITIONS[0]}, method)
+    assert result.method == method.value
+    assert result.eutrophication_potential == pytest.approx(
+        dense_totals(COMPOSITIONS[:1], method.value)[0, 2]
+    )
+
+
+def test_new_impact_factors_rebuild_the_matrices():
+    engine = LCAEngine(db_path="missing.db")
+    engine.impact_factors = FACTORS
+    before = engine._composition_impacts(COMPOSITIONS, LCAMethod.TRACI)
+    assert len(engine.characterization(LCAMethod.TRACI)) == 3
+
+    engine.impact_factors = {**FACTORS, "steel": {**FACTORS["steel"], "TRACI:EP": 0.5}}
+    assert len(engine.characterization(LCAMethod.TRACI)) == 0
+    after = engine._composition_impacts(COMPOSITIONS, LCAMethod.TRACI)
+
+    changed = np.zeros_like(before, dtype=bool)
+    changed[[0, 2], 2] = True
+    np.testing.assert_allclose(after[~changed], before[~changed])
+    np.testing.assert_allclose(after[:, 2], before[:, 2] + [0.225, 0.0, 0.045, 0.0])
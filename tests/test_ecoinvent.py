@@ -0,0 +1,114 @@
+import sqlite3
+
+import pytest
+
+from data.ecoinvent_integration import EcoinventDatabase, ingest, normalize_indicator
+
+CML_EXPORT = """activity name,impact category,amount,unit,method
+"Market for concrete, normal",water depletion,0.5,m3,CML 2001
+"Market for concrete, normal",freshwater aquatic ecotoxicity,9.0,kg 1.4-DCB eq,CML 2001
+"Market for concrete, normal",eutrophication - generic,0.02,kg PO4 eq,CML 2001
+"Market for concrete, normal",eutrophication: freshwater,0.004,kg P eq,CML 2001
+"Market for concrete, normal",eutrophication: marine,0.007,kg N eq,CML 2001
+"Market for concrete, normal",climate change GWP 100a,250,kg CO2 eq,CML 2001
+"Market for concrete, normal",climate change GWP 20a,300,kg CO2 eq,CML 2001
+"""
+
+SPOLD = """<?xml version="1.0" encoding="UTF-8"?>
+<ecoSpold xmlns="http://www.EcoInvent.org/EcoSpold02">
+  <activityDataset>
+    <activityDescription><activity activityName="Steel, low-alloyed"/></activityDescription>
+    <flowData>
+      <impactIndicator amount="1.9">
+        <impactMethodName>TRACI</impactMethodName>
+        <impactCategoryName>climate change</impactCategoryName>
+        <name>GWP 100a</name>
+        <unitName>kg CO2-Eq</unitName>
+      </impactIndicator>
+      <impactIndicator amount="0.3">
+        <impactMethodName>TRACI</impactMethodName>
+        <impactCategoryName>water</impactCategoryName>
+        <name>freshwater ecotoxicity</name>
+      </impactIndicator>
+    </flowData>
+  </activityDataset>
+</ecoSpold>
+"""
+
+
+@pytest.mark.parametrize(
+    "name, indicator",
+    [
+        ("Climate change GWP 100a", "GWP"),
+        ("global warming (GWP100)", "GWP"),
+        ("climate change GWP 500a", "climate change GWP 500a"),
+        ("Climate change - fossil", "Climate change - fossil"),
+        ("acidification potential - average European", "AP"),
+        ("eutrophication - generic", "EP"),
+        ("eutrophication: freshwater", "eutrophication: freshwater"),
+        ("freshwater eutrophication", "freshwater eutrophication"),
+        ("water depletion", "water"),
+        ("freshwater aquatic ecotoxicity", "freshwater aquatic ecotoxicity"),
+        ("water freshwater ecotoxicity", "water freshwater ecotoxicity"),
+        ("Cumulative energy demand", "energy"),
+        ("wastewater treatment", "wastewater treatment"),
+        ("TRACI:Eutrophication", "TRACI:EP"),
+    ],
+)
+def test_normalize_indicator(name, indicator):
+    assert normalize_indicator(name) == indicator
+
+
+def factors(path):
+    with sqlite3.connect(path) as conn:
+        return {
+            (ingredient, indicator): value
+            for ingredient, indicator, value in conn.execute(
+                "SELECT ingredient, indicator, value FROM impact_factors"
+            )
+        }
+
+
+def test_toxicity_and_subcategories_keep_their_own_rows(tmp_path):
+    export = tmp_path / "cml.csv"
+    export.write_text(CML_EXPORT)
+    db = tmp_path / "factors.db"
+    written = ingest(db, [export], aliases={"market for concrete, normal": "concrete"})
+
+    stored = factors(db)
+    assert written == len(stored)
+    assert stored[("concrete", "water")] == 0.5
+    assert stored[("concrete", "CML:water")] == 0.5
+    assert stored[("concrete", "EP")] == 0.02
+    assert stored[("concrete", "eutrophication: freshwater")] == 0.004
+    assert stored[("concrete", "eutrophication: marine")] == 0.007
+    assert stored[("concrete", "freshwater aquatic ecotoxicity")] == 9.0
+    assert stored[("concrete", "GWP")] == 250
+    assert stored[("concrete", "climate change GWP 20a")] == 300
+
+    database = EcoinventDatabase(db)
+    try:
+        assert database["concrete"]["water"] == 0.5
+        assert database.factor_count == written
+    finally:
+        database.close()
+
+
+def test_ingest_counts_distinct_factors(tmp_path):
+    export = tmp_path / "wide.csv"
+    export.write_text("material,GWP,water use\nBrick,0.2,1.0\nbrick,0.25,\nBRICK ,0.3,1.5\n")
+    spold = tmp_path / "steel.spold"
+    spold.write_text(SPOLD)
+    db = tmp_path / "factors.db"
+
+    # Each source twice: repeated pairs replace earlier values but count once
+    written = ingest(db, [export, spold, tmp_path], batch_size=2)
+
+    stored = factors(db)
+    assert written == len(stored) == 6
+    assert stored[("brick", "GWP")] == 0.3
+    assert stored[("brick", "water")] == 1.5
+    assert stored[("steel, low-alloyed", "GWP")] == 1.9
+    assert stored[("steel, low-alloyed", "TRACI:GWP")] == 1.9
+    assert ("steel, low-alloyed", "water") not in stored
+    assert stored[("steel, low-alloyed", "water freshwater ecotoxicity")] == 0.3
@@ -0,0 +1,94 @@
+import pytest
+
+from core.generative_design import DesignAlternative
+from integrations.base import SAMPLE_BUILDINGS, ClientConfig, IntegrationClient
+from integrations.revit_api import RevitIntegration
+from integrations.rhino_api import RhinoIntegration
+from integrations.stub_server import StubServer
+
+SCHEDULE = """Category,Material,Volume,Area
+Walls,Concrete C30/37,10.5,40
+Walls,Concrete C30/37,4.5 m3,20
+Floors,Timber boards,3,60
+Structural Framing,Steel S355,2,0
+Walls,Mineral wool batt,1.5,40
+Furniture,Oak,1,1
+"""
+
+
+def alternative(i):
+    return DesignAlternative(
+        material_selections={
+            "walls": f"wall-{i}",
+            "roofing": f"roof-{i}",
+            "flooring": f"floor-{i}",
+        },
+        total_cost=100.0 + i,
+        total_carbon=10.0 + i,
+        sustainability_score=0.5,
+        tradeoffs={},
+    )
+
+
+@pytest.mark.parametrize("cls", [RevitIntegration, RhinoIntegration])
+def test_sample_building_without_an_export(cls, tmp_path):
+    with cls("key") as client:
+        assert client.base_url == cls.default_base_url
+        data = client.export_building_data(str(tmp_path / "model.rvt"))
+        assert data == SAMPLE_BUILDINGS[cls.name]
+
+        # Callers get their own copy to edit
+        data["components"]["walls"]["volume"] = 0
+        assert client.export_building_data("missing")["components"]["walls"]["volume"] > 0
+
+
+def test_export_runs_the_takeoff(tmp_path):
+    path = tmp_path / "tower.csv"
+    path.write_text(SCHEDULE)
+    with RevitIntegration("key") as client:
+        data = client.export_building_data(str(path), chunk_size=2)
+
+    assert data["project_name"] == "tower"
+    walls = data["components"]["walls"]
+    assert walls["volume"] == pytest.approx(15.0)
+    assert walls["material"] == "concrete"
+    assert data["components"]["insulation"]["volume"] == pytest.approx(1.5)
+    assert data["components"]["flooring"]["material"] == "timber"
+    assert data["area"] == pytest.approx(60)
+    assert data["takeoff"]["element_count"] == 6
+    assert data["takeoff"]["unmapped_categories"] == {"Furniture": 1}
+
+
+def test_generic_client_needs_an_export(tmp_path):
+    with IntegrationClient("key", "http://localhost/") as client:
+        assert client.base_url == "http://localhost"
+        with pytest.raises(FileNotFoundError):
+            client.export_building_data(str(tmp_path / "model.3dm"))
+
+
+def test_push_alternatives_batches_every_update():
+    with StubServer().start() as server:
+        config = ClientConfig(batch_size=4, max_concurrency=3)
+        with RhinoIntegration("key", server.url, config) as client:
+            result = client.push_alternatives([alternative(i) for i in range(5)])
+        stats = server.stats()
+
+    assert result.status == "success"
+    assert (result.updates, result.requests) == (15, 4)
+    assert stats["updates"] == 15
+    assert stats["alternatives"] == 5
+
+
+def test_failed_batches_are_retried_and_applied_once():
+    with StubServer(failure_rate=0.3, seed=7) as server:
+        config = ClientConfig(batch_size=3, max_retries=10, backoff_factor=0)
+        with RevitIntegration("key", server.url, config) as client:
+            result = client.push_alternatives([alternative(i) for i in range(20)])
+            # Re-sending the same batches is recognised by their keys
+            client.push_alternatives([alternative(i) for i in range(20)])
+        stats = server.stats()
+
+    assert result.status == "success"
+    assert stats["failures"] > 0
+    assert stats["updates"] == 60
+    assert stats["duplicates"] >= result.requests
@@ -0,0 +1,111 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from core.integrity import EMPTY_LEAF, InclusionProof, MerkleTree
+from core.material_database import MaterialDatabase
+from core.sql_database import SQLMaterialDatabase
+
+from .conftest import material_data
+
+
+def churn(database, lca_engine, rounds=5, seed=0):
+    """Add, update and remove materials like a live catalog would"""
+    rng = random.Random(seed)
+    for i in range(rounds):
+        database.add_materials(material_data(rng.randint(1, 40), seed=seed + i), lca_engine)
+        ids = list(database.materials)
+        for material_id in rng.sample(ids, min(3, len(ids))):
+            database.remove_material(material_id)
+        database.update_material(rng.choice(list(database.materials)), cost_per_unit=rng.random())
+
+
+def expected_root(database: SQLMaterialDatabase) -> str:
+    """Root of a tree built from scratch, one leaf per row id"""
+    size = database._query("SELECT value FROM catalog_meta WHERE key = 'merkle_size'")[0][0]
+    leaves = np.zeros((size, 32), dtype=np.uint8)
+    for row_id, passport in database._query("SELECT row_id, passport FROM materials"):
+        digest = bytes.fromhex(json.loads(passport)["blockchain_hash"])
+        leaves[row_id - 1] = np.frombuffer(digest, dtype=np.uint8)
+    return MerkleTree(leaves).root
+
+
+@pytest.fixture
+def sql_catalog():
+    database = SQLMaterialDatabase("sqlite://")
+    yield database
+    database.close()
+
+
+def test_proofs_verify_against_the_root(lca_engine, sql_catalog):
+    memory = MaterialDatabase()
+    for database in (memory, sql_catalog):
+        churn(database, lca_engine)
+        root = database.merkle_root()
+        for material_id in database.materials:
+            proof = database.inclusion_proof(material_id)
+            assert proof.root == root
+            assert proof.leaf == database.materials[material_id].blockchain_hash
+            assert proof.verify()
+
+        tampered = InclusionProof(**{**proof.to_dict(), "leaf": EMPTY_LEAF.hex()})
+        assert not tampered.verify()
+        with pytest.raises(KeyError):
+            database.inclusion_proof("missing")
+
+    assert sql_catalog.merkle_root() == expected_root(sql_catalog)
+    assert sql_catalog.verify_integrity().to_dict()["root"] == sql_catalog.merkle_root()
+
+
+def test_sql_tree_matches_memory_for_the_same_history(lca_engine, sql_catalog):
+    memory = MaterialDatabase()
+    assert sql_catalog.merkle_root() == memory.merkle_root()
+    rng = random.Random(5)
+    for i in range(6):
+        passports = memory.add_materials(material_data(rng.randint(1, 50), seed=i), lca_engine)
+        sql_catalog._store_passports(passports)
+        for material_id in rng.sample(list(memory.materials), 4):
+            memory.remove_material(material_id)
+            sql_catalog.remove_material(material_id)
+        assert sql_catalog.merkle_root() == memory.merkle_root()
+
+
+def test_root_survives_a_snapshot_reload(lca_engine, tmp_path):
+    database = MaterialDatabase()
+    churn(database, lca_engine, seed=11)
+    root = database.merkle_root()
+    database.save_snapshot(tmp_path / "snapshot")
+    loaded = MaterialDatabase.load_snapshot(tmp_path / "snapshot")
+
+    assert loaded.merkle_root() == root
+    assert loaded.verify_integrity().to_dict()["valid"]
+    for material_id in list(database.materials)[:20]:
+        assert loaded.inclusion_proof(material_id) == database.inclusion_proof(material_id)
+
+    # Removed materials keep their positions vacant after the reload too
+    victim = next(iter(database.materials))
+    database.remove_material(victim)
+    loaded.remove_material(victim)
+    assert loaded.merkle_root() == database.merkle_root()
+    (added,) = loaded.add_materials(material_data(1, seed=99), lca_engine)
+    proof = loaded.inclusion_proof(added.id)
+    assert proof.index == database.merkle.size and proof.verify()
+
+
+def test_tree_is_built_for_catalogs_stored_without_one(lca_engine, tmp_path):
+    url = f"sqlite:///{tmp_path / 'materials.db'}"
+    database = SQLMaterialDatabase(url)
+    churn(database, lca_engine, seed=3)
+    database._execute("DROP TABLE merkle_nodes")
+    database._execute("DROP TABLE catalog_meta")
+    database.close()
+
+    reopened = SQLMaterialDatabase(url)
+    try:
+        assert reopened.merkle_root() == expected_root(reopened)
+        for material_id in reopened.materials:
+            assert reopened.inclusion_proof(material_id).verify()
+    finally:
+        reopened.close()
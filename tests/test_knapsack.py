@@ -0,0 +1,60 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from core.knapsack import solve_multiple_choice_knapsack
+
+
+def brute_force(costs, values, budget):
+    """Lowest total value over every combination within budget, or None"""
+    best = None
+    for choice in itertools.product(*(range(len(cost)) for cost in costs)):
+        cost = sum(costs[c][j] for c, j in enumerate(choice))
+        value = sum(values[c][j] for c, j in enumerate(choice))
+        if cost <= budget and (best is None or value < best):
+            best = value
+    return best
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_solution_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(25):
+        classes = rng.integers(1, 5)
+        # Small integers, so ties and dominated candidates are common
+        costs = [rng.integers(1, 10, rng.integers(1, 6)).astype(float) for _ in range(classes)]
+        values = [rng.integers(0, 10, len(cost)).astype(float) for cost in costs]
+        budget = float(rng.integers(classes, 10 * classes))
+
+        solution = solve_multiple_choice_knapsack(costs, values, budget)
+        expected = brute_force(costs, values, budget)
+        if expected is None:
+            assert solution.status == "infeasible" and solution.choices is None
+            continue
+
+        assert solution.status == "optimal"
+        assert solution.total_value == pytest.approx(expected)
+        chosen = [(cost[j], value[j]) for cost, value, j in zip(costs, values, solution.choices)]
+        assert solution.total_cost == pytest.approx(sum(c for c, _ in chosen))
+        assert solution.total_value == pytest.approx(sum(v for _, v in chosen))
+        assert solution.total_cost <= budget
+
+
+def test_empty_class_is_infeasible():
+    solution = solve_multiple_choice_knapsack([np.array([1.0]), np.array([])], [[1.0], []], 10)
+    assert solution.status == "infeasible"
+
+
+def test_node_limit_returns_a_feasible_design():
+    rng = np.random.default_rng(7)
+    costs = [rng.uniform(1, 10, 8) for _ in range(12)]
+    values = [rng.uniform(0, 10, 8) for _ in range(12)]
+    budget = 60.0
+    solution = solve_multiple_choice_knapsack(costs, values, budget, max_nodes=3)
+    assert solution.status == "node_limit"
+    assert solution.total_cost <= budget
+    assert solution.total_value == pytest.approx(
+        sum(value[j] for value, j in zip(values, solution.choices))
+    )
+    assert solution.total_value >= solve_multiple_choice_knapsack(costs, values, budget).total_value
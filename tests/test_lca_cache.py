@@ -0,0 +1,92 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from core import lca_cache
+from core.lca_cache import LRUTTLCache
+from core.lca_engine import LCAEngine, LCAMethod
+
+SPEC = {
+    "name": "Beam",
+    "composition": {"steel": 60, "concrete": 40},
+    "manufacturing_process": "low_energy",
+    "transportation_distance": 120,
+    "recycled_content": 30,
+}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lca_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hits_misses_and_lru_eviction(clock):
+    cache = LRUTTLCache(maxsize=2, ttl=None)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now the most recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (3, 2, 1, 2)
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = LRUTTLCache(maxsize=10, ttl=60)
+    cache.put("a", 1)
+    clock[0] += 59
+    assert cache.get("a") == 1
+    clock[0] += 1
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_equivalent_specs_share_an_assessment():
+    engine = LCAEngine(db_path="missing.db")
+    first = engine.assess_material(SPEC)
+    reordered = dict(reversed(list(SPEC.items())), transportation_distance=120.0, name="Column")
+    assert engine.assess_material(reordered) is first
+    assert engine.assess_material({**SPEC, "recycled_content": 31}) is not first
+    assert engine.assess_material(SPEC, LCAMethod.TRACI) is not first
+    assert engine.cache_stats()["hits"] == 1
+
+
+def test_replacing_impact_factors_invalidates_cached_assessments():
+    engine = LCAEngine(db_path="missing.db")
+    before = engine.assess_material(SPEC)
+
+    # Assigning equal factors keeps the cache
+    engine.impact_factors = dict(LCAEngine.DEFAULT_IMPACT_FACTORS)
+    assert engine.assess_material(SPEC) is before
+
+    with pytest.raises(TypeError):
+        engine.impact_factors["steel"]["GWP"] = 3.7
+    with pytest.raises(TypeError):
+        engine.impact_factors["steel"] = {"GWP": 3.7}
+
+    engine.impact_factors = {
+        **engine.impact_factors,
+        "steel": {**engine.impact_factors["steel"], "GWP": 3.7},
+    }
+    after = engine.assess_material(SPEC)
+    assert after.lca_result.embodied_carbon > before.lca_result.embodied_carbon
+    assert after.lca_result == engine.calculate_carbon_footprint(SPEC)
+
+
+def test_materials_with_equal_inputs_keep_their_own_ids():
+    from api import endpoints
+
+    client = TestClient(endpoints.app)
+    payload = {"category": "structure", "cost_per_unit": 10, **SPEC}
+    first = client.post("/materials/calculate-lca", json=payload).json()
+    second = client.post("/materials/calculate-lca", json={**payload, "name": "Column"}).json()
+    again = client.post("/materials/calculate-lca", json=payload).json()
+
+    assert first["lca_results"] == second["lca_results"]
+    assert first["material_id"] != second["material_id"]
+    assert again["material_id"] == first["material_id"]
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from core.lca_engine import LCAEngine, LCAMethod
+
+INGREDIENTS = ["concrete", "steel", "wood", "bamboo", "mycelium", "unknown"]
+HAZARDS = ["VOC", "formaldehyde", "lead", "asbestos", "phthalates", "mercury"]
+PROCESSES = ["traditional", "low_energy", "carbon_capture", "circular", "standard", "other"]
+
+
+def random_spec(rng: random.Random):
+    """Registration data with fields missing, zero or integral at random"""
+
+    def quantity(high):
+        roll = rng.random()
+        return 0 if roll < 0.15 else rng.randint(1, high) if roll < 0.3 else rng.uniform(0, high)
+
+    spec = {}
+    if rng.random() < 0.9:
+        spec["composition"] = {
+            ingredient: quantity(100)
+            for ingredient in rng.sample(INGREDIENTS, rng.randint(0, len(INGREDIENTS)))
+        }
+    if rng.random() < 0.7:
+        spec["manufacturing_process"] = rng.choice(PROCESSES)
+    if rng.random() < 0.7:
+        spec["transportation_distance"] = quantity(3000)
+    if rng.random() < 0.7:
+        spec["recycled_content"] = quantity(100)
+    if rng.random() < 0.5:
+        spec["recyclability"] = quantity(100)
+    if rng.random() < 0.5:
+        spec["hazardous_components"] = {
+            hazard: quantity(2) for hazard in rng.sample(HAZARDS, rng.randint(0, 3))
+        }
+    return spec
+
+
+@pytest.mark.parametrize("method", list(LCAMethod))
+def test_batch_matches_the_scalar_path_exactly(lca_engine, method):
+    rng = random.Random(method.value)
+    specs = [random_spec(rng) for _ in range(300)]
+    batch = lca_engine.calculate_carbon_footprint_batch(specs, method)
+
+    assert len(batch) == len(specs)
+    for i, spec in enumerate(specs):
+        assert batch[i] == lca_engine.calculate_carbon_footprint(spec, method), spec
+
+
+def test_empty_batch(lca_engine):
+    batch = lca_engine.calculate_carbon_footprint_batch([])
+    assert len(batch) == 0
+    assert batch.to_results() == []
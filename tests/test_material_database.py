@@ -0,0 +1,167 @@
+import random
+import threading
+
+import pytest
+
+from core.integrity import MerkleTree
+from core.material_database import MaterialDatabase
+
+from .conftest import CATEGORIES, material_data
+
+
+def brute_force_search(database: MaterialDatabase, filters):
+    """Reference filtering over the passports, as search_materials behaved before the column store"""
+    results = []
+    for passport in database.materials.values():
+        lca = passport.lca_results
+        certifications = {cert.value for cert in passport.certifications}
+        if "category" in filters and passport.category != filters["category"]:
+            continue
+        if "supplier_id" in filters and passport.supplier_id != filters["supplier_id"]:
+            continue
+        if lca.get("embodied_carbon", float("inf")) > filters.get("max_carbon", float("inf")):
+            continue
+        if lca.get("recycled_content", 0) < filters.get("min_recycled", float("-inf")):
+            continue
+        if not set(filters.get("certifications", [])) <= certifications:
+            continue
+        low, high = filters.get("cost_range", (float("-inf"), float("inf")))
+        if not low <= passport.cost_per_unit <= high:
+            continue
+        results.append(passport)
+    return sorted(results, key=lambda p: p.sustainability_score)
+
+
+def random_filters(rng: random.Random):
+    filters = {}
+    if rng.random() < 0.5:
+        filters["category"] = rng.choice(CATEGORIES + ["unknown"])
+    if rng.random() < 0.3:
+        filters["supplier_id"] = f"SUP_{rng.randint(0, 10)}"
+    if rng.random() < 0.5:
+        filters["max_carbon"] = rng.uniform(-1, 5)
+    if rng.random() < 0.5:
+        filters["min_recycled"] = rng.uniform(0, 100)
+    if rng.random() < 0.4:
+        filters["certifications"] = rng.sample(["LEED", "BREEAM", "FSC", "Nope"], rng.randint(1, 2))
+    if rng.random() < 0.4:
+        low = rng.uniform(0, 400)
+        filters["cost_range"] = (low, low + rng.uniform(0, 200))
+    return filters
+
+
+def assert_matches_brute_force(database, rng, queries=200):
+    for _ in range(queries):
+        filters = random_filters(rng)
+        expected = [p.id for p in brute_force_search(database, filters)]
+        got = [p.id for p in database.search_materials(filters)]
+        assert sorted(got) == sorted(expected), filters
+        scores = [database.materials[i].sustainability_score for i in got]
+        assert scores == sorted(scores)
+
+
+def test_search_matches_brute_force(catalog):
+    assert_matches_brute_force(catalog, random.Random(1))
+
+
+def test_search_after_updates_and_removals(catalog, lca_engine):
+    rng = random.Random(2)
+    ids = list(catalog.materials)
+    for step in range(150):
+        action = rng.random()
+        if action < 0.3:
+            catalog.remove_material(ids.pop(rng.randrange(len(ids))))
+        elif action < 0.6:
+            material_id = rng.choice(ids)
+            lca = dict(
+                catalog.materials[material_id].lca_results, embodied_carbon=rng.uniform(0, 5)
+            )
+            catalog.update_material(
+                material_id, lca_results=lca, category=rng.choice(CATEGORIES), cost_per_unit=step
+            )
+        else:
+            ids.append(catalog.add_material(material_data(1, seed=step)[0], lca_engine).id)
+
+    assert len(catalog.columns.live_rows()) == len(catalog.materials)
+    assert_matches_brute_force(catalog, rng)
+
+
+@pytest.mark.parametrize("sort_by", sorted(MaterialDatabase.SORT_KEYS))
+def test_cursor_pages_cover_the_sorted_results(catalog, sort_by):
+    full = catalog.search_page({}, sort_by=sort_by).results
+    pages, cursor = [], None
+    while True:
+        page = catalog.search_page({}, sort_by=sort_by, limit=37, cursor=cursor)
+        pages.extend(page.results)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert [p.id for p in pages] == [p.id for p in full]
+
+
+def test_cursor_rejects_other_sort_order(catalog):
+    cursor = catalog.search_page({}, sort_by="cost", limit=5).next_cursor
+    with pytest.raises(ValueError):
+        catalog.search_page({}, sort_by="carbon", limit=5, cursor=cursor)
+
+
+def test_concurrent_writes_and_reads_keep_the_catalog_consistent(catalog, lca_engine):
+    errors = []
+
+    def guarded(work):
+        def run():
+            try:
+                work()
+            except Exception as error:  # surfaced by the assertion below
+                errors.append(error)
+
+        return threading.Thread(target=run)
+
+    def write(seed):
+        rng = random.Random(seed)
+        ids = []
+        for step in range(40):
+            if ids and rng.random() < 0.3:
+                catalog.remove_material(ids.pop(rng.randrange(len(ids))))
+            elif ids and rng.random() < 0.3:
+                catalog.update_material(rng.choice(ids), cost_per_unit=rng.uniform(1, 500))
+            else:
+                added = catalog.add_materials(material_data(3, seed=seed * 100 + step), lca_engine)
+                ids += [p.id for p in added]
+
+    def read(seed):
+        rng = random.Random(seed)
+        for _ in range(60):
+            filters = random_filters(rng)
+            page = catalog.search_page(
+                filters, rng.choice(list(MaterialDatabase.SORT_KEYS)), limit=9
+            )
+            low, high = filters.get("cost_range", (float("-inf"), float("inf")))
+            assert all(low <= p.cost_per_unit <= high for p in page.results)
+            summary = catalog.get_dashboard_summary()
+            assert len(summary["top_performing_materials"]) == min(5, summary["total_materials"])
+            catalog.merkle_root()
+
+    threads = [guarded(lambda seed=seed: write(seed)) for seed in range(1, 5)]
+    threads += [guarded(lambda seed=seed: read(seed)) for seed in range(5, 9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(catalog.columns.live_rows()) == len(catalog.materials)
+    assert catalog.get_dashboard_summary()["total_materials"] == len(catalog.materials)
+    assert catalog.merkle_root() == MerkleTree(catalog.columns.leaves()).root
+    assert_matches_brute_force(catalog, random.Random(9))
+
+
+def test_read_lock_cannot_be_upgraded(catalog):
+    with catalog._lock.read():
+        with pytest.raises(RuntimeError):
+            with catalog._lock.write():
+                pass
+    with catalog._lock.write():
+        # The writer may read and write again
+        with catalog._lock.read(), catalog._lock.write():
+            catalog.search_materials({})
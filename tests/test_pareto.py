@@ -0,0 +1,155 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from core.generative_design import (
+    DesignConstraint,
+    EvolutionConfig,
+    GenerativeDesignEngine,
+    design_totals,
+)
+from core.pareto import ParetoArchive, crowding_distance, non_dominated_ranks
+
+
+def brute_force_ranks(points: np.ndarray) -> np.ndarray:
+    """Peel fronts off with the full pairwise dominance matrix"""
+    dominates = (points[:, None] <= points[None]).all(axis=2) & (
+        points[:, None] < points[None]
+    ).any(axis=2)
+    ranks = np.full(len(points), -1)
+    rank = 0
+    while (ranks < 0).any():
+        remaining = ranks < 0
+        front = remaining & ~dominates[remaining].any(axis=0)
+        ranks[front] = rank
+        rank += 1
+    return ranks
+
+
+@pytest.mark.parametrize("objectives", [2, 3])
+def test_ranks_match_brute_force(objectives):
+    rng = np.random.default_rng(objectives)
+    for _ in range(20):
+        # Few distinct values, so ties and duplicate points are common
+        points = rng.integers(0, 6, (60, objectives)).astype(float)
+        assert (non_dominated_ranks(points) == brute_force_ranks(points)).all()
+
+
+def test_crowding_distance_keeps_front_extremes():
+    points = np.array([[0.0, 4.0], [1.0, 2.0], [2.0, 1.0], [4.0, 0.0], [5.0, 5.0]])
+    distance = crowding_distance(points, non_dominated_ranks(points))
+    assert np.isinf(distance[[0, 3, 4]]).all()
+    assert np.isfinite(distance[[1, 2]]).all()
+
+
+@pytest.mark.parametrize("max_rank", [0, 2])
+def test_archive_keeps_the_front_of_everything_offered(max_rank):
+    rng = np.random.default_rng(max_rank)
+    archive = ParetoArchive(n_variables=3, n_objectives=2, max_rank=max_rank, block=17)
+    all_designs, all_points = [], []
+    for _ in range(10):
+        designs = rng.integers(0, 8, (50, 3))
+        points = np.column_stack([designs.sum(axis=1), (7 - designs).prod(axis=1)]).astype(float)
+        archive.add(designs, points)
+        all_designs.append(designs)
+        all_points.append(points)
+
+    designs, first = np.unique(np.concatenate(all_designs), axis=0, return_index=True)
+    points = np.concatenate(all_points)[first]
+    ranks = brute_force_ranks(points)
+    expected = {tuple(d) for d in designs[ranks <= max_rank]}
+    assert {tuple(d) for d in archive.designs} == expected
+    archived_ranks = non_dominated_ranks(archive.points)
+    for design, rank in zip(archive.designs, archived_ranks):
+        assert rank == ranks[np.flatnonzero((designs == design).all(axis=1))[0]]
+
+
+def brute_force_front(engine, building, constraints, max_rank=0):
+    """(cost, carbon) of every feasible top-10 candidate combination up to max_rank"""
+    candidates = engine._collect_candidates(building["components"], constraints, limit=10)
+    totals = []
+    for combo in itertools.product(*candidates.values()):
+        cost = sum(m.cost_per_unit for m in combo) * building["area"] * 0.1
+        carbon = sum(m.lca_results["embodied_carbon"] for m in combo) * building["area"] * 0.1
+        if cost <= constraints.max_budget and carbon <= constraints.max_carbon:
+            totals.append((cost, carbon))
+    points = np.array(totals)
+    ranks = brute_force_ranks(points)
+    return sorted(map(tuple, np.round(points[ranks <= max_rank], 6)))
+
+
+def front_totals(front):
+    return sorted(
+        (round(p.alternative.total_cost, 6), round(p.alternative.total_carbon, 6))
+        for p in front.points
+    )
+
+
+@pytest.fixture
+def engine(catalog):
+    template = {"quantity_per_m2": 0.1}
+    engine = GenerativeDesignEngine(catalog)
+    engine.component_templates = {c: template for c in ("walls", "roofing", "flooring")}
+    return engine
+
+
+@pytest.mark.parametrize("max_rank", [0, 1])
+def test_exhaustive_front_matches_brute_force(engine, max_rank):
+    building = {"area": 100, "components": ["walls", "roofing", "flooring"]}
+    constraints = DesignConstraint(max_budget=120000)
+
+    front = engine.optimize_pareto_front(building, constraints, max_rank=max_rank)
+
+    assert front.exhaustive and front.evaluated == 1000
+    assert front_totals(front) == brute_force_front(engine, building, constraints, max_rank)
+    assert [p.rank for p in front.points] == sorted(p.rank for p in front.points)
+
+
+def test_evolutionary_front_ranks_every_evaluated_design(engine, monkeypatch):
+    from core import generative_design
+
+    evaluated = []
+    evolve_designs = generative_design.evolve_designs
+
+    def recording_evolve(*args, observe, **kwargs):
+        def record(population, total_cost, total_carbon, scores, feasible):
+            evaluated.append(np.column_stack([total_cost, total_carbon])[feasible])
+            observe(population, total_cost, total_carbon, scores, feasible)
+
+        return evolve_designs(*args, observe=record, **kwargs)
+
+    monkeypatch.setattr(generative_design, "evolve_designs", recording_evolve)
+    building = {"area": 100, "components": ["walls", "roofing", "flooring"]}
+    config = EvolutionConfig(population_size=64, generations=10, max_alternatives=5, seed=1)
+
+    front = engine.optimize_pareto_front(
+        building, DesignConstraint(), evolution_config=config, max_enumerated=0
+    )
+
+    assert not front.exhaustive and front.evaluated == 64 * 11
+    points = np.unique(np.concatenate(evaluated), axis=0)
+    expected = sorted(map(tuple, np.round(points[brute_force_ranks(points) == 0], 6)))
+    assert front_totals(front) == expected
+    # The GA's score-ranked archive keeps 5 designs; the front is not limited by it
+    assert len(front.points) > config.max_alternatives
+
+
+def test_design_totals_agree_with_the_alternatives(engine):
+    building = {"area": 100, "components": ["walls", "roofing"]}
+    front = engine.optimize_pareto_front(building, DesignConstraint(), ("cost", "score"))
+    for point in front.points:
+        materials = [
+            engine.material_db.materials[m] for m in point.alternative.material_selections.values()
+        ]
+        assert point.alternative.total_cost == pytest.approx(
+            sum(m.cost_per_unit for m in materials) * 10
+        )
+    assert design_totals(np.zeros((0, 2), dtype=np.int64), *np.zeros((3, 2, 1)))[0].shape == (0,)
+
+
+def test_unknown_objectives_are_rejected(engine):
+    with pytest.raises(ValueError):
+        engine.optimize_pareto_front(
+            {"area": 1, "components": ["walls"]}, DesignConstraint(), ("cost",)
+        )
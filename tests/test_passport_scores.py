@@ -0,0 +1,52 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+from core.material_database import Certification, FrozenDict, MaterialPassport
+
+
+def test_score_inputs_cannot_be_edited_in_place(catalog):
+    passport = next(iter(catalog.materials.values()))
+    with pytest.raises(TypeError):
+        passport.lca_results["embodied_carbon"] = 0.0
+    with pytest.raises(TypeError):
+        passport.lca_results.update(embodied_carbon=0.0)
+    with pytest.raises(AttributeError):
+        passport.certifications.append(Certification.LEED)
+
+
+def test_assigning_a_score_input_clears_the_cached_score(catalog):
+    passport = next(p for p in catalog.materials.values() if not p.certifications)
+    before = catalog._calculate_sustainability_score(passport)
+
+    passport.certifications = [Certification.LEED, Certification.FSC]
+    assert passport.sustainability_score is None
+    assert isinstance(passport.certifications, tuple)
+    assert catalog._calculate_sustainability_score(passport) == pytest.approx(
+        min(before + 2 * catalog.score_weights["certification_bonus"], 100)
+    )
+
+
+def test_update_material_rescores_and_reindexes(catalog):
+    passport = next(iter(catalog.materials.values()))
+    lca = dict(passport.lca_results, embodied_carbon=0.0, recycled_content=100)
+
+    catalog.update_material(passport.id, lca_results=lca)
+
+    assert passport.sustainability_score == catalog._compute_sustainability_score(passport)
+    row = catalog.columns.rows[passport.id]
+    assert catalog.columns.column("score")[row] == passport.sustainability_score
+    assert passport.id in {p.id for p in catalog.search_materials({"max_carbon": 0.0})}
+
+
+def test_frozen_values_round_trip():
+    passport = MaterialPassport(
+        name="Frozen", lca_results={"embodied_carbon": 1.5}, certifications=[Certification.EPD]
+    )
+    for clone in (pickle.loads(pickle.dumps(passport)), copy.deepcopy(passport)):
+        assert clone == passport
+        assert isinstance(clone.lca_results, FrozenDict)
+    assert json.loads(json.dumps(passport.lca_results)) == {"embodied_carbon": 1.5}
+    assert MaterialPassport.from_record(passport.to_record()) == passport
@@ -0,0 +1,103 @@
+import json
+import warnings
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.generative_design import DesignConstraint, EvolutionConfig, GenerativeDesignEngine
+
+CONFIG = EvolutionConfig(population_size=32, generations=5, max_alternatives=10, seed=0)
+
+
+def test_zero_building_limits_are_not_treated_as_unset(catalog):
+    engine = GenerativeDesignEngine(catalog, evolution_config=CONFIG)
+    buildings = [
+        {"id": "open", "area": 100, "components": ["walls"]},
+        {"id": "zero-budget", "area": 100, "components": ["walls"], "max_budget": 0},
+        {"id": "zero-carbon", "area": 100, "components": ["walls"], "max_carbon": 0.0},
+        {"id": "unset", "area": 100, "components": ["walls"], "max_budget": None},
+    ]
+    results = {
+        result.building_id: result
+        for result in engine.optimize_portfolio(buildings, DesignConstraint(), max_workers=0)
+    }
+
+    assert results["open"].alternatives
+    assert results["unset"].alternatives
+    assert results["zero-budget"].alternatives == []
+    assert all(a.total_carbon <= 0 for a in results["zero-carbon"].alternatives)
+
+
+@pytest.fixture(scope="module")
+def client():
+    from api import endpoints
+
+    return TestClient(endpoints.app)
+
+
+def test_portfolio_streams_under_admission(client):
+    response = client.post(
+        "/design/portfolio",
+        json={
+            "buildings": [{"id": "a", "building_area": 100}, {"id": "b", "building_area": 200}],
+            "max_workers": 0,
+            "generations": 2,
+            "population_size": 16,
+        },
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["building_id"] for line in lines) == ["a", "b"]
+
+    route = client.get("/metrics/admission").json()["routes"]["/design/portfolio"]
+    assert route["admitted"] == 1
+    assert route["running"] == 0
+
+
+def strict_json(line):
+    """json.loads that rejects NaN and Infinity, like browsers and most clients"""
+
+    def reject(constant):
+        raise ValueError(f"Non-standard JSON constant {constant}")
+
+    return json.loads(line, parse_constant=reject)
+
+
+def test_buildings_without_known_components_get_no_alternatives(catalog):
+    engine = GenerativeDesignEngine(catalog, evolution_config=CONFIG)
+    buildings = [
+        {"id": "known", "area": 100, "components": ["walls"]},
+        {"id": "unknown", "area": 100, "components": ["atrium"]},
+    ]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        results = {
+            result.building_id: result
+            for result in engine.optimize_portfolio(buildings, DesignConstraint(), max_workers=0)
+        }
+
+    assert results["unknown"].alternatives == []
+    assert results["unknown"].evaluations == 0
+    assert results["known"].alternatives
+
+
+def test_portfolio_stream_is_strict_json(client, catalog, monkeypatch):
+    from api import endpoints
+
+    monkeypatch.setattr(endpoints, "design_engine", GenerativeDesignEngine(catalog))
+    response = client.post(
+        "/design/portfolio",
+        json={
+            "buildings": [
+                {"id": "office", "building_area": 100, "components": ["walls", "roofing"]},
+                {"id": "atrium", "building_area": 100, "components": ["atrium"]},
+            ],
+            "max_workers": 0,
+            "generations": 2,
+            "population_size": 16,
+        },
+    )
+    assert response.status_code == 200
+    lines = {line["building_id"]: line for line in map(strict_json, response.text.splitlines())}
+    assert lines["atrium"]["alternatives"] == []
+    assert lines["office"]["alternatives"]
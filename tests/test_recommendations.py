@@ -0,0 +1,71 @@
+import itertools
+import random
+
+from core.generative_design import GenerativeDesignEngine
+
+from .conftest import CATEGORIES
+
+
+def carbon(database, material_id):
+    return database.materials[material_id].lca_results["embodied_carbon"]
+
+
+def test_swaps_reach_the_target_at_minimum_cost(catalog):
+    engine = GenerativeDesignEngine(catalog)
+    rng = random.Random(3)
+    ids = list(catalog.materials)
+    for _ in range(40):
+        design = {f"c{i}": rng.choice(ids) for i in range(rng.randint(1, 3))}
+        target = rng.uniform(0, 60)
+        plan = engine.generate_recommendations(design, target)
+
+        planned = dict(design)
+        for recommendation in plan["recommendations"]:
+            planned[recommendation["component"]] = recommendation["alternative_material_id"]
+        current = sum(carbon(catalog, m) for m in design.values())
+        assert (
+            abs(sum(carbon(catalog, m) for m in planned.values()) - plan["planned_carbon"]) < 1e-6
+        )
+        if not plan["target_met"] or current <= 0:
+            continue
+
+        # Brute force over every same-category material with less carbon
+        options = []
+        for material_id in design.values():
+            material = catalog.materials[material_id]
+            options.append(
+                [material]
+                + [
+                    p
+                    for p in catalog.materials.values()
+                    if p.category == material.category
+                    and p.lca_results["embodied_carbon"] < carbon(catalog, material_id)
+                ]
+            )
+        needed = current * target / 100
+        cheapest = min(
+            sum(p.cost_per_unit for p in combo)
+            for combo in itertools.product(*options)
+            if current - sum(p.lca_results["embodied_carbon"] for p in combo) >= needed - 1e-9
+        )
+        planned_cost = sum(catalog.materials[m].cost_per_unit for m in planned.values())
+        assert planned_cost <= cheapest + 1e-6
+
+
+def test_zero_carbon_material_has_no_saving_percent(catalog):
+    category = CATEGORIES[0]
+    current = next(p for p in catalog.materials.values() if p.category == category)
+    alternative = next(
+        p for p in catalog.materials.values() if p.category == category and p.id != current.id
+    )
+    catalog.update_material(current.id, lca_results=dict(current.lca_results, embodied_carbon=0))
+    catalog.update_material(
+        alternative.id, lca_results=dict(alternative.lca_results, embodied_carbon=-1.0)
+    )
+
+    plan = GenerativeDesignEngine(catalog).generate_recommendations({"walls": current.id}, 50)
+
+    assert plan["recommendations"]
+    for recommendation in plan["recommendations"]:
+        assert recommendation["carbon_saving"] > 0
+        assert recommendation["carbon_saving_percent"] is None
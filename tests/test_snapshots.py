@@ -0,0 +1,157 @@
+import random
+
+import pytest
+
+from core.material_database import MaterialDatabase
+from core.sql_database import SQLMaterialDatabase
+
+from .conftest import material_data
+from .test_material_database import random_filters
+
+
+def churned_catalog(lca_engine, seed=0):
+    rng = random.Random(seed)
+    database = MaterialDatabase()
+    database.register_supplier("SUP_1", {"name": "Supplier 1", "country": "NL"})
+    database.add_materials(material_data(250, seed=seed), lca_engine)
+    for material_id in rng.sample(list(database.materials), 30):
+        database.remove_material(material_id)
+    for material_id in rng.sample(list(database.materials), 20):
+        database.update_material(material_id, cost_per_unit=rng.uniform(1, 500))
+    return database
+
+
+def records(database):
+    return {material_id: p.to_record() for material_id, p in database.materials.items()}
+
+
+def assert_same_catalog(actual, expected, rng, queries=60):
+    """Same passports, searches, pages, aggregates and Merkle root"""
+    assert records(actual) == records(expected)
+    assert actual.merkle_root() == expected.merkle_root()
+    for _ in range(queries):
+        filters = random_filters(rng)
+        assert sorted(p.id for p in actual.search_materials(filters)) == sorted(
+            p.id for p in expected.search_materials(filters)
+        )
+        sort_by = rng.choice(list(MaterialDatabase.SORT_KEYS))
+        pages = []
+        for database in (actual, expected):
+            page, ids = database.search_page(filters, sort_by, limit=7), []
+            while True:
+                ids += [p.id for p in page.results]
+                if page.next_cursor is None:
+                    break
+                page = database.search_page(filters, sort_by, limit=7, cursor=page.next_cursor)
+            pages.append(ids)
+        assert pages[0] == pages[1], (filters, sort_by)
+
+    summary, reference = actual.get_dashboard_summary(), expected.get_dashboard_summary()
+    assert summary["total_materials"] == reference["total_materials"]
+    assert summary["average_carbon"] == pytest.approx(reference["average_carbon"])
+    assert summary["top_performing_materials"] == reference["top_performing_materials"]
+    for sort_by in MaterialDatabase.SUPPLIER_SORT_KEYS:
+        board = actual.get_supplier_leaderboard(sort_by, limit=None)
+        assert [e["supplier_id"] for e in board] == [
+            e["supplier_id"] for e in expected.get_supplier_leaderboard(sort_by, limit=None)
+        ]
+    assert actual.suppliers["SUP_1"]["country"] == "NL"
+    analytics = actual.get_supplier_analytics("SUP_1")
+    reference = expected.get_supplier_analytics("SUP_1")
+    assert sorted(analytics.pop("categories")) == sorted(reference.pop("categories"))
+    assert analytics == pytest.approx(reference)
+
+
+def test_memory_snapshot_roundtrip(lca_engine, tmp_path):
+    database = churned_catalog(lca_engine)
+    database.save_snapshot(tmp_path / "first")
+    loaded = MaterialDatabase.load_snapshot(tmp_path / "first")
+    assert_same_catalog(loaded, database, random.Random(1))
+
+    # Saving a partly decoded snapshot again writes the same files
+    loaded.materials[next(iter(loaded.materials))]
+    loaded.save_snapshot(tmp_path / "second")
+    for name in ("passports.bin", "manifest.json", "leaf.npy", "cost_order.npy"):
+        first, second = tmp_path / "first" / name, tmp_path / "second" / name
+        assert second.read_bytes() == first.read_bytes()
+
+
+WEIGHTS = {"carbon": 0.1, "recycled_content": 0.4, "verification_bonus": 20}
+
+
+def assert_rescored_undecoded(loaded, expected):
+    """Rescoring a loaded snapshot decodes nothing and matches the per-passport scores"""
+    decoded = set(loaded.materials.decoded())
+    assert loaded.rescore_materials(WEIGHTS, chunk_size=64) == len(expected.materials)
+    assert set(loaded.materials.decoded()) == decoded
+
+    expected.score_weights = loaded.score_weights
+    column = loaded.columns.column("score")
+    for material_id, passport in expected.materials.items():
+        score = expected._compute_sustainability_score(passport)
+        assert column[loaded.columns.rows[material_id]] == score
+        assert loaded.materials[material_id].sustainability_score == score
+
+
+def test_rescoring_a_snapshot_leaves_passports_undecoded(lca_engine, tmp_path):
+    database = churned_catalog(lca_engine, seed=5)
+    passports = list(database.materials.values())
+    for passport in passports[:10]:
+        database.update_material(passport.id, third_party_verified=True)
+    # Score inputs left out fall back to the score's defaults
+    for passport in passports[10:15]:
+        database.update_material(passport.id, lca_results={}, certifications=[])
+    database.save_snapshot(tmp_path / "memory")
+
+    loaded = MaterialDatabase.load_snapshot(tmp_path / "memory")
+    cached = loaded.materials[passports[20].id]
+    assert_rescored_undecoded(loaded, database)
+    assert cached.sustainability_score == database._compute_sustainability_score(passports[20])
+
+    sql = SQLMaterialDatabase.load_snapshot(tmp_path / "memory")
+    try:
+        sql.save_snapshot(tmp_path / "sql")
+    finally:
+        sql.close()
+    assert_rescored_undecoded(MaterialDatabase.load_snapshot(tmp_path / "sql"), database)
+
+
+def test_incomplete_snapshots_are_refused(lca_engine, tmp_path):
+    churned_catalog(lca_engine).save_snapshot(tmp_path)
+    (tmp_path / "manifest.json").unlink()
+    with pytest.raises(ValueError):
+        MaterialDatabase.load_snapshot(tmp_path)
+
+
+def test_sqlite_matches_memory_through_snapshots(lca_engine, tmp_path):
+    database = churned_catalog(lca_engine, seed=4)
+    database.save_snapshot(tmp_path / "memory")
+
+    sql = SQLMaterialDatabase.load_snapshot(tmp_path / "memory")
+    try:
+        assert_same_catalog(sql, database, random.Random(2))
+
+        # Back out of SQL and into memory again
+        sql.save_snapshot(tmp_path / "sql")
+        assert_same_catalog(
+            MaterialDatabase.load_snapshot(tmp_path / "sql"), database, random.Random(3)
+        )
+
+        # Both keep going from the same leaf positions
+        (passport,) = database.add_materials(material_data(1, seed=77), lca_engine)
+        sql._store_passports([passport])
+        victim = next(iter(database.materials))
+        database.remove_material(victim)
+        sql.remove_material(victim)
+        assert sql.merkle_root() == database.merkle_root()
+        assert sql.inclusion_proof(passport.id) == database.inclusion_proof(passport.id)
+    finally:
+        sql.close()
+
+
+def test_snapshots_import_into_empty_catalogs_only(lca_engine, tmp_path):
+    churned_catalog(lca_engine).save_snapshot(tmp_path / "snapshot")
+    url = f"sqlite:///{tmp_path / 'materials.db'}"
+    SQLMaterialDatabase.load_snapshot(tmp_path / "snapshot", url).close()
+    with pytest.raises(ValueError):
+        SQLMaterialDatabase.load_snapshot(tmp_path / "snapshot", url)
@@ -0,0 +1,54 @@
+import pytest
+
+from core.sql_database import SQLMaterialDatabase
+
+from .conftest import material_data
+
+WEIGHTS = {"carbon": 0.1, "recycled_content": 0.6, "certification_bonus": 1}
+
+
+@pytest.fixture
+def catalog_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'materials.db'}"
+
+
+def stored_scores(database):
+    return dict(database._query("SELECT id, score FROM materials"))
+
+
+def test_rescored_weights_are_shared_by_every_instance(lca_engine, catalog_url):
+    worker = SQLMaterialDatabase(catalog_url)
+    api = SQLMaterialDatabase(catalog_url)
+    try:
+        api.add_materials(material_data(30), lca_engine)
+        assert worker.rescore_materials(WEIGHTS) == 30
+
+        # The already-connected instance scores new registrations with the new weights
+        (passport,) = api.add_materials(material_data(1, seed=5), lca_engine)
+        assert api.score_weights == worker.score_weights
+        assert api.score_weights["recycled_content"] == 0.6
+
+        reopened = SQLMaterialDatabase(catalog_url, score_weights={"carbon": 0.9})
+        try:
+            assert reopened.score_weights == worker.score_weights
+            scores = stored_scores(reopened)
+            for material_id, material in reopened.materials.items():
+                expected = reopened._compute_sustainability_score(material)
+                assert scores[material_id] == pytest.approx(expected)
+            assert scores[passport.id] == pytest.approx(passport.sustainability_score)
+        finally:
+            reopened.close()
+    finally:
+        worker.close()
+        api.close()
+
+
+def test_first_instance_seeds_the_catalog_weights(catalog_url):
+    first = SQLMaterialDatabase(catalog_url, score_weights=WEIGHTS)
+    second = SQLMaterialDatabase(catalog_url)
+    try:
+        assert second.score_weights == first.score_weights
+        assert second.score_weights["carbon"] == 0.1
+    finally:
+        first.close()
+        second.close()
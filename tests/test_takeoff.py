@@ -0,0 +1,115 @@
+import csv
+import json
+import random
+
+import pytest
+
+from integrations.takeoff import ElementMapper, read_elements, run_takeoff
+
+CATEGORIES = ["Walls", "Floors", "Structural Columns", "Roofs", "Furniture", ""]
+IFC_CLASSES = ["IfcWall", "IfcSlab", "IfcBeam", "IfcFooting", "IfcDoor", ""]
+MATERIALS = ["Concrete C30/37", "Mineral Wool 100mm", "Glulam GL24h", "Steel S355", "Gypsum", ""]
+
+
+def elements(count, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        volume = round(rng.uniform(0, 20), 3)
+        roll = rng.random()
+        rows.append(
+            {
+                "Category": rng.choice(CATEGORIES),
+                "IfcClass": rng.choice(IFC_CLASSES),
+                "Material": rng.choice(MATERIALS),
+                # Some exporters append units, a few values are unreadable
+                "Volume": f"{volume} m3" if roll < 0.2 else "n/a" if roll < 0.25 else volume,
+                "Area": round(rng.uniform(0, 50), 3),
+            }
+        )
+    return rows
+
+
+def expected_takeoff(rows):
+    """Per-row reference: (component, material) -> [volume, area, count]"""
+    mapper = ElementMapper()
+    totals, unmapped, invalid = {}, 0, 0
+    for row in rows:
+        material = mapper.material(row["Material"])
+        component = mapper.component(row["Category"], row["IfcClass"], material)
+        if component is None:
+            unmapped += 1
+            continue
+        volume = row["Volume"]
+        if volume == "n/a":
+            invalid += 1
+            continue
+        volume = float(str(volume).split()[0])
+        entry = totals.setdefault((component, material), [0.0, 0.0, 0])
+        entry[0] += volume
+        entry[1] += row["Area"]
+        entry[2] += 1
+    return totals, unmapped, invalid
+
+
+def write_export(rows, path, fmt):
+    if fmt == "csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    elif fmt == "ndjson":
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    else:
+        path.write_text(json.dumps({"project": "test", "elements": rows}, indent=1))
+    return path
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson", "json"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 10_000])
+def test_takeoff_matches_per_row_reference(tmp_path, fmt, chunk_size):
+    rows = elements(300)
+    path = write_export(rows, tmp_path / f"model.{fmt}", fmt)
+    takeoff = run_takeoff(str(path), chunk_size=chunk_size)
+    totals, unmapped, invalid = expected_takeoff(rows)
+
+    assert takeoff.element_count == len(rows)
+    assert takeoff.unmapped_count == unmapped
+    assert takeoff.invalid_count == invalid
+    assert sum(takeoff.unmapped_categories.values()) == unmapped
+    for component, result in takeoff.components.items():
+        pairs = {m: t for (c, m), t in totals.items() if c == component}
+        assert result.volume == pytest.approx(sum(t[0] for t in pairs.values()))
+        assert result.area == pytest.approx(sum(t[1] for t in pairs.values()))
+        assert result.element_count == sum(t[2] for t in pairs.values())
+        assert result.material_volumes == pytest.approx({m: t[0] for m, t in pairs.items()})
+    assert set(takeoff.components) == {c for c, _ in totals}
+
+
+def test_insulation_hosted_by_walls_is_its_own_component(tmp_path):
+    rows = [
+        {"Category": "Walls", "Material": "Concrete", "Volume": 4, "Area": 10},
+        {"Category": "Walls", "Material": "Mineral Wool", "Volume": 1, "Area": 10},
+    ]
+    takeoff = run_takeoff(str(write_export(rows, tmp_path / "walls.csv", "csv")))
+    assert takeoff.quantities() == {"walls": 4.0, "insulation": 1.0}
+    assert takeoff.to_building_data()["components"]["insulation"]["material"] == "mineral_wool"
+
+
+def test_unit_factors_scale_quantities(tmp_path):
+    rows = [{"category": "floors", "material": "timber", "volume": 100, "area": 10}]
+    path = write_export(rows, tmp_path / "floors.jsonl", "ndjson")
+    takeoff = run_takeoff(str(path), volume_factor=0.5, area_factor=2.0)
+    assert takeoff.components["flooring"].volume == 50.0
+    assert takeoff.to_building_data()["area"] == 20.0
+
+
+def test_read_elements_chunks_and_formats(tmp_path):
+    rows = elements(25, seed=1)
+    path = write_export(rows, tmp_path / "model.json", "json")
+    chunks = list(read_elements(str(path), chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert [row for chunk in chunks for row in chunk] == rows
+
+    with pytest.raises(ValueError):
+        list(read_elements(str(tmp_path / "model.ifc")))
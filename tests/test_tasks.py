@@ -0,0 +1,117 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import tasks
+from core.generative_design import GenerativeDesignEngine
+from core.lca_engine import LCAEngine
+from core.material_database import MaterialDatabase
+
+from .conftest import material_data
+
+
+@pytest.fixture(scope="module")
+def api():
+    """The API module serving a catalog of its own, restored after the module"""
+    from api import endpoints
+
+    catalog = MaterialDatabase()
+    catalog.add_materials(material_data(200, seed=7), endpoints.lca_engine)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(endpoints, "material_db", catalog)
+        patch.setattr(endpoints, "design_engine", GenerativeDesignEngine(catalog))
+        yield endpoints
+
+
+@pytest.fixture
+def progress(monkeypatch):
+    """PROGRESS updates published by the tasks, in order"""
+    updates = []
+
+    def record(task):
+        update_state = task.update_state
+
+        def recording_update_state(task_id=None, state=None, meta=None, **kwargs):
+            updates.append((task.name, state, meta))
+            return update_state(task_id, state, meta, **kwargs)
+
+        monkeypatch.setattr(task, "update_state", recording_update_state)
+
+    for task in (tasks.optimize_design_task, tasks.batch_lca_task, tasks.rescore_catalog_task):
+        record(task)
+    return updates
+
+
+def test_tasks_run_eagerly():
+    assert tasks.celery_app.conf.task_always_eager
+    assert tasks.ping.delay().get() == "pong"
+
+
+def test_optimize_design_reports_generations(api, progress):
+    result = tasks.optimize_design_task.delay(
+        {"area": 250, "components": ["walls", "roofing"]},
+        max_budget=1e9,
+        evolution_overrides={"generations": 4, "population_size": 32, "seed": 1},
+        top_k=3,
+    )
+    payload = result.get()
+
+    assert result.status == "SUCCESS"
+    assert [meta["current"] for _, state, meta in progress] == [1, 2, 3, 4]
+    assert {(state, meta["stage"], meta["total"]) for _, state, meta in progress} == {
+        ("PROGRESS", "evolving", 4)
+    }
+    assert progress[-1][2]["percent"] == 100.0
+    assert payload["building_area"] == 250
+    assert 0 < len(payload["alternatives"]) <= 3
+    for alternative in payload["alternatives"]:
+        assert set(alternative["material_selections"]) == {"walls", "roofing"}
+        assert alternative["total_cost"] <= 1e9
+
+
+def test_exact_optimization_payload(api):
+    payload = tasks.optimize_design_task.delay(
+        {"area": 100, "components": ["walls"]}, mode="exact"
+    ).get()
+    assert payload["status"] == "optimal"
+    assert len(payload["alternatives"]) == 1
+    lowest_carbon = min(
+        p.lca_results["embodied_carbon"]
+        for p in api.material_db.materials.values()
+        if p.category == "walls"
+    )
+    quantity = api.design_engine._component_quantity("walls", 100)
+    assert payload["alternatives"][0]["total_carbon"] == pytest.approx(lowest_carbon * quantity)
+
+
+def test_batch_lca_chunks_match_the_sync_batch(api, progress):
+    materials = material_data(25, seed=3)
+    payload = tasks.batch_lca_task.delay(materials, chunk_size=10).get()
+
+    assert [meta["current"] for _, _, meta in progress] == [10, 20, 25]
+    expected = LCAEngine().calculate_carbon_footprint_batch(materials).to_dict()
+    assert payload["count"] == 25
+    assert payload["lca_results"]["embodied_carbon"] == pytest.approx(expected["embodied_carbon"])
+
+
+def test_rescore_through_the_api(api, progress):
+    client = TestClient(api.app)
+    weights = {"carbon": 0.1, "certification_bonus": 0}
+
+    task_id = client.post("/materials/rescore", json={"score_weights": weights}).json()["task_id"]
+    status = client.get(f"/tasks/status/{task_id}").json()
+
+    assert status["status"] == "SUCCESS"
+    assert status["result"]["rescored"] == len(api.material_db.materials)
+    assert status["result"]["score_weights"]["carbon"] == 0.1
+    assert progress and progress[-1][2]["stage"] == "rescoring"
+    passport = next(iter(api.material_db.materials.values()))
+    assert passport.sustainability_score == api.material_db._compute_sustainability_score(passport)
+
+
+def test_worker_refuses_to_start_without_a_shared_catalog(monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    with pytest.raises(SystemExit, match="DATABASE_URL"):
+        tasks._check_shared_catalog()
+
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///catalog.db")
+    tasks._check_shared_catalog()